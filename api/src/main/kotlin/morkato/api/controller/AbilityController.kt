@@ -5,11 +5,14 @@ import org.springframework.web.bind.annotation.RestController
 import org.springframework.web.bind.annotation.RequestMapping
 import org.springframework.web.bind.annotation.RequestBody
 import org.springframework.web.bind.annotation.PathVariable
+import org.springframework.web.bind.annotation.RequestParam
 import org.springframework.web.bind.annotation.DeleteMapping
 import org.springframework.web.bind.annotation.PostMapping
 import org.springframework.web.bind.annotation.PutMapping
 import org.springframework.web.bind.annotation.GetMapping
 import org.springframework.context.annotation.Profile
+import org.springframework.web.server.ResponseStatusException
+import org.springframework.http.HttpStatus
 import morkato.api.exception.model.AbilityNotFoundError
 import morkato.api.exception.model.GuildNotFoundError
 import morkato.api.infra.repository.GuildRepository
@@ -17,20 +20,35 @@ import morkato.api.dto.ability.AbilityResponseData
 import morkato.api.dto.ability.AbilityCreateData
 import morkato.api.dto.ability.AbilityUpdateData
 import morkato.api.dto.validation.IdSchema
+import morkato.api.infra.validation.validateEach
 import morkato.api.model.guild.Guild
+import jakarta.validation.Validator
+import jakarta.validation.Valid
 
 @RestController
 @RequestMapping("/abilities/{guild_id}")
 @Profile("api")
-class AbilityController {
+class AbilityController(
+  private val validator: Validator
+) {
+  companion object {
+    private const val MAX_PAGE_SIZE = 1000
+    private const val MAX_BULK_SIZE = 500
+  }
   @GetMapping
   @Transactional
   fun getAllByGuildId(
-    @PathVariable("guild_id") @IdSchema guildId: String
+    @PathVariable("guild_id") @IdSchema guildId: String,
+    @RequestParam("after", required = false) @IdSchema after: String?,
+    @RequestParam("limit", required = false) limit: Int?
   ) : List<AbilityResponseData> {
     return try {
       val guild = Guild(GuildRepository.findById(guildId))
-      val abilities = guild.getAllAbilities()
+      val abilities = if (limit != null) {
+        guild.getAbilitiesPage(after?.toLong(), limit.coerceIn(1, MAX_PAGE_SIZE))
+      } else {
+        guild.getAllAbilities()
+      }
       return abilities.map(::AbilityResponseData).toList()
     } catch (exc: GuildNotFoundError) {
       listOf()
@@ -54,7 +72,7 @@ class AbilityController {
   @Transactional
   fun createAbilityByGuildId(
     @PathVariable("guild_id") guildId: String,
-    @RequestBody data: AbilityCreateData
+    @RequestBody @Valid data: AbilityCreateData
   ) : AbilityResponseData {
     val guild = Guild(GuildRepository.findOrCreate(guildId))
     val ability = guild.createAbility(
@@ -66,12 +84,34 @@ class AbilityController {
     )
     return AbilityResponseData(ability)
   }
+  @PostMapping("/bulk")
+  @Transactional
+  fun createAbilitiesByGuildId(
+    @PathVariable("guild_id") @IdSchema guildId: String,
+    @RequestBody data: List<AbilityCreateData>
+  ) : List<AbilityResponseData> {
+    if (data.size > MAX_BULK_SIZE) {
+      throw ResponseStatusException(HttpStatus.PAYLOAD_TOO_LARGE, "At most $MAX_BULK_SIZE abilities per request")
+    }
+    validator.validateEach(data)
+    val guild = Guild(GuildRepository.findOrCreate(guildId))
+    return data.map { item ->
+      val ability = guild.createAbility(
+        name = item.name,
+        userType = item.user_type,
+        percent = item.percent,
+        description = item.description,
+        banner = item.banner
+      )
+      AbilityResponseData(ability)
+    }
+  }
   @PutMapping("/{id}")
   @Transactional
   fun updateAbilityById(
     @PathVariable("guild_id") @IdSchema guildId: String,
     @PathVariable("id") @IdSchema id: String,
-    @RequestBody data: AbilityUpdateData
+    @RequestBody @Valid data: AbilityUpdateData
   ) : AbilityResponseData {
     return try {
       val guild = Guild(GuildRepository.findOrCreate(guildId))
@@ -5,6 +5,7 @@ import org.springframework.web.bind.annotation.RestController
 import org.springframework.web.bind.annotation.RequestMapping
 import org.springframework.web.bind.annotation.RequestBody
 import org.springframework.web.bind.annotation.PathVariable
+import org.springframework.web.bind.annotation.RequestParam
 import org.springframework.web.bind.annotation.DeleteMapping
 import org.springframework.web.bind.annotation.PostMapping
 import org.springframework.web.bind.annotation.PutMapping
@@ -26,15 +27,29 @@ import morkato.api.model.guild.Guild
 @RequestMapping("/arts/{guild_id}")
 @Profile("api")
 class ArtController {
+  companion object {
+    private const val MAX_PAGE_SIZE = 1000
+  }
   @GetMapping
   @Transactional
   fun findAllByGuildId(
-    @PathVariable("guild_id") @IdSchema guild_id: String
+    @PathVariable("guild_id") @IdSchema guild_id: String,
+    @RequestParam("after", required = false) @IdSchema after: String?,
+    @RequestParam("limit", required = false) limit: Int?
   ) : List<ArtResponseData> {
     return try {
       val guild = Guild(GuildRepository.findById(guild_id))
-      val attacks = guild.getAllAttacks().toMutableList()
-      guild.getAllArts()
+      val arts = if (limit != null) {
+        guild.getArtsPage(after?.toLong(), limit.coerceIn(1, MAX_PAGE_SIZE)).toList()
+      } else {
+        guild.getAllArts().toList()
+      }
+      val attacks = if (limit != null) {
+        guild.getAttacksByArtIds(arts.map { it.id }).toMutableList()
+      } else {
+        guild.getAllAttacks().toMutableList()
+      }
+      arts
         .map { art ->
           val (valid, invalid) = attacks.partition { art.id == it.artId }
           attacks.clear()
@@ -9,12 +9,16 @@ import org.springframework.web.bind.annotation.DeleteMapping
 import org.springframework.web.bind.annotation.PostMapping
 import org.springframework.web.bind.annotation.PutMapping
 import org.springframework.web.bind.annotation.GetMapping
+import org.springframework.web.server.ResponseStatusException
+import org.springframework.http.HttpStatus
 
 import morkato.api.exception.model.AttackNotFoundError
 import morkato.api.exception.model.GuildNotFoundError
 import morkato.api.exception.model.ArtNotFoundError
 import morkato.api.infra.repository.GuildRepository
+import morkato.api.infra.validation.validateEach
 import morkato.api.model.guild.Guild
+import jakarta.validation.Validator
 import morkato.api.dto.attack.AttackResponseData
 import morkato.api.dto.attack.AttackCreateData
 import morkato.api.dto.attack.AttackUpdateData
@@ -25,7 +29,12 @@ import org.springframework.context.annotation.Profile
 @RestController
 @RequestMapping("/attacks/{guild_id}")
 @Profile("api")
-class AttackController {
+class AttackController(
+  private val validator: Validator
+) {
+  companion object {
+    private const val MAX_BULK_SIZE = 500
+  }
   @GetMapping
   @Transactional
   fun getAllByGuildId(
@@ -88,6 +97,47 @@ class AttackController {
       throw ArtNotFoundError(guild_id, art_id)
     }
   }
+  @PostMapping("/{art_id}/bulk")
+  @Transactional
+  fun createAttacksByArt(
+    @PathVariable("guild_id") @IdSchema guild_id: String,
+    @PathVariable("art_id") @IdSchema art_id: String,
+    @RequestBody data: List<AttackCreateData>
+  ) : List<AttackResponseData> {
+    if (data.size > MAX_BULK_SIZE) {
+      throw ResponseStatusException(HttpStatus.PAYLOAD_TOO_LARGE, "At most $MAX_BULK_SIZE attacks per request")
+    }
+    validator.validateEach(data)
+    // One transaction for the whole batch: either every attack is created or none is.
+    return try {
+      val guild = Guild(GuildRepository.findById(guild_id))
+      val art = guild.getArt(art_id.toLong())
+      data.map { item ->
+        val attack = art.createAttack(
+          name = item.name,
+          namePrefixArt = item.name_prefix_art,
+          description = item.description,
+          banner = item.banner,
+          wisteriaTurn = item.wisteria_turn,
+          poisonTurn = item.poison_turn,
+          burnTurn = item.burn_turn,
+          bleedTurn = item.bleed_turn,
+          wisteria = item.wisteria,
+          poison = item.poison,
+          burn = item.burn,
+          bleed = item.bleed,
+          stun = item.stun,
+          damage = item.damage,
+          breath = item.breath,
+          blood = item.blood,
+          flags = item.flags
+        )
+        AttackResponseData(attack)
+      }
+    } catch (exc: GuildNotFoundError) {
+      throw ArtNotFoundError(guild_id, art_id)
+    }
+  }
   @PutMapping("/{id}")
   @Transactional
   fun updateAttackById(
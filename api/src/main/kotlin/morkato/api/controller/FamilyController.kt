@@ -5,11 +5,14 @@ import org.springframework.web.bind.annotation.RestController
 import org.springframework.web.bind.annotation.RequestMapping
 import org.springframework.web.bind.annotation.RequestBody
 import org.springframework.web.bind.annotation.PathVariable
+import org.springframework.web.bind.annotation.RequestParam
 import org.springframework.web.bind.annotation.DeleteMapping
 import org.springframework.web.bind.annotation.PostMapping
 import org.springframework.web.bind.annotation.PutMapping
 import org.springframework.web.bind.annotation.GetMapping
 import org.springframework.context.annotation.Profile
+import org.springframework.web.server.ResponseStatusException
+import org.springframework.http.HttpStatus
 import morkato.api.exception.model.FamilyNotFoundError
 import morkato.api.exception.model.GuildNotFoundError
 import morkato.api.infra.repository.GuildRepository
@@ -17,20 +20,35 @@ import morkato.api.dto.family.FamilyResponseData
 import morkato.api.dto.family.FamilyUpdateData
 import morkato.api.dto.family.FamilyCreateData
 import morkato.api.dto.validation.IdSchema
+import morkato.api.infra.validation.validateEach
 import morkato.api.model.guild.Guild
+import jakarta.validation.Validator
+import jakarta.validation.Valid
 
 @RestController
 @RequestMapping("/families/{guild_id}")
 @Profile("api")
-class FamilyController {
+class FamilyController(
+  private val validator: Validator
+) {
+  companion object {
+    private const val MAX_PAGE_SIZE = 1000
+    private const val MAX_BULK_SIZE = 500
+  }
   @GetMapping
   @Transactional
   fun getAllByGuildId(
-    @PathVariable("guild_id") @IdSchema guildId: String
+    @PathVariable("guild_id") @IdSchema guildId: String,
+    @RequestParam("after", required = false) @IdSchema after: String?,
+    @RequestParam("limit", required = false) limit: Int?
   ) : List<FamilyResponseData> {
     return try {
       val guild = Guild(GuildRepository.findById(guildId))
-      val families = guild.getAllFamilies()
+      val families = if (limit != null) {
+        guild.getFamiliesPage(after?.toLong(), limit.coerceIn(1, MAX_PAGE_SIZE))
+      } else {
+        guild.getAllFamilies()
+      }
       families.map(::FamilyResponseData).toList()
     } catch (exc: GuildNotFoundError) {
       listOf()
@@ -54,7 +72,7 @@ class FamilyController {
   @Transactional
   fun createFamilyById(
     @PathVariable("guild_id") guildId: String,
-    @RequestBody data: FamilyCreateData
+    @RequestBody @Valid data: FamilyCreateData
   ) : FamilyResponseData {
     val guild = Guild(GuildRepository.findOrCreate(guildId))
     val family = guild.createFamily(
@@ -66,12 +84,34 @@ class FamilyController {
     )
     return FamilyResponseData(family)
   }
+  @PostMapping("/bulk")
+  @Transactional
+  fun createFamiliesByGuildId(
+    @PathVariable("guild_id") @IdSchema guildId: String,
+    @RequestBody data: List<FamilyCreateData>
+  ) : List<FamilyResponseData> {
+    if (data.size > MAX_BULK_SIZE) {
+      throw ResponseStatusException(HttpStatus.PAYLOAD_TOO_LARGE, "At most $MAX_BULK_SIZE families per request")
+    }
+    validator.validateEach(data)
+    val guild = Guild(GuildRepository.findOrCreate(guildId))
+    return data.map { item ->
+      val family = guild.createFamily(
+        name = item.name,
+        percent = item.percent,
+        userType = item.user_type,
+        description = item.description,
+        banner = item.banner
+      )
+      FamilyResponseData(family)
+    }
+  }
   @PutMapping("/{id}")
   @Transactional
   fun updateFamilyById(
     @PathVariable("guild_id") @IdSchema guildId: String,
     @PathVariable("id") @IdSchema id: String,
-    @RequestBody data: FamilyUpdateData
+    @RequestBody @Valid data: FamilyUpdateData
   ) : FamilyResponseData {
     return try {
       val guild = Guild(GuildRepository.findById(guildId))
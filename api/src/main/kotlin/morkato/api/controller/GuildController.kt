@@ -1,12 +1,22 @@
 package morkato.api.controller
 
+import morkato.api.dto.guild.GuildChangesDeletedResponseData
+import morkato.api.dto.guild.GuildChangesResponseData
+import morkato.api.dto.guild.GuildSnapshotResponseData
 import morkato.api.dto.guild.GuildResponseData
+import morkato.api.dto.ability.AbilityResponseData
+import morkato.api.dto.family.FamilyResponseData
+import morkato.api.dto.attack.AttackResponseData
+import morkato.api.dto.art.ArtAttackResponseData
+import morkato.api.dto.art.ArtResponseData
 import morkato.api.model.guild.Guild
 import morkato.api.dto.validation.IdSchema
 import morkato.api.exception.model.GuildNotFoundError
+import morkato.api.infra.repository.GuildChangeRepository
 import morkato.api.infra.repository.GuildRepository
 import org.springframework.web.bind.annotation.RequestMapping
 import org.springframework.web.bind.annotation.RestController
+import org.springframework.web.bind.annotation.RequestParam
 import org.springframework.web.bind.annotation.GetMapping
 import org.springframework.context.annotation.Profile
 import org.springframework.transaction.annotation.Transactional
@@ -16,6 +26,9 @@ import org.springframework.web.bind.annotation.PathVariable
 @RequestMapping("/guilds/{id}")
 @Profile("api")
 class GuildController {
+  companion object {
+    const val MAX_CHANGES = 1000
+  }
   @GetMapping
   @Transactional
   fun getGuildByRef(
@@ -25,4 +38,77 @@ class GuildController {
     val guild = Guild(payload)
     return GuildResponseData(guild)
   }
-}
\ No newline at end of file
+  @GetMapping("/snapshot")
+  @Transactional
+  fun getGuildSnapshotByRef(
+    @PathVariable("id") @IdSchema id: String
+  ) : GuildSnapshotResponseData {
+    val payload = try {GuildRepository.findById(id)} catch (exc: GuildNotFoundError) {GuildRepository.virtual(id)}
+    val guild = Guild(payload)
+    // Taken before the collections are read, so the client's first /changes poll starts from this snapshot.
+    val watermark = GuildChangeRepository.findWatermark()
+    val attacks = guild.getAllAttacks().groupBy { it.artId }
+    return GuildSnapshotResponseData(
+      cursor = watermark.toString(),
+      guild = GuildResponseData(guild),
+      arts = guild.getAllArts()
+        .map { art -> ArtResponseData(art, attacks[art.id].orEmpty().map(::ArtAttackResponseData)) }
+        .toList(),
+      abilities = guild.getAllAbilities().map(::AbilityResponseData).toList(),
+      families = guild.getAllFamilies().map(::FamilyResponseData).toList()
+    )
+  }
+  @GetMapping("/changes")
+  @Transactional
+  fun getGuildChangesByRef(
+    @PathVariable("id") @IdSchema id: String,
+    @RequestParam("since", required = false) since: Long?
+  ) : GuildChangesResponseData {
+    val payload = try {GuildRepository.findById(id)} catch (exc: GuildNotFoundError) {GuildRepository.virtual(id)}
+    val guild = Guild(payload)
+    // Taken before the rows are read: every transaction under it is already visible to that read.
+    val watermark = GuildChangeRepository.findWatermark()
+    val horizon = GuildChangeRepository.findHorizon()
+    // No cursor, a cursor from the future, or one behind pruned rows: the client must reload everything.
+    if (since == null || since > watermark || since < horizon) {
+      return emptyChanges(watermark, reset = true)
+    }
+    // Writes still in flight stay above the watermark and come with a later poll, never below a cursor.
+    val changes = GuildChangeRepository.findAllByGuildIdBetween(id, since, watermark, MAX_CHANGES + 1).toList()
+    if (changes.size > MAX_CHANGES) {
+      return emptyChanges(watermark, reset = true)
+    }
+    if (changes.isEmpty()) {
+      return emptyChanges(watermark, reset = false)
+    }
+    // Only the last change of each entity matters: an update followed by a delete is a delete.
+    val last = changes.associateBy { it.model to it.id }.values
+    fun changed(model: String) = last.filter { it.model == model && !it.deleted }.map { it.id }
+    fun deleted(model: String) = last.filter { it.model == model && it.deleted }.map { it.id.toString() }
+    return GuildChangesResponseData(
+      cursor = watermark.toString(),
+      reset = false,
+      arts = guild.getArtsByIds(changed("ART")).map { ArtResponseData(it, listOf()) }.toList(),
+      attacks = guild.getAttacksByIds(changed("ATTACK")).map(::AttackResponseData).toList(),
+      abilities = guild.getAbilitiesByIds(changed("ABILITY")).map(::AbilityResponseData).toList(),
+      families = guild.getFamiliesByIds(changed("FAMILY")).map(::FamilyResponseData).toList(),
+      deleted = GuildChangesDeletedResponseData(
+        arts = deleted("ART"),
+        attacks = deleted("ATTACK"),
+        abilities = deleted("ABILITY"),
+        families = deleted("FAMILY")
+      )
+    )
+  }
+  private fun emptyChanges(cursor: Long, reset: Boolean) : GuildChangesResponseData {
+    return GuildChangesResponseData(
+      cursor = cursor.toString(),
+      reset = reset,
+      arts = listOf(),
+      attacks = listOf(),
+      abilities = listOf(),
+      families = listOf(),
+      deleted = GuildChangesDeletedResponseData(listOf(), listOf(), listOf(), listOf())
+    )
+  }
+}
@@ -7,9 +7,9 @@ import morkato.api.dto.validation.NameSchema
 import java.math.BigDecimal
 
 data class AbilityCreateData(
-  @NameSchema @NotNull val name: String,
+  @field:NameSchema @field:NotNull val name: String,
   val percent: BigDecimal?,
   val user_type: Int?,
-  @DescriptionSchema val description: String?,
-  @BannerSchema val banner: String?
+  @field:DescriptionSchema val description: String?,
+  @field:BannerSchema val banner: String?
 ) {}
\ No newline at end of file
@@ -9,13 +9,13 @@ import morkato.api.model.art.ArtType
 import java.math.BigDecimal
 
 data class ArtUpdateData(
-  @NameSchema val name: String?,
+  @field:NameSchema val name: String?,
   val type: ArtType?,
-  @DescriptionSchema val description: String?,
-  @BannerSchema val banner: String?,
-  @Digits(integer = 3, fraction = 0)
+  @field:DescriptionSchema val description: String?,
+  @field:BannerSchema val banner: String?,
+  @field:Digits(integer = 3, fraction = 0)
   val energy: BigDecimal?,
-  @AttrSchema val life: BigDecimal?,
-  @AttrSchema val breath: BigDecimal?,
-  @AttrSchema val blood: BigDecimal?
+  @field:AttrSchema val life: BigDecimal?,
+  @field:AttrSchema val breath: BigDecimal?,
+  @field:AttrSchema val blood: BigDecimal?
 ) {}
@@ -8,21 +8,21 @@ import morkato.api.dto.validation.AttrSchema
 import java.math.BigDecimal
 
 data class AttackUpdateData(
-  @NameSchema val name: String?,
-  @NamePrefixArtSchema val name_prefix_art: String?,
-  @DescriptionSchema val description: String?,
-  @BannerSchema val banner: String?,
-  @AttrSchema val wisteria_turn: BigDecimal?,
-  @AttrSchema val poison_turn: BigDecimal?,
-  @AttrSchema val burn_turn: BigDecimal?,
-  @AttrSchema val bleed_turn: BigDecimal?,
-  @AttrSchema val wisteria: BigDecimal?,
-  @AttrSchema val poison: BigDecimal?,
-  @AttrSchema val burn: BigDecimal?,
-  @AttrSchema val bleed: BigDecimal?,
-  @AttrSchema val stun: BigDecimal?,
-  @AttrSchema val damage: BigDecimal?,
-  @AttrSchema val breath: BigDecimal?,
-  @AttrSchema val blood: BigDecimal?,
+  @field:NameSchema val name: String?,
+  @field:NamePrefixArtSchema val name_prefix_art: String?,
+  @field:DescriptionSchema val description: String?,
+  @field:BannerSchema val banner: String?,
+  @field:AttrSchema val wisteria_turn: BigDecimal?,
+  @field:AttrSchema val poison_turn: BigDecimal?,
+  @field:AttrSchema val burn_turn: BigDecimal?,
+  @field:AttrSchema val bleed_turn: BigDecimal?,
+  @field:AttrSchema val wisteria: BigDecimal?,
+  @field:AttrSchema val poison: BigDecimal?,
+  @field:AttrSchema val burn: BigDecimal?,
+  @field:AttrSchema val bleed: BigDecimal?,
+  @field:AttrSchema val stun: BigDecimal?,
+  @field:AttrSchema val damage: BigDecimal?,
+  @field:AttrSchema val breath: BigDecimal?,
+  @field:AttrSchema val blood: BigDecimal?,
   val flags: Int?
 ) {}
@@ -3,13 +3,12 @@ package morkato.api.dto.family
 import morkato.api.dto.validation.DescriptionSchema
 import morkato.api.dto.validation.BannerSchema
 import morkato.api.dto.validation.NameSchema
-import org.jetbrains.annotations.NotNull
 import java.math.BigDecimal
 
 data class FamilyUpdateData(
-  @NameSchema val name: String?,
+  @field:NameSchema val name: String?,
   val percent: BigDecimal?,
   val user_type: Int?,
-  @DescriptionSchema val description: String?,
-  @BannerSchema val banner: String?
+  @field:DescriptionSchema val description: String?,
+  @field:BannerSchema val banner: String?
 ) {}
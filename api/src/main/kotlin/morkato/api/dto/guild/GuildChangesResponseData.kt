@@ -0,0 +1,22 @@
+package morkato.api.dto.guild
+
+import morkato.api.dto.attack.AttackResponseData
+import morkato.api.dto.ability.AbilityResponseData
+import morkato.api.dto.family.FamilyResponseData
+import morkato.api.dto.art.ArtResponseData
+
+data class GuildChangesDeletedResponseData(
+  val arts: List<String>,
+  val attacks: List<String>,
+  val abilities: List<String>,
+  val families: List<String>
+)
+data class GuildChangesResponseData(
+  val cursor: String,
+  val reset: Boolean,
+  val arts: List<ArtResponseData>,
+  val attacks: List<AttackResponseData>,
+  val abilities: List<AbilityResponseData>,
+  val families: List<FamilyResponseData>,
+  val deleted: GuildChangesDeletedResponseData
+)
@@ -0,0 +1,13 @@
+package morkato.api.dto.guild
+
+import morkato.api.dto.ability.AbilityResponseData
+import morkato.api.dto.family.FamilyResponseData
+import morkato.api.dto.art.ArtResponseData
+
+data class GuildSnapshotResponseData(
+  val cursor: String,
+  val guild: GuildResponseData,
+  val arts: List<ArtResponseData>,
+  val abilities: List<AbilityResponseData>,
+  val families: List<FamilyResponseData>
+)
@@ -0,0 +1,69 @@
+package morkato.api.infra.filter
+
+import org.springframework.web.util.ContentCachingResponseWrapper
+import org.springframework.web.filter.OncePerRequestFilter
+import org.springframework.context.annotation.Profile
+import org.springframework.stereotype.Component
+import org.springframework.http.HttpStatus
+import org.jetbrains.exposed.sql.transactions.transaction
+import jakarta.servlet.http.HttpServletResponse
+import jakarta.servlet.http.HttpServletRequest
+import jakarta.servlet.FilterChain
+import java.time.LocalDateTime
+
+import morkato.api.infra.repository.IdempotencyKeyRepository
+
+@Component
+@Profile("api")
+class IdempotencyFilter : OncePerRequestFilter() {
+  companion object {
+    const val HEADER = "Idempotency-Key"
+    const val REPLAYED_HEADER = "Idempotent-Replayed"
+    const val MAX_KEY_LENGTH = 64
+    const val RETENTION_HOURS = 24L
+  }
+  override fun shouldNotFilter(request: HttpServletRequest) : Boolean {
+    return request.getHeader(HEADER) == null || request.method == "GET" || request.method == "HEAD"
+  }
+  override fun doFilterInternal(
+    request: HttpServletRequest,
+    response: HttpServletResponse,
+    chain: FilterChain
+  ) : Unit {
+    val key = request.getHeader(HEADER)
+    if (key.isEmpty() || key.length > MAX_KEY_LENGTH) {
+      response.sendError(HttpStatus.BAD_REQUEST.value(), "Invalid $HEADER")
+      return
+    }
+    val stored = transaction { IdempotencyKeyRepository.findByKey(key) }
+    if (stored != null) {
+      if (stored.method != request.method || stored.path != request.requestURI) {
+        response.sendError(HttpStatus.UNPROCESSABLE_ENTITY.value(), "$HEADER was used for another request")
+        return
+      }
+      response.status = stored.status
+      response.contentType = stored.contentType
+      response.setHeader(REPLAYED_HEADER, "true")
+      response.writer.write(stored.body)
+      return
+    }
+    val wrapper = ContentCachingResponseWrapper(response)
+    chain.doFilter(request, wrapper)
+    // Server errors are not stored: the write may not have happened, so a replay must run it again.
+    if (wrapper.status < 500) {
+      val payload = IdempotencyKeyRepository.IdempotencyKeyPayload(
+        key = key,
+        method = request.method,
+        path = request.requestURI,
+        status = wrapper.status,
+        contentType = wrapper.contentType,
+        body = String(wrapper.contentAsByteArray, Charsets.UTF_8)
+      )
+      transaction {
+        IdempotencyKeyRepository.deleteOlderThan(LocalDateTime.now().minusHours(RETENTION_HOURS))
+        IdempotencyKeyRepository.create(payload)
+      }
+    }
+    wrapper.copyBodyToResponse()
+  }
+}
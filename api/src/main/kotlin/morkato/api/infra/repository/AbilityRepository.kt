@@ -1,5 +1,7 @@
 package morkato.api.infra.repository
 
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.greater
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.inList
 import org.jetbrains.exposed.sql.SqlExpressionBuilder.eq
 import org.jetbrains.exposed.sql.deleteWhere
 import org.jetbrains.exposed.sql.selectAll
@@ -40,6 +42,32 @@ object AbilityRepository {
       .asSequence()
       .map(::AbilityPayload)
   }
+  fun findPageByGuildId(id: String, after: Long?, limit: Int) : Sequence<AbilityPayload> {
+    return abilities
+      .selectAll()
+      .where({
+        if (after != null) {
+          (abilities.guild_id eq id)
+            .and(abilities.id greater after)
+        } else {
+          (abilities.guild_id eq id)
+        }
+      })
+      .orderBy(abilities.id)
+      .limit(limit)
+      .asSequence()
+      .map(::AbilityPayload)
+  }
+  fun findAllByGuildIdAndIds(guildId: String, ids: List<Long>) : Sequence<AbilityPayload> {
+    return abilities
+      .selectAll()
+      .where({
+        (abilities.guild_id eq guildId)
+          .and(abilities.id inList ids)
+      })
+      .asSequence()
+      .map(::AbilityPayload)
+  }
   fun findById(guildId: String, id: Long) : AbilityPayload {
     return try {
       AbilityPayload(
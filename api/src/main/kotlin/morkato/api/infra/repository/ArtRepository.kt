@@ -1,5 +1,7 @@
 package morkato.api.infra.repository
 
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.greater
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.inList
 import org.jetbrains.exposed.sql.SqlExpressionBuilder.eq
 import org.jetbrains.exposed.sql.deleteWhere
 import org.jetbrains.exposed.sql.selectAll
@@ -53,6 +55,32 @@ object ArtRepository {
       .asSequence()
       .map(::ArtPayload)
   }
+  fun findPageByGuildId(id: String, after: Long?, limit: Int) : Sequence<ArtPayload> {
+    return arts
+      .selectAll()
+      .where({
+        if (after != null) {
+          (arts.guild_id eq id)
+            .and(arts.id greater after)
+        } else {
+          (arts.guild_id eq id)
+        }
+      })
+      .orderBy(arts.id)
+      .limit(limit)
+      .asSequence()
+      .map(::ArtPayload)
+  }
+  fun findAllByGuildIdAndIds(guildId: String, ids: List<Long>) : Sequence<ArtPayload> {
+    return arts
+      .selectAll()
+      .where({
+        (arts.guild_id eq guildId)
+          .and(arts.id inList ids)
+      })
+      .asSequence()
+      .map(::ArtPayload)
+  }
   fun findById(guildId: String, id: Long) : ArtPayload {
     return try {
       ArtPayload(
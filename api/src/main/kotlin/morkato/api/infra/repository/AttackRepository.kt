@@ -1,5 +1,6 @@
 package morkato.api.infra.repository
 
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.inList
 import org.jetbrains.exposed.sql.SqlExpressionBuilder.eq
 import org.jetbrains.exposed.sql.deleteWhere
 import org.jetbrains.exposed.sql.selectAll
@@ -82,6 +83,26 @@ object AttackRepository {
       .asSequence()
       .map(::AttackPayload)
   }
+  fun findAllByGuildIdAndArtIds(guildId: String, artIds: List<Long>) : Sequence<AttackPayload> {
+    return attacks
+      .selectAll()
+      .where({
+        (attacks.guild_id eq guildId)
+          .and(attacks.art_id inList artIds)
+      })
+      .asSequence()
+      .map(::AttackPayload)
+  }
+  fun findAllByGuildIdAndIds(guildId: String, ids: List<Long>) : Sequence<AttackPayload> {
+    return attacks
+      .selectAll()
+      .where({
+        (attacks.guild_id eq guildId)
+          .and(attacks.id inList ids)
+      })
+      .asSequence()
+      .map(::AttackPayload)
+  }
   fun findById(guildId: String, id: Long) : AttackPayload {
     return try {
       AttackPayload(
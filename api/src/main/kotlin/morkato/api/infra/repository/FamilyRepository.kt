@@ -1,6 +1,8 @@
 package morkato.api.infra.repository
 
 import morkato.api.exception.model.FamilyNotFoundError
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.greater
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.inList
 import org.jetbrains.exposed.sql.SqlExpressionBuilder.eq
 import org.jetbrains.exposed.sql.deleteWhere
 import org.jetbrains.exposed.sql.selectAll
@@ -40,6 +42,32 @@ object FamilyRepository {
       .asSequence()
       .map(::FamilyPayload)
   }
+  fun findPageByGuildId(id: String, after: Long?, limit: Int) : Sequence<FamilyPayload> {
+    return families
+      .selectAll()
+      .where({
+        if (after != null) {
+          (families.guild_id eq id)
+            .and(families.id greater after)
+        } else {
+          (families.guild_id eq id)
+        }
+      })
+      .orderBy(families.id)
+      .limit(limit)
+      .asSequence()
+      .map(::FamilyPayload)
+  }
+  fun findAllByGuildIdAndIds(guildId: String, ids: List<Long>) : Sequence<FamilyPayload> {
+    return families
+      .selectAll()
+      .where({
+        (families.guild_id eq guildId)
+          .and(families.id inList ids)
+      })
+      .asSequence()
+      .map(::FamilyPayload)
+  }
   fun findById(guildId: String, id: Long) : FamilyPayload {
     return try {
       FamilyPayload(
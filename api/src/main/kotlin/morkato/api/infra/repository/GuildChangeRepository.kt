@@ -0,0 +1,57 @@
+package morkato.api.infra.repository
+
+import org.jetbrains.exposed.sql.transactions.TransactionManager
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.greaterEq
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.less
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.eq
+import org.jetbrains.exposed.sql.selectAll
+import org.jetbrains.exposed.sql.ResultRow
+import org.jetbrains.exposed.sql.and
+import java.time.Duration
+
+import morkato.api.infra.tables.guild_changes
+
+object GuildChangeRepository {
+  public data class GuildChangePayload(
+    val seq: Long,
+    val model: String,
+    val id: Long,
+    val deleted: Boolean
+  ) {
+    public constructor(row: ResultRow) : this(
+      row[guild_changes.seq],
+      row[guild_changes.model],
+      row[guild_changes.id],
+      row[guild_changes.deleted]
+    ) {}
+  }
+  fun findAllByGuildIdBetween(guildId: String, since: Long, until: Long, limit: Int) : Sequence<GuildChangePayload> {
+    return guild_changes
+      .selectAll()
+      .where({
+        (guild_changes.guild_id eq guildId)
+          .and(guild_changes.xid greaterEq since)
+          .and(guild_changes.xid less until)
+      })
+      .orderBy(guild_changes.seq)
+      .limit(limit)
+      .asSequence()
+      .map(::GuildChangePayload)
+  }
+  private fun queryLong(sql: String) : Long {
+    return TransactionManager.current().exec(sql) { result ->
+      result.next()
+      result.getLong(1)
+    }!!
+  }
+  // Every transaction below it has committed or rolled back, so no row under it can still appear.
+  fun findWatermark() : Long {
+    return queryLong("SELECT guild_change_watermark()")
+  }
+  fun findHorizon() : Long {
+    return queryLong("SELECT \"xid\" FROM \"guild_change_horizon\"")
+  }
+  fun prune(olderThan: Duration) : Long {
+    return queryLong("SELECT prune_guild_changes(make_interval(secs => ${olderThan.seconds}))")
+  }
+}
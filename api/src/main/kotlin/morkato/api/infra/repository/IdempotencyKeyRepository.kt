@@ -0,0 +1,54 @@
+package morkato.api.infra.repository
+
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.less
+import org.jetbrains.exposed.sql.SqlExpressionBuilder.eq
+import org.jetbrains.exposed.sql.insertIgnore
+import org.jetbrains.exposed.sql.deleteWhere
+import org.jetbrains.exposed.sql.selectAll
+import org.jetbrains.exposed.sql.ResultRow
+import java.time.LocalDateTime
+
+import morkato.api.infra.tables.idempotency_keys
+
+object IdempotencyKeyRepository {
+  public data class IdempotencyKeyPayload(
+    val key: String,
+    val method: String,
+    val path: String,
+    val status: Int,
+    val contentType: String?,
+    val body: String
+  ) {
+    public constructor(row: ResultRow) : this(
+      row[idempotency_keys.key],
+      row[idempotency_keys.method],
+      row[idempotency_keys.path],
+      row[idempotency_keys.status],
+      row[idempotency_keys.content_type],
+      row[idempotency_keys.body]
+    ) {}
+  }
+  fun findByKey(key: String) : IdempotencyKeyPayload? {
+    return idempotency_keys
+      .selectAll()
+      .where({ idempotency_keys.key eq key })
+      .limit(1)
+      .map(::IdempotencyKeyPayload)
+      .singleOrNull()
+  }
+  fun create(payload: IdempotencyKeyPayload) : Unit {
+    // Two requests racing on one key both ran; the first stored response wins.
+    idempotency_keys.insertIgnore {
+      it[this.key] = payload.key
+      it[this.method] = payload.method
+      it[this.path] = payload.path
+      it[this.status] = payload.status
+      it[this.content_type] = payload.contentType
+      it[this.body] = payload.body
+      it[this.created_at] = LocalDateTime.now()
+    }
+  }
+  fun deleteOlderThan(createdAt: LocalDateTime) : Int {
+    return idempotency_keys.deleteWhere { idempotency_keys.created_at less createdAt }
+  }
+}
@@ -0,0 +1,16 @@
+package morkato.api.infra.tables
+
+import org.jetbrains.exposed.sql.javatime.datetime
+import org.jetbrains.exposed.sql.Table
+
+object guild_changes : Table("guild_changes") {
+  val seq = long("seq").autoIncrement()
+  val guild_id = discordSnowflakeIdType("guild_id")
+  val model = varchar("model", length = 16)
+  val id = idType("id")
+  val deleted = bool("deleted")
+  val changed_at = datetime("changed_at")
+  val xid = long("xid")
+
+  override val primaryKey = PrimaryKey(seq)
+}
@@ -0,0 +1,16 @@
+package morkato.api.infra.tables
+
+import org.jetbrains.exposed.sql.javatime.datetime
+import org.jetbrains.exposed.sql.Table
+
+object idempotency_keys : Table("idempotency_keys") {
+  val key = varchar("key", length = 64)
+  val method = varchar("method", length = 8)
+  val path = varchar("path", length = 255)
+  val status = integer("status")
+  val content_type = varchar("content_type", length = 128).nullable()
+  val body = text("body")
+  val created_at = datetime("created_at")
+
+  override val primaryKey = PrimaryKey(key)
+}
@@ -0,0 +1,13 @@
+package morkato.api.infra.validation
+
+import org.springframework.web.server.ResponseStatusException
+import org.springframework.http.HttpStatus
+import jakarta.validation.Validator
+
+// @Valid on a List<T> body checks the list, not its items: each item has to be validated by hand.
+fun <T> Validator.validateEach(items: List<T>) : Unit {
+  items.forEachIndexed { index, item ->
+    val violation = this.validate(item).firstOrNull() ?: return@forEachIndexed
+    throw ResponseStatusException(HttpStatus.BAD_REQUEST, "Item $index: ${violation.propertyPath} ${violation.message}")
+  }
+}
@@ -93,6 +93,14 @@ class Guild(
     return ArtRepository.findAllByGuildId(this.id)
       .map { Art(this@Guild, it) }
   }
+  fun getArtsPage(after: Long?, limit: Int) : Sequence<Art> {
+    return ArtRepository.findPageByGuildId(this.id, after, limit)
+      .map { Art(this@Guild, it) }
+  }
+  fun getArtsByIds(ids: List<Long>) : Sequence<Art> {
+    return ArtRepository.findAllByGuildIdAndIds(this.id, ids)
+      .map { Art(this@Guild, it) }
+  }
   fun getArt(id: Long) : Art {
     val payload = ArtRepository.findById(this.id, id)
     return Art(this, payload)
@@ -125,6 +133,14 @@ class Guild(
     return AttackRepository.findAllByGuildId(this.id)
       .map { Attack(this@Guild, it) }
   }
+  fun getAttacksByArtIds(artIds: List<Long>) : Sequence<Attack> {
+    return AttackRepository.findAllByGuildIdAndArtIds(this.id, artIds)
+      .map { Attack(this@Guild, it) }
+  }
+  fun getAttacksByIds(ids: List<Long>) : Sequence<Attack> {
+    return AttackRepository.findAllByGuildIdAndIds(this.id, ids)
+      .map { Attack(this@Guild, it) }
+  }
   fun getAttack(id: Long) : Attack {
     val payload = AttackRepository.findById(this.id, id)
     return Attack(this, payload)
@@ -134,6 +150,14 @@ class Guild(
     return AbilityRepository.findAllByGuildId(this.id)
       .map { Ability(this@Guild, it) }
   }
+  fun getAbilitiesPage(after: Long?, limit: Int) : Sequence<Ability> {
+    return AbilityRepository.findPageByGuildId(this.id, after, limit)
+      .map { Ability(this@Guild, it) }
+  }
+  fun getAbilitiesByIds(ids: List<Long>) : Sequence<Ability> {
+    return AbilityRepository.findAllByGuildIdAndIds(this.id, ids)
+      .map { Ability(this@Guild, it) }
+  }
   fun getAbility(id: Long) : Ability {
     val payload = AbilityRepository.findById(this.id, id)
     return Ability(this, payload)
@@ -160,6 +184,14 @@ class Guild(
     return FamilyRepository.findAllByGuildId(this.id)
       .map { Family(this@Guild, it) }
   }
+  fun getFamiliesPage(after: Long?, limit: Int) : Sequence<Family> {
+    return FamilyRepository.findPageByGuildId(this.id, after, limit)
+      .map { Family(this@Guild, it) }
+  }
+  fun getFamiliesByIds(ids: List<Long>) : Sequence<Family> {
+    return FamilyRepository.findAllByGuildIdAndIds(this.id, ids)
+      .map { Family(this@Guild, it) }
+  }
   fun getFamily(id: Long) : Family {
     val payload = FamilyRepository.findById(this.id, id)
     return Family(this, payload)
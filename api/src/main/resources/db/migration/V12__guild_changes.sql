@@ -0,0 +1,52 @@
+-- V12: CHANGE LOG FOR INCREMENTAL GUILD SYNC.
+--  // Every write on arts, attacks, abilities and families appends a row; clients
+--  // ask for rows after the last "seq" they saw. Rows may be pruned from the head
+--  // at any time (e.g. older than a week): a cursor behind the oldest row resets.
+CREATE SEQUENCE "guild_change_seq";
+CREATE TABLE "guild_changes" (
+  "seq" BIGINT NOT NULL DEFAULT nextval('guild_change_seq'),
+  "guild_id" discord_id_type NOT NULL,
+  "model" VARCHAR(16) NOT NULL,
+  "id" id_type NOT NULL,
+  "deleted" BOOLEAN NOT NULL DEFAULT FALSE,
+  "changed_at" TIMESTAMP NOT NULL DEFAULT NOW()
+);
+ALTER TABLE "guild_changes"
+  ADD CONSTRAINT "guild_change.pkey" PRIMARY KEY ("seq");
+
+CREATE INDEX "guild_change_index_guild" ON "guild_changes"("guild_id","seq");
+
+CREATE FUNCTION record_guild_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    INSERT INTO "guild_changes"("guild_id","model","id","deleted") VALUES (OLD.guild_id, TG_ARGV[0], OLD.id, TRUE);
+    RETURN OLD;
+  END IF;
+  INSERT INTO "guild_changes"("guild_id","model","id") VALUES (NEW.guild_id, TG_ARGV[0], NEW.id);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "art_change"
+  AFTER INSERT OR UPDATE OR DELETE
+  ON "arts"
+FOR EACH ROW
+  EXECUTE FUNCTION record_guild_change('ART');
+
+CREATE TRIGGER "attack_change"
+  AFTER INSERT OR UPDATE OR DELETE
+  ON "attacks"
+FOR EACH ROW
+  EXECUTE FUNCTION record_guild_change('ATTACK');
+
+CREATE TRIGGER "ability_change"
+  AFTER INSERT OR UPDATE OR DELETE
+  ON "abilities"
+FOR EACH ROW
+  EXECUTE FUNCTION record_guild_change('ABILITY');
+
+CREATE TRIGGER "family_change"
+  AFTER INSERT OR UPDATE OR DELETE
+  ON "families"
+FOR EACH ROW
+  EXECUTE FUNCTION record_guild_change('FAMILY');
@@ -0,0 +1,17 @@
+-- V13: RESPONSES TO WRITES SENT WITH AN IDEMPOTENCY-KEY.
+--  // A client replaying a write it is unsure about (its response was lost) gets
+--  // the stored response back instead of applying the write twice. Keys are only
+--  // kept for a day: replays older than that are not expected.
+CREATE TABLE "idempotency_keys" (
+  "key" VARCHAR(64) NOT NULL,
+  "method" VARCHAR(8) NOT NULL,
+  "path" VARCHAR(255) NOT NULL,
+  "status" INTEGER NOT NULL,
+  "content_type" VARCHAR(128),
+  "body" TEXT NOT NULL,
+  "created_at" TIMESTAMP NOT NULL DEFAULT NOW()
+);
+ALTER TABLE "idempotency_keys"
+  ADD CONSTRAINT "idempotency_key.pkey" PRIMARY KEY ("key");
+
+CREATE INDEX "idempotency_key_index_created" ON "idempotency_keys"("created_at");
@@ -0,0 +1,40 @@
+-- V14: COMMIT-ORDERED CURSOR FOR THE GUILD CHANGE LOG.
+--  // "seq" is taken inside the writing transaction, not at commit: a write that
+--  // commits after a later one would land behind a cursor already handed out.
+--  // Each row now keeps the id of the transaction that wrote it, and cursors are
+--  // a watermark below which every transaction has finished (the snapshot xmin),
+--  // so nothing can still appear under a cursor once a client holds it.
+ALTER TABLE "guild_changes"
+  ADD COLUMN "xid" BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE "guild_changes"
+  ALTER COLUMN "xid" SET DEFAULT pg_current_xact_id()::TEXT::BIGINT;
+
+CREATE INDEX "guild_change_index_guild_xid" ON "guild_changes"("guild_id","xid");
+
+--  // Watermark below which rows were pruned: cursors under it must reset.
+CREATE TABLE "guild_change_horizon" (
+  "xid" BIGINT NOT NULL
+);
+INSERT INTO "guild_change_horizon"("xid") VALUES (0);
+
+CREATE FUNCTION guild_change_watermark() RETURNS BIGINT AS $$
+  SELECT pg_snapshot_xmin(pg_current_snapshot())::TEXT::BIGINT;
+$$ LANGUAGE sql VOLATILE;
+
+--  // Prunes whole transactions, never part of one, and only finished ones.
+CREATE FUNCTION prune_guild_changes(older_than INTERVAL) RETURNS BIGINT AS $$
+DECLARE
+  horizon BIGINT;
+  pruned BIGINT;
+BEGIN
+  SELECT MAX("xid") + 1 INTO horizon FROM "guild_changes"
+    WHERE "changed_at" < NOW() - older_than AND "xid" < guild_change_watermark();
+  IF horizon IS NULL THEN
+    RETURN 0;
+  END IF;
+  DELETE FROM "guild_changes" WHERE "xid" < horizon;
+  GET DIAGNOSTICS pruned = ROW_COUNT;
+  UPDATE "guild_change_horizon" SET "xid" = GREATEST("xid", horizon);
+  RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
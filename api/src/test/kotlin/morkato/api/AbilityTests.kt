@@ -3,6 +3,7 @@ package morkato.api
 import org.springframework.beans.factory.annotation.Autowired
 import org.springframework.test.web.servlet.MockMvc
 import com.fasterxml.jackson.databind.ObjectMapper
+import org.springframework.test.web.servlet.post
 import org.springframework.test.web.servlet.get
 import org.springframework.test.web.servlet.put
 import org.springframework.http.MediaType
@@ -15,4 +16,51 @@ class AbilityTests(
   @Autowired mvc: MockMvc,
   @Autowired mapper: ObjectMapper
 ) : ApiApplicationTests(flyway, mvc, mapper) {
-}
\ No newline at end of file
+  companion object {
+    const val GUILD_ID = GuildControllerTests.DEFAULT_GUILD_ID
+    const val INVALID_NAME = "1nvalid:name"
+  }
+  @DisplayName("AbilityController rejects invalid payloads")
+  @Test
+  fun abilityControllerValidation() {
+    mvc.post("/abilities/$GUILD_ID") {
+      contentType = MediaType.APPLICATION_JSON
+      content = mapper.writeValueAsString(mapOf("name" to INVALID_NAME))
+    }.andExpect {
+      status { isBadRequest() }
+    }
+    mvc.post("/families/$GUILD_ID") {
+      contentType = MediaType.APPLICATION_JSON
+      content = mapper.writeValueAsString(mapOf("name" to INVALID_NAME))
+    }.andExpect {
+      status { isBadRequest() }
+    }
+    val id = mapper.readTree(
+      mvc.post("/abilities/$GUILD_ID") {
+        contentType = MediaType.APPLICATION_JSON
+        content = mapper.writeValueAsString(mapOf("name" to "Habilidade"))
+      }.andExpect {
+        status { isOk() }
+      }.andReturn()
+        .response
+        .contentAsString
+    ).get("id").asText()
+    // Updates are partial: only the fields sent are checked.
+    mvc.put("/abilities/$GUILD_ID/$id") {
+      contentType = MediaType.APPLICATION_JSON
+      content = mapper.writeValueAsString(mapOf("description" to "x".repeat(2049)))
+    }.andExpect {
+      status { isBadRequest() }
+    }
+    mvc.put("/abilities/$GUILD_ID/$id") {
+      contentType = MediaType.APPLICATION_JSON
+      content = mapper.writeValueAsString(mapOf("name" to "Outro nome"))
+    }.andExpect {
+      status { isOk() }
+    }
+    mvc.get("/abilities/$GUILD_ID/$id")
+      .andExpect {
+        jsonPath("$.name") { value("Outro nome") }
+      }
+  }
+}
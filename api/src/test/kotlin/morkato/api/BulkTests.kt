@@ -0,0 +1,81 @@
+package morkato.api
+
+import org.springframework.beans.factory.annotation.Autowired
+import org.springframework.test.web.servlet.MockMvc
+import com.fasterxml.jackson.databind.ObjectMapper
+import org.springframework.test.web.servlet.post
+import org.springframework.test.web.servlet.get
+import org.springframework.http.MediaType
+import org.junit.jupiter.api.DisplayName
+import org.junit.jupiter.api.Test
+import org.flywaydb.core.Flyway
+
+class BulkTests(
+  @Autowired flyway: Flyway,
+  @Autowired mvc: MockMvc,
+  @Autowired mapper: ObjectMapper
+) : ApiApplicationTests(flyway, mvc, mapper) {
+  companion object {
+    const val GUILD_ID = GuildControllerTests.DEFAULT_GUILD_ID
+    const val MAX_BULK_SIZE = 500
+    const val INVALID_NAME = "1nvalid:name"
+  }
+  fun items(count: Int) : List<Map<String, Any?>> {
+    return (0 until count).map { mapOf("name" to "Item $it") }
+  }
+  fun postJson(path: String, body: Any) = mvc.post(path) {
+    contentType = MediaType.APPLICATION_JSON
+    content = mapper.writeValueAsString(body)
+  }
+  fun assertBulkRoute(bulkPath: String, listPath: String) {
+    postJson(bulkPath, items(3))
+      .andExpect {
+        status { isOk() }
+        content { contentType(MediaType.APPLICATION_JSON) }
+        jsonPath("$.length()") { value(3) }
+        jsonPath("$[0].name") { value("Item 0") }
+        jsonPath("$[2].name") { value("Item 2") }
+      }
+    // One bad item rejects the whole batch before anything is written.
+    postJson(bulkPath, items(2) + mapOf("name" to INVALID_NAME))
+      .andExpect {
+        status { isBadRequest() }
+      }
+    postJson(bulkPath, items(2) + mapOf("name" to "Item", "description" to "x".repeat(2049)))
+      .andExpect {
+        status { isBadRequest() }
+      }
+    postJson(bulkPath, items(MAX_BULK_SIZE + 1))
+      .andExpect {
+        status { isPayloadTooLarge() }
+      }
+    mvc.get(listPath)
+      .andExpect {
+        status { isOk() }
+        jsonPath("$.length()") { value(3) }
+      }
+  }
+  @DisplayName("AbilityController bulk create")
+  @Test
+  fun abilityBulk() {
+    assertBulkRoute("/abilities/$GUILD_ID/bulk", "/abilities/$GUILD_ID")
+  }
+  @DisplayName("FamilyController bulk create")
+  @Test
+  fun familyBulk() {
+    assertBulkRoute("/families/$GUILD_ID/bulk", "/families/$GUILD_ID")
+  }
+  @DisplayName("AttackController bulk create")
+  @Test
+  fun attackBulk() {
+    val art = mapper.readTree(
+      postJson("/arts/$GUILD_ID", mapOf("name" to "Arte", "type" to "RESPIRATION"))
+        .andExpect {
+          status { isOk() }
+        }.andReturn()
+        .response
+        .contentAsString
+    ).get("id").asText()
+    assertBulkRoute("/attacks/$GUILD_ID/$art/bulk", "/attacks/$GUILD_ID")
+  }
+}
@@ -0,0 +1,157 @@
+package morkato.api
+
+import org.springframework.transaction.annotation.Transactional
+import org.springframework.transaction.annotation.Propagation
+import org.springframework.beans.factory.annotation.Autowired
+import org.springframework.test.web.servlet.MockMvc
+import org.springframework.test.web.servlet.delete
+import org.springframework.test.web.servlet.post
+import org.springframework.test.web.servlet.get
+import org.springframework.http.MediaType
+import com.fasterxml.jackson.databind.ObjectMapper
+import morkato.api.dto.guild.GuildSnapshotResponseData
+import morkato.api.dto.guild.GuildChangesResponseData
+import morkato.api.dto.ability.AbilityResponseData
+import morkato.api.controller.GuildController
+import org.junit.jupiter.api.DisplayName
+import org.junit.jupiter.api.Test
+import org.flywaydb.core.Flyway
+import javax.sql.DataSource
+import kotlin.test.assertEquals
+import kotlin.test.assertTrue
+
+// Cursors follow commits, so every write here has to commit: no test-wide transaction.
+@Transactional(propagation = Propagation.NOT_SUPPORTED)
+class GuildChangesTests(
+  @Autowired flyway: Flyway,
+  @Autowired mvc: MockMvc,
+  @Autowired mapper: ObjectMapper,
+  @Autowired val dataSource: DataSource
+) : ApiApplicationTests(flyway, mvc, mapper) {
+  companion object {
+    const val GUILD_ID = GuildControllerTests.DEFAULT_GUILD_ID
+  }
+  fun changes(since: Long?) : GuildChangesResponseData {
+    return mapper.readValue(
+      mvc.get("/guilds/$GUILD_ID/changes") {
+        if (since != null) {
+          param("since", since.toString())
+        }
+      }.andExpect {
+        status { isOk() }
+        content { contentType(MediaType.APPLICATION_JSON) }
+      }.andReturn()
+        .response
+        .contentAsString,
+      GuildChangesResponseData::class.java
+    )
+  }
+  fun createAbility(name: String) : AbilityResponseData {
+    return mapper.readValue(
+      mvc.post("/abilities/$GUILD_ID") {
+        contentType = MediaType.APPLICATION_JSON
+        content = mapper.writeValueAsString(mapOf("name" to name))
+      }.andExpect {
+        status { isOk() }
+      }.andReturn()
+        .response
+        .contentAsString,
+      AbilityResponseData::class.java
+    )
+  }
+  @DisplayName("GuildController changes since a cursor")
+  @Test
+  fun changesSinceCursor() {
+    val initial = changes(null)
+    assertTrue(initial.reset)
+    val ability = createAbility("Habilidade")
+    val first = changes(initial.cursor.toLong())
+    assertTrue(!first.reset)
+    assertEquals(listOf(ability.id), first.abilities.map { it.id })
+    val second = changes(first.cursor.toLong())
+    assertTrue(!second.reset)
+    assertTrue(second.abilities.isEmpty())
+    mvc.delete("/abilities/$GUILD_ID/${ability.id}")
+      .andExpect { status { isOk() } }
+    val third = changes(second.cursor.toLong())
+    assertTrue(third.abilities.isEmpty())
+    assertEquals(listOf(ability.id), third.deleted.abilities)
+  }
+  @DisplayName("GuildController snapshot cursor")
+  @Test
+  fun snapshotCursor() {
+    createAbility("Primeira")
+    val snapshot = mapper.readValue(
+      mvc.get("/guilds/$GUILD_ID/snapshot")
+        .andExpect {
+          status { isOk() }
+        }.andReturn()
+        .response
+        .contentAsString,
+      GuildSnapshotResponseData::class.java
+    )
+    // A client hydrated from the snapshot polls from its cursor without reloading anything.
+    val unchanged = changes(snapshot.cursor.toLong())
+    assertTrue(!unchanged.reset)
+    assertTrue(unchanged.abilities.isEmpty())
+    val ability = createAbility("Segunda")
+    assertEquals(listOf(ability.id), changes(unchanged.cursor.toLong()).abilities.map { it.id })
+  }
+  @DisplayName("GuildController changes committed out of order")
+  @Test
+  fun changesCommittedOutOfOrder() {
+    createAbility("Primeira")
+    val before = changes(null)
+    // Transaction A writes first and commits last; B commits in between.
+    dataSource.connection.use { connection ->
+      connection.autoCommit = false
+      val pending = connection.createStatement().use { statement ->
+        statement.executeQuery(
+          "INSERT INTO \"abilities\"(\"name\",\"key\",\"guild_id\") VALUES ('Pendente','pendente','$GUILD_ID') RETURNING \"id\""
+        ).use { result ->
+          result.next()
+          result.getLong(1).toString()
+        }
+      }
+      val committed = createAbility("Segunda")
+      val during = changes(before.cursor.toLong())
+      // B is held back with A, instead of moving the cursor past A.
+      assertTrue(during.abilities.isEmpty())
+      connection.commit()
+      val after = changes(during.cursor.toLong())
+      assertEquals(setOf(pending, committed.id), after.abilities.map { it.id }.toSet())
+    }
+  }
+  @DisplayName("GuildController changes reset")
+  @Test
+  fun changesReset() {
+    val initial = changes(null)
+    createAbility("Habilidade")
+    val current = changes(initial.cursor.toLong())
+    assertTrue(changes(current.cursor.toLong() + 1_000_000).reset)
+    dataSource.connection.use { connection ->
+      connection.createStatement().use { it.execute("SELECT prune_guild_changes(INTERVAL '0 seconds')") }
+    }
+    // Its rows are gone: only a reload can tell what changed.
+    assertTrue(changes(initial.cursor.toLong()).reset)
+    assertTrue(!changes(current.cursor.toLong()).reset)
+  }
+  @DisplayName("GuildController changes overflow")
+  @Test
+  fun changesOverflow() {
+    val initial = changes(null)
+    val names = (0..GuildController.MAX_CHANGES).map { mapOf("name" to "Habilidade $it") }
+    for (batch in names.chunked(500)) {
+      mvc.post("/abilities/$GUILD_ID/bulk") {
+        contentType = MediaType.APPLICATION_JSON
+        content = mapper.writeValueAsString(batch)
+      }.andExpect {
+        status { isOk() }
+      }
+    }
+    val overflow = changes(initial.cursor.toLong())
+    assertTrue(overflow.reset)
+    assertTrue(overflow.abilities.isEmpty())
+    assertTrue(!changes(overflow.cursor.toLong()).reset)
+  }
+}
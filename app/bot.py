@@ -12,8 +12,11 @@ class AppBot(MorkatoBot):
   async def __aenter__(self) -> Self:
     await super().__aenter__()
     await self.morkato_http.static_login()
+    self.morkato_connection.start_sync()
     return self
   async def __aexit__(self, *args) -> None:
+    await self.morkato_connection.close()
+    self.morkato_connection.image_preprocessor.close()
     await self.morkato_http.close()
     await super().__aexit__(*args)
   async def _async_setup_hook(self) -> None:
@@ -30,5 +30,6 @@ from .art import (
   ArtCreatedBuilder,
   ArtUpdatedBuilder,
   ArtTrainBuilder,
+  ArtListBuilder,
   ArtBuilder
 )
\ No newline at end of file
@@ -1,7 +1,12 @@
 from numerize.numerize import numerize
+from morkbmt.embeds import StreamEmbedBuilder
 from .base import BaseEmbedBuilder
 from discord.embeds import Embed
 from morkato.art import Art
+from typing import (
+  AsyncIterator,
+  List
+)
 
 class ArtBuilder(BaseEmbedBuilder):
   def __init__(self, art: Art) -> None:
@@ -82,6 +87,21 @@ class ArtUpdatedBuilder(ArtBuilder):
       text = self.footer_text.format(art=self.art)
     )
     return embed
+class ArtListBuilder(BaseEmbedBuilder, StreamEmbedBuilder[Art]):
+  def __init__(self, arts: AsyncIterator[Art]) -> None:
+    super().__init__(arts, chunk_size=self.CHUNK_SIZE)
+    self.title = self.msgbuilder.get_content(self.LANGUAGE, "artListTitle")
+    self.line_style = self.msgbuilder.get_content(self.LANGUAGE, "artListLineStyle")
+    self.default_embed_description = self.msgbuilder.get_content(self.LANGUAGE, "defaultEmbedDescription")
+  async def build_page(self, page: int, arts: List[Art]) -> Embed:
+    description = ''
+    for (idx, art) in enumerate(arts, start=page * self.chunk_size + 1):
+      description += self.line_style.format(idx=idx, art=art)
+      description += '\n'
+    return Embed(
+      title = self.title,
+      description = description or self.default_embed_description
+    )
 class ArtTrainBuilder(BaseEmbedBuilder):
   def __init__(self, art: Art) -> None:
     self.art = art
@@ -18,10 +18,11 @@ class BaseExtension(Extension):
   connection: MorkatoConnectionState
   user: discord.ClientUser
   http: HTTPClient
-  async def get_morkato_guild(self, guild: Snowflake) -> Guild:
+  async def get_morkato_guild(self, guild: Snowflake, *, hydrate: bool = False) -> Guild:
     morkato = self.connection.get_cached_guild(guild.id)
     if morkato is None:
-      morkato = await self.connection.fetch_guild(guild.id)
+      # Paths that walk whole collections load them with the guild in one snapshot.
+      return await self.connection.fetch_guild(guild.id, hydrate=hydrate)
     return morkato
   async def send_confirmation(self, interaction: discord.Interaction, **options) -> bool:
     view = ConfirmationView()
@@ -0,0 +1,96 @@
+from morkato.pool import ConnectionPoolConfig
+from morkato.adaptive import AIMDLimiter
+from morkato.retry import RetryPolicy
+from morkato.errors import MorkatoException
+from morkato.http import HTTPClient
+from aiohttp import web
+from typing import (
+  Optional,
+  List
+)
+import statistics
+import argparse
+import asyncio
+import time
+
+class StandIn:
+  def __init__(self, workers: int, service_time: float, queue_limit: int) -> None:
+    self.workers = asyncio.Semaphore(workers)
+    self.service_time = service_time
+    self.queue_limit = queue_limit
+    self.queued = 0
+  def slowdown(self, service_time: float) -> None:
+    self.service_time = service_time
+  async def fetch_user(self, request: web.Request) -> web.Response:
+    if self.queued >= self.queue_limit:
+      return web.json_response({"extra": {}}, status=503)
+    self.queued += 1
+    try:
+      async with self.workers:
+        await asyncio.sleep(self.service_time)
+    finally:
+      self.queued -= 1
+    return web.json_response({"id": request.match_info["id"]})
+async def load(client: HTTPClient, clients: int, duration: float, latencies: List[float], errors: List[int]) -> None:
+  stop = time.monotonic() + duration
+  async def worker(idx: int) -> None:
+    id = 0
+    while time.monotonic() < stop:
+      id += 1
+      started = time.monotonic()
+      try:
+        await client.fetch_user(idx, id)
+        latencies.append(time.monotonic() - started)
+      except MorkatoException:
+        errors.append(1)
+  await asyncio.gather(*(worker(idx) for idx in range(clients)))
+async def simulate(name: str, port: int, standin: StandIn, limiter: Optional[AIMDLimiter], clients: int, phase: float) -> None:
+  client = HTTPClient(
+    base_url = "http://127.0.0.1:%s" % port,
+    coalesce_gets = False,
+    max_concurrency = clients,
+    pool = ConnectionPoolConfig(limit=clients, limit_per_host=clients),
+    adaptive_concurrency = limiter,
+    retry_policy = RetryPolicy(max_retries=0, breaker_threshold=10 ** 9)
+  )
+  await client.static_login()
+  print("== %s" % name)
+  try:
+    for (label, service_time) in (("healthy", 0.01), ("degraded", 0.05), ("recovered", 0.01)):
+      standin.slowdown(service_time)
+      latencies: List[float] = []
+      errors: List[int] = []
+      await load(client, clients, phase, latencies, errors)
+      latencies.sort()
+      p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+      print("%-10s limit %4s   ok %6s   5xx %5s   p50 %7.1f ms   p99 %7.1f ms" % (
+        label,
+        client.scheduler.limit,
+        len(latencies),
+        len(errors),
+        statistics.median(latencies) * 1000 if latencies else 0.0,
+        p99 * 1000
+      ))
+  finally:
+    await client.close()
+async def amain(clients: int, phase: float) -> None:
+  standin = StandIn(workers=16, service_time=0.01, queue_limit=64)
+  app = web.Application()
+  app.router.add_get("/users/{guild_id}/{id}", standin.fetch_user)
+  runner = web.AppRunner(app, access_log=None)
+  await runner.setup()
+  await web.TCPSite(runner, "127.0.0.1", 0).start()
+  port = runner.addresses[0][1]
+  try:
+    await simulate("static", port, standin, None, clients, phase)
+    await simulate("aimd", port, standin, AIMDLimiter(initial_limit=8, max_limit=clients, window=phase), clients, phase)
+  finally:
+    await runner.cleanup()
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Simulate AIMD concurrency limiting against a stand-in API with injected slowdowns.")
+  parser.add_argument("--clients", type=int, default=128)
+  parser.add_argument("--phase", type=float, default=3.0)
+  args = parser.parse_args()
+  asyncio.run(amain(args.clients, args.phase))
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,55 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Latency)
+from morkato.pool import ConnectionPoolConfig
+from morkato.bulk import BulkPolicy
+from morkato.http import HTTPClient
+from typing import (
+  Optional,
+  Dict,
+  List,
+  Any
+)
+import argparse
+import asyncio
+import time
+
+GUILD_ID = 1
+
+def attacks(count: int) -> List[Dict[str, Any]]:
+  return [{"name": "Ataque %s" % idx, "damage": idx % 1000, "stun": idx % 100, "flags": idx % 64} for idx in range(count)]
+async def measure(name: str, count: int, latency: float, *, bulk: bool = True, concurrency: Optional[int] = None, policy: Optional[BulkPolicy] = None) -> None:
+  api = FakeMorkatoAPI(latency=Latency("constant", latency), bulk=bulk)
+  url = await api.start()
+  client = HTTPClient(base_url=url, pool=ConnectionPoolConfig(limit=64, limit_per_host=64), bulk_policy=policy)
+  await client.static_login()
+  try:
+    art = await client.create_art(GUILD_ID, name="Arte", type="RESPIRATION")
+    api.requests.clear()
+    items = attacks(count)
+    started = time.perf_counter()
+    if concurrency is None and policy is None:
+      created = [await client.create_attack(GUILD_ID, art["id"], **item) for item in items]
+    else:
+      created = [payload async for payload in client.bulk_create_attacks(GUILD_ID, art["id"], items, concurrency=concurrency)]
+    elapsed = time.perf_counter() - started
+  finally:
+    await client.close()
+    await api.close()
+  assert [payload["name"] for payload in created] == [item["name"] for item in items]
+  print("%-22s %8.3f s   %7.0f attacks/s   %5s requests" % (name, elapsed, count / elapsed, sum(api.requests.values())))
+async def amain(count: int, latency: float, batch_size: int) -> None:
+  print("%s attacks, %.1f ms per request" % (count, latency * 1000))
+  await measure("sequential", count, latency)
+  for concurrency in (8, 32):
+    await measure("fan-out x%s" % concurrency, count, latency, bulk=False, concurrency=concurrency, policy=BulkPolicy(use_bulk_routes=False))
+  await measure("bulk route (%s/batch)" % batch_size, count, latency, policy=BulkPolicy(batch_size=batch_size))
+  # An API without the bulk route: the first batch finds out and the rest fans out.
+  await measure("bulk, older API", count, latency, bulk=False, policy=BulkPolicy(batch_size=batch_size))
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Wall time to create attacks one by one, fanned out, and through the bulk route.")
+  parser.add_argument("--count", type=int, default=1000)
+  parser.add_argument("--latency", type=float, default=0.005, help="seconds the stand-in waits before answering each request")
+  parser.add_argument("--batch-size", type=int, default=100)
+  args = parser.parse_args()
+  asyncio.run(amain(args.count, args.latency, args.batch_size))
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,102 @@
+from morkato.codec import (ART, compact, dumps)
+from morkato.utils import NoNullDict
+from typing import (
+  Callable,
+  Tuple,
+  Dict,
+  List,
+  Any
+)
+import tracemalloc
+import argparse
+import orjson
+import random
+import time
+
+def generate(arts: int, attacks: int, seed: int) -> bytes:
+  rng = random.Random(seed)
+  guild_id = str(rng.getrandbits(60))
+  snowflake = lambda: str(rng.getrandbits(60))
+  payload: List[Dict[str, Any]] = []
+  for idx in range(arts):
+    art_id = snowflake()
+    payload.append({
+      "name": "Art %s" % idx,
+      "guild_id": guild_id,
+      "id": art_id,
+      "type": rng.choice(("RESPIRATION", "KEKKIJUTSU", "FIGHTING_STYLE")),
+      "life": rng.randint(0, 1000),
+      "breath": rng.randint(0, 1000),
+      "blood": rng.randint(0, 1000),
+      "energy": rng.randint(0, 100),
+      "description": "Descrição da arte número %s" % idx,
+      "banner": None,
+      "attacks": [
+        {
+          "name": "Ataque %s-%s" % (idx, jdx),
+          "guild_id": guild_id,
+          "id": snowflake(),
+          "art_id": art_id,
+          "name_prefix_art": None,
+          "description": "Descrição do ataque",
+          "banner": None,
+          "wisteria_turn": 0,
+          "poison_turn": rng.randint(0, 3),
+          "burn_turn": rng.randint(0, 3),
+          "bleed_turn": rng.randint(0, 3),
+          "wisteria": 0,
+          "poison": rng.randint(0, 100),
+          "burn": rng.randint(0, 100),
+          "bleed": rng.randint(0, 100),
+          "stun": rng.randint(0, 100),
+          "damage": rng.randint(0, 1000),
+          "breath": rng.randint(0, 100),
+          "blood": rng.randint(0, 100),
+          "flags": rng.getrandbits(6)
+        }
+        for jdx in range(attacks)
+      ]
+    })
+  return orjson.dumps(payload)
+def legacy_decode(body: bytes) -> Any:
+  # What json_or_text and the models did before: str round-trip, ids converted per model.
+  payload = orjson.loads(body.decode("utf-8"))
+  for art in payload:
+    int(art["id"])
+    for attack in art["attacks"]:
+      int(attack["id"])
+  return payload
+def codec_decode(body: bytes) -> Any:
+  return ART.loads(body)
+def measure(fn: Callable[[], Any], rounds: int) -> Tuple[float, float, int]:
+  timings = []
+  for _ in range(rounds):
+    started = time.perf_counter()
+    fn()
+    timings.append(time.perf_counter() - started)
+  tracemalloc.start()
+  fn()
+  (_, peak) = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  timings.sort()
+  return (timings[0], timings[len(timings) // 2], peak)
+def report(label: str, result: Tuple[float, float, int]) -> None:
+  (best, median, peak) = result
+  print("%-22s best %8.2f ms   median %8.2f ms   peak %8.1f KiB" % (label, best * 1000, median * 1000, peak / 1024))
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Compare the bytes-native codec with the legacy str decode on a fetch_arts payload.")
+  parser.add_argument("--arts", type=int, default=100)
+  parser.add_argument("--attacks", type=int, default=50, help="attacks per art")
+  parser.add_argument("--rounds", type=int, default=50)
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args()
+  body = generate(args.arts, args.attacks, args.seed)
+  print("payload: %s arts, %s attacks, %.1f KiB" % (args.arts, args.arts * args.attacks, len(body) / 1024))
+  report("decode legacy (str)", measure(lambda: legacy_decode(body), args.rounds))
+  report("decode codec (bytes)", measure(lambda: codec_decode(body), args.rounds))
+  fields = dict(name="Ataque", name_prefix_art=None, description="Descrição", banner=None, damage=100, breath=None, blood=None, stun=10)
+  encodes = 10000
+  report("encode NoNullDict x%s" % encodes, measure(lambda: [orjson.dumps(NoNullDict(**fields)) for _ in range(encodes)], 5))
+  report("encode compact x%s" % encodes, measure(lambda: [dumps(compact(**fields)) for _ in range(encodes)], 5))
+if __name__ == "__main__":
+  main()
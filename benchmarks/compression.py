@@ -0,0 +1,60 @@
+from morkato.compression import CompressionPolicy
+from morkato.http import HTTPClient
+from benchmarks.codec import generate
+from aiohttp import web
+import argparse
+import asyncio
+import time
+
+class StandIn:
+  def __init__(self, body: bytes) -> None:
+    self.body = body
+  async def fetch_arts(self, request: web.Request) -> web.Response:
+    response = web.Response(body=self.body, content_type="application/json", zlib_executor_size=64 * 1024)
+    # Negotiates from Accept-Encoding like a reverse proxy in front of the API would.
+    response.enable_compression()
+    return response
+  async def fetch_guild(self, request: web.Request) -> web.Response:
+    response = web.json_response({"human_initial_life": 1000, "oni_initial_life": 1000, "hybrid_initial_life": 1000, "breath_initial": 500, "blood_initial": 500, "family_roll": 3, "ability_roll": 3, "roll_category_id": None, "off_category_id": None})
+    response.enable_compression()
+    return response
+async def run(name: str, port: int, standin: StandIn, policy: CompressionPolicy, rounds: int) -> None:
+  client = HTTPClient(base_url="http://127.0.0.1:%s" % port, coalesce_gets=False, compression=policy)
+  await client.static_login()
+  try:
+    started = time.perf_counter()
+    for _ in range(rounds):
+      arts = await client.fetch_arts(1)
+      await client.fetch_guild(1)
+    elapsed = time.perf_counter() - started
+  finally:
+    await client.close()
+  stats = policy.stats()
+  print("== %s (Accept-Encoding: %s)" % (name, policy.accept_encoding("GET /arts/{gid}")))
+  print("arts %s   rounds %s   %.1f ms/round" % (len(arts), rounds, elapsed / rounds * 1000))
+  for (key, route) in stats["routes"].items():
+    print("  %-26s responses %4s   compressed %4s   wire %9s B   decoded %9s B" % (key, route["responses"], route["compressed"], route["wire_bytes"], route["decoded_bytes"]))
+  print("  saved %.1f%% of %s bytes" % (stats["saved_bytes"] / stats["decoded_bytes"] * 100 if stats["decoded_bytes"] else 0.0, stats["decoded_bytes"]))
+async def amain(arts: int, attacks: int, rounds: int) -> None:
+  standin = StandIn(generate(arts, attacks, 0))
+  app = web.Application()
+  app.router.add_get("/arts/{gid}", standin.fetch_arts)
+  app.router.add_get("/guilds/{guild_id}", standin.fetch_guild)
+  runner = web.AppRunner(app, access_log=None)
+  await runner.setup()
+  await web.TCPSite(runner, "127.0.0.1", 0).start()
+  port = runner.addresses[0][1]
+  try:
+    await run("identity", port, standin, CompressionPolicy(routes=()), rounds)
+    await run("list routes", port, standin, CompressionPolicy(), rounds)
+  finally:
+    await runner.cleanup()
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Measure bytes saved by compression negotiation against a compressing stand-in API.")
+  parser.add_argument("--arts", type=int, default=100)
+  parser.add_argument("--attacks", type=int, default=50, help="attacks per art")
+  parser.add_argument("--rounds", type=int, default=10)
+  args = parser.parse_args()
+  asyncio.run(amain(args.arts, args.attacks, args.rounds))
+if __name__ == "__main__":
+  main()
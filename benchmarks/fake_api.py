@@ -0,0 +1,599 @@
+from morkato.journal import IDEMPOTENCY_HEADER
+from morkato.utils import MORKATO_EPOCH
+from aiohttp import web
+from collections import Counter
+from typing import (
+  Awaitable,
+  Callable,
+  Optional,
+  Tuple,
+  Dict,
+  List,
+  Any
+)
+import argparse
+import asyncio
+import random
+import math
+import time
+
+Payload = Dict[str, Any]
+
+GUILD_DEFAULTS: Payload = {
+  "human_initial_life": 1000,
+  "oni_initial_life": 500,
+  "hybrid_initial_life": 1500,
+  "breath_initial": 500,
+  "blood_initial": 1000,
+  "family_roll": 3,
+  "ability_roll": 3,
+  "prodigy_roll": 1,
+  "mark_roll": 1,
+  "berserk_roll": 1,
+  "roll_category_id": None,
+  "off_category_id": None
+}
+ART_DEFAULTS: Payload = {"energy": 25, "life": 1, "breath": 1, "blood": 1, "description": None, "banner": None}
+ATTACK_DEFAULTS: Payload = {
+  "name_prefix_art": None,
+  "description": None,
+  "banner": None,
+  "wisteria_turn": 0,
+  "poison_turn": 0,
+  "burn_turn": 0,
+  "bleed_turn": 0,
+  "wisteria": 0,
+  "poison": 0,
+  "burn": 0,
+  "bleed": 0,
+  "stun": 0,
+  "damage": 0,
+  "breath": 0,
+  "blood": 0,
+  "flags": 0
+}
+SPEC_DEFAULTS: Payload = {"percent": 0, "user_type": 0, "description": None, "banner": None}
+USER_DEFAULTS: Payload = {"flags": 0, "ability_roll": 3, "family_roll": 3, "prodigy_roll": 1, "mark_roll": 1, "berserk_roll": 1}
+ART_TYPES = ("RESPIRATION", "KEKKIJUTSU", "FIGHTING_STYLE")
+USER_TYPES = ("HUMAN", "ONI", "HYBRID")
+
+class Snowflakes:
+  def __init__(self, timestamp: Optional[int] = None) -> None:
+    # A fixed timestamp makes seeded data reproducible; live ids follow the clock like the API's.
+    self.timestamp = timestamp
+    self.last = 0
+    self.sequence = 0
+  def next(self) -> int:
+    now = self.timestamp if self.timestamp is not None else int(time.time() * 1000) - MORKATO_EPOCH
+    now = max(now, self.last)
+    if now == self.last:
+      self.sequence += 1
+      if self.sequence >= 1 << 23:
+        now += 1
+        self.sequence = 0
+    else:
+      self.sequence = 0
+    self.last = now
+    return (now << 23) | self.sequence
+class Latency:
+  DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+  def __init__(self, distribution: str = "constant", *parameters: float) -> None:
+    if distribution not in self.DISTRIBUTIONS:
+      raise ValueError("Unknown latency distribution: %s" % distribution)
+    self.distribution = distribution
+    self.parameters = parameters
+  def __repr__(self) -> str:
+    return "<Latency %s>" % ":".join((self.distribution,) + tuple(map(str, self.parameters)))
+  @classmethod
+  def parse(cls, spec: str) -> "Latency":
+    # constant:0.01 | uniform:0.005:0.02 | exponential:0.01 | lognormal:0.01:0.5 (median, sigma)
+    (distribution, *parameters) = spec.split(":")
+    return cls(distribution, *map(float, parameters))
+  def sample(self, rng: random.Random) -> float:
+    parameters = self.parameters
+    if self.distribution == "uniform":
+      return rng.uniform(parameters[0], parameters[1])
+    if self.distribution == "exponential":
+      return rng.expovariate(1.0 / parameters[0]) if parameters[0] > 0 else 0.0
+    if self.distribution == "lognormal":
+      return rng.lognormvariate(math.log(parameters[0]), parameters[1] if len(parameters) > 1 else 0.5)
+    return parameters[0] if parameters else 0.0
+class Faults:
+  def __init__(
+    self, *,
+    error_rate: float = 0.0,
+    ratelimit_rate: float = 0.0,
+    reset_rate: float = 0.0,
+    retry_after: float = 0.05
+  ) -> None:
+    self.error_rate = error_rate
+    self.ratelimit_rate = ratelimit_rate
+    self.reset_rate = reset_rate
+    self.retry_after = retry_after
+  def roll(self, rng: random.Random) -> Optional[str]:
+    roll = rng.random()
+    if roll < self.reset_rate:
+      return "reset"
+    roll -= self.reset_rate
+    if roll < self.error_rate:
+      return "error"
+    roll -= self.error_rate
+    if roll < self.ratelimit_rate:
+      return "ratelimit"
+    return None
+class FakeGuild:
+  def __init__(self, id: str, settings: Optional[Payload] = None) -> None:
+    self.id = id
+    self.settings: Payload = dict(GUILD_DEFAULTS, **(settings or {}))
+    self.arts: Dict[int, Payload] = {}
+    self.attacks: Dict[int, Payload] = {}
+    self.abilities: Dict[int, Payload] = {}
+    self.families: Dict[int, Payload] = {}
+    self.users: Dict[str, Payload] = {}
+  def payload(self) -> Payload:
+    return dict(self.settings, id=self.id)
+  def art_payload(self, art: Payload) -> Payload:
+    art_id = art["id"]
+    attacks = sorted((attack for attack in self.attacks.values() if attack["art_id"] == art_id), key=lambda attack: int(attack["id"]))
+    return dict(art, attacks=attacks)
+class NotFound(Exception):
+  def __init__(self, model: str, **extra: Any) -> None:
+    self.model = model
+    self.extra = extra
+def page(objects: Dict[int, Payload], after: Optional[str], limit: Optional[str]) -> List[Payload]:
+  ids = sorted(objects)
+  if limit is None:
+    return [objects[id] for id in ids]
+  if after is not None:
+    ids = [id for id in ids if id > int(after)]
+  return [objects[id] for id in ids[:max(1, min(int(limit), 1000))]]
+def update(target: Payload, data: Payload, fields: Payload) -> Payload:
+  for key in fields:
+    if data.get(key) is not None:
+      target[key] = data[key]
+  if data.get("name") is not None:
+    target["name"] = data["name"]
+  return target
+class FakeMorkatoAPI:
+  MAX_CHANGES = 1000
+  def __init__(
+    self, *,
+    latency: Optional[Latency] = None,
+    route_latency: Optional[Dict[str, Latency]] = None,
+    faults: Optional[Faults] = None,
+    compress: bool = False,
+    etags: bool = False,
+    bulk: bool = True,
+    change_log: bool = True,
+    seed: Optional[int] = None
+  ) -> None:
+    self.latency = latency if latency is not None else Latency()
+    self.route_latency = route_latency if route_latency is not None else {}
+    self.faults = faults if faults is not None else Faults()
+    self.compress = compress
+    self.etags = etags
+    # Without bulk routes the stand-in answers like an API that predates them.
+    self.bulk = bulk
+    # Same for the change log: no /changes route and no cursor in the snapshot.
+    self.change_log = change_log
+    self.rng = random.Random(seed)
+    self.snowflakes = Snowflakes(1 << 35 if seed is not None else None)
+    self.guilds: Dict[str, FakeGuild] = {}
+    self.uploads: Dict[Tuple[str, str], int] = {}
+    self.changes: List[Tuple[int, str, str, int, bool]] = []
+    self.requests: Counter[str] = Counter()
+    self.injected: Counter[str] = Counter()
+    # Like the API's idempotency filter: a repeated key gets the stored response, not a second write.
+    self.idempotent: Dict[str, Tuple[int, bytes]] = {}
+    self.replayed: Counter[str] = Counter()
+    self.runner: Optional[web.AppRunner] = None
+    self.url: Optional[str] = None
+  def get_guild(self, id: str) -> FakeGuild:
+    guild = self.guilds.get(id)
+    if guild is None:
+      guild = self.guilds[id] = FakeGuild(id)
+    return guild
+  def record(self, guild: FakeGuild, model: str, id: int, deleted: bool = False) -> None:
+    self.changes.append((len(self.changes) + 1, guild.id, model, id, deleted))
+  def populate(
+    self, *,
+    guilds: int = 1,
+    arts: int = 10,
+    attacks: int = 5,
+    abilities: int = 10,
+    families: int = 10,
+    users: int = 100,
+    seed: int = 0
+  ) -> List[str]:
+    rng = random.Random(seed)
+    created = []
+    for _ in range(guilds):
+      guild = self.get_guild(str(rng.randrange(10 ** 17, 10 ** 18)))
+      created.append(guild.id)
+      for idx in range(abilities):
+        id = self.snowflakes.next()
+        guild.abilities[id] = dict(SPEC_DEFAULTS, guild_id=guild.id, id=str(id), name="Habilidade %s" % idx, percent=rng.randint(1, 20), user_type=rng.randint(1, 7), description="Descrição da habilidade %s" % idx)
+      ability_ids = [str(id) for id in guild.abilities]
+      for idx in range(families):
+        id = self.snowflakes.next()
+        guild.families[id] = dict(SPEC_DEFAULTS, guild_id=guild.id, id=str(id), name="Família %s" % idx, percent=rng.randint(1, 20), user_type=rng.randint(1, 7), description="Descrição da família %s" % idx, abilities=rng.sample(ability_ids, min(3, len(ability_ids))))
+      for idx in range(arts):
+        art_id = self.snowflakes.next()
+        guild.arts[art_id] = dict(ART_DEFAULTS, guild_id=guild.id, id=str(art_id), name="Arte %s" % idx, type=rng.choice(ART_TYPES), life=rng.randint(0, 1000), breath=rng.randint(0, 1000), blood=rng.randint(0, 1000), energy=rng.randint(0, 100), description="Descrição da arte %s" % idx)
+        for jdx in range(attacks):
+          id = self.snowflakes.next()
+          guild.attacks[id] = dict(
+            ATTACK_DEFAULTS,
+            guild_id = guild.id,
+            id = str(id),
+            art_id = str(art_id),
+            name = "Ataque %s-%s" % (idx, jdx),
+            description = "Descrição do ataque",
+            poison_turn = rng.randint(0, 3),
+            burn_turn = rng.randint(0, 3),
+            bleed_turn = rng.randint(0, 3),
+            poison = rng.randint(0, 100),
+            burn = rng.randint(0, 100),
+            bleed = rng.randint(0, 100),
+            stun = rng.randint(0, 100),
+            damage = rng.randint(0, 1000),
+            breath = rng.randint(0, 100),
+            blood = rng.randint(0, 100),
+            flags = rng.getrandbits(6)
+          )
+      family_ids = [str(id) for id in guild.families]
+      for _ in range(users):
+        id = str(rng.randrange(10 ** 17, 10 ** 18))
+        guild.users[id] = dict(
+          USER_DEFAULTS,
+          guild_id = guild.id,
+          id = id,
+          type = rng.choice(USER_TYPES),
+          abilities = rng.sample(ability_ids, min(2, len(ability_ids))),
+          families = rng.sample(family_ids, min(1, len(family_ids)))
+        )
+    return created
+  @web.middleware
+  async def middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+    resource = request.match_info.route.resource
+    key = "%s %s" % (request.method, resource.canonical if resource is not None else request.path)
+    self.requests[key] += 1
+    if key.startswith("GET /_fake"):
+      return await handler(request)
+    await asyncio.sleep(self.route_latency.get(key, self.latency).sample(self.rng))
+    fault = self.faults.roll(self.rng)
+    if fault is not None:
+      self.injected[fault] += 1
+    if fault == "reset":
+      # Dropped without a response, like a proxy or API restart mid-request.
+      if request.transport is not None:
+        request.transport.abort()
+      return web.Response(status=503)
+    if fault == "error":
+      return web.json_response({"extra": {"fault": "injected"}}, status=503)
+    if fault == "ratelimit":
+      return web.json_response({"extra": {}}, status=429, headers={"Retry-After": str(self.faults.retry_after)})
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER) if request.method != "GET" else None
+    if idempotency_key is not None and idempotency_key in self.idempotent:
+      self.replayed[key] += 1
+      (status, body) = self.idempotent[idempotency_key]
+      return web.Response(status=status, body=body, content_type="application/json")
+    try:
+      response = await handler(request)
+    except NotFound as exc:
+      return web.json_response({"model": exc.model, "extra": exc.extra}, status=404)
+    if idempotency_key is not None and isinstance(response, web.Response) and response.status < 300 and isinstance(response.body, bytes):
+      self.idempotent[idempotency_key] = (response.status, response.body)
+    # A 304 or 204 has no body to compress, and aiohttp refuses to try.
+    if self.compress and isinstance(response, web.Response) and response.body is not None and response.status not in (204, 304):
+      response.enable_compression()
+    return response
+  def json(self, request: web.Request, payload: Any) -> web.Response:
+    response = web.json_response(payload)
+    if self.etags and request.method == "GET" and response.body is not None:
+      etag = 'W/"%x"' % (hash(response.body) & 0xFFFFFFFFFFFF)
+      if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+      response.headers["ETag"] = etag
+    return response
+  def find(self, objects: Dict[int, Payload], id: str, model: str, **extra: Any) -> Payload:
+    payload = objects.get(int(id))
+    if payload is None:
+      raise NotFound(model, id=id, **extra)
+    return payload
+  # Guilds
+  async def get_guild_route(self, request: web.Request) -> web.Response:
+    guild = self.guilds.get(request.match_info["guild_id"])
+    return self.json(request, guild.payload() if guild is not None else dict(GUILD_DEFAULTS, id=request.match_info["guild_id"]))
+  async def get_snapshot(self, request: web.Request) -> web.Response:
+    guild = self.guilds.get(request.match_info["guild_id"]) or FakeGuild(request.match_info["guild_id"])
+    snapshot = {
+      "guild": guild.payload(),
+      "arts": [guild.art_payload(guild.arts[id]) for id in sorted(guild.arts)],
+      "abilities": [guild.abilities[id] for id in sorted(guild.abilities)],
+      "families": [guild.families[id] for id in sorted(guild.families)]
+    }
+    if self.change_log:
+      snapshot["cursor"] = str(len(self.changes))
+    return self.json(request, snapshot)
+  async def get_changes(self, request: web.Request) -> web.Response:
+    guild = self.guilds.get(request.match_info["guild_id"]) or FakeGuild(request.match_info["guild_id"])
+    latest = len(self.changes)
+    since = request.query.get("since")
+    empty = {"arts": [], "attacks": [], "abilities": [], "families": [], "deleted": {"arts": [], "attacks": [], "abilities": [], "families": []}}
+    if since is None or int(since) > latest:
+      return self.json(request, dict(empty, cursor=str(latest), reset=True))
+    changes = [change for change in self.changes[int(since):] if change[1] == guild.id]
+    if len(changes) > self.MAX_CHANGES:
+      return self.json(request, dict(empty, cursor=str(latest), reset=True))
+    if not changes:
+      return self.json(request, dict(empty, cursor=since, reset=False))
+    last = {(model, id): deleted for (_, _, model, id, deleted) in changes}
+    def changed(model: str) -> List[int]:
+      return [id for ((kind, id), deleted) in last.items() if kind == model and not deleted]
+    def deleted(model: str) -> List[str]:
+      return [str(id) for ((kind, id), deleted) in last.items() if kind == model and deleted]
+    return self.json(request, {
+      "cursor": str(changes[-1][0]),
+      "reset": False,
+      "arts": [dict(guild.arts[id], attacks=[]) for id in changed("ART") if id in guild.arts],
+      "attacks": [guild.attacks[id] for id in changed("ATTACK") if id in guild.attacks],
+      "abilities": [guild.abilities[id] for id in changed("ABILITY") if id in guild.abilities],
+      "families": [guild.families[id] for id in changed("FAMILY") if id in guild.families],
+      "deleted": {"arts": deleted("ART"), "attacks": deleted("ATTACK"), "abilities": deleted("ABILITY"), "families": deleted("FAMILY")}
+    })
+  # Arts
+  async def get_arts(self, request: web.Request) -> web.Response:
+    guild = self.guilds.get(request.match_info["gid"])
+    if guild is None:
+      return self.json(request, [])
+    arts = page(guild.arts, request.query.get("after"), request.query.get("limit"))
+    return self.json(request, [guild.art_payload(art) for art in arts])
+  async def create_art(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["gid"])
+    data = await request.json()
+    id = self.snowflakes.next()
+    art = guild.arts[id] = update(dict(ART_DEFAULTS, guild_id=guild.id, id=str(id), type=data["type"]), data, ART_DEFAULTS)
+    self.record(guild, "ART", id)
+    return self.json(request, guild.art_payload(art))
+  async def update_art(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    art = self.find(guild.arts, request.match_info["id"], "ART", guild_id=guild.id)
+    data = await request.json()
+    update(art, data, dict(ART_DEFAULTS, type=None))
+    self.record(guild, "ART", int(art["id"]))
+    return self.json(request, guild.art_payload(art))
+  async def delete_art(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    art = self.find(guild.arts, request.match_info["id"], "ART", guild_id=guild.id)
+    payload = guild.art_payload(art)
+    if payload["attacks"]:
+      # The API's foreign key restricts deleting an art that still has attacks.
+      return web.json_response({"extra": {}}, status=500)
+    del guild.arts[int(art["id"])]
+    self.record(guild, "ART", int(art["id"]), True)
+    return self.json(request, payload)
+  # Attacks
+  def add_attack(self, guild: FakeGuild, art: Payload, data: Payload) -> Payload:
+    id = self.snowflakes.next()
+    attack = guild.attacks[id] = update(dict(ATTACK_DEFAULTS, guild_id=guild.id, id=str(id), art_id=art["id"]), data, ATTACK_DEFAULTS)
+    self.record(guild, "ATTACK", id)
+    return attack
+  async def create_attack(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    art = self.find(guild.arts, request.match_info["art_id"], "ART", guild_id=guild.id)
+    return self.json(request, self.add_attack(guild, art, await request.json()))
+  async def create_attacks(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    art = self.find(guild.arts, request.match_info["art_id"], "ART", guild_id=guild.id)
+    data = await request.json()
+    if len(data) > 500:
+      return web.json_response({"extra": {}}, status=413)
+    return self.json(request, [self.add_attack(guild, art, item) for item in data])
+  async def update_attack(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    attack = self.find(guild.attacks, request.match_info["id"], "ATTACK", guild_id=guild.id)
+    update(attack, await request.json(), ATTACK_DEFAULTS)
+    self.record(guild, "ATTACK", int(attack["id"]))
+    return self.json(request, attack)
+  async def delete_attack(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    attack = self.find(guild.attacks, request.match_info["id"], "ATTACK", guild_id=guild.id)
+    del guild.attacks[int(attack["id"])]
+    self.record(guild, "ATTACK", int(attack["id"]), True)
+    return self.json(request, attack)
+  # Abilities and families share a shape; the model name picks the collection.
+  def specs(self, guild: FakeGuild, model: str) -> Dict[int, Payload]:
+    return guild.abilities if model == "ABILITY" else guild.families
+  async def get_specs(self, request: web.Request, model: str) -> web.Response:
+    guild = self.guilds.get(request.match_info["guild_id"])
+    if guild is None:
+      return self.json(request, [])
+    return self.json(request, page(self.specs(guild, model), request.query.get("after"), request.query.get("limit")))
+  def add_spec(self, guild: FakeGuild, model: str, data: Payload) -> Payload:
+    id = self.snowflakes.next()
+    spec = update(dict(SPEC_DEFAULTS, guild_id=guild.id, id=str(id)), data, SPEC_DEFAULTS)
+    if model == "FAMILY":
+      spec["abilities"] = []
+    self.specs(guild, model)[id] = spec
+    self.record(guild, model, id)
+    return spec
+  async def create_spec(self, request: web.Request, model: str) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    return self.json(request, self.add_spec(guild, model, await request.json()))
+  async def create_specs(self, request: web.Request, model: str) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    data = await request.json()
+    if len(data) > 500:
+      return web.json_response({"extra": {}}, status=413)
+    return self.json(request, [self.add_spec(guild, model, item) for item in data])
+  async def update_spec(self, request: web.Request, model: str) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    spec = self.find(self.specs(guild, model), request.match_info["id"], model, guild_id=guild.id)
+    update(spec, await request.json(), SPEC_DEFAULTS)
+    self.record(guild, model, int(spec["id"]))
+    return self.json(request, spec)
+  async def delete_spec(self, request: web.Request, model: str) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    specs = self.specs(guild, model)
+    spec = self.find(specs, request.match_info["id"], model, guild_id=guild.id)
+    del specs[int(spec["id"])]
+    self.record(guild, model, int(spec["id"]), True)
+    return self.json(request, spec)
+  # Users
+  def find_user(self, request: web.Request, id_key: str = "id") -> Tuple[FakeGuild, Payload]:
+    guild_id = request.match_info["guild_id"]
+    id = request.match_info[id_key]
+    guild = self.guilds.get(guild_id)
+    user = guild.users.get(id) if guild is not None else None
+    if guild is None or user is None:
+      raise NotFound("USER", guild_id=guild_id, id=id)
+    return (guild, user)
+  async def get_user(self, request: web.Request) -> web.Response:
+    (_, user) = self.find_user(request)
+    return self.json(request, user)
+  async def create_user(self, request: web.Request) -> web.Response:
+    guild = self.get_guild(request.match_info["guild_id"])
+    data = await request.json()
+    id = request.match_info["id"]
+    user = guild.users[id] = update(dict(USER_DEFAULTS, guild_id=guild.id, id=id, type=data["type"], abilities=[], families=[]), data, USER_DEFAULTS)
+    return self.json(request, user)
+  async def update_user(self, request: web.Request) -> web.Response:
+    (_, user) = self.find_user(request)
+    update(user, await request.json(), USER_DEFAULTS)
+    return self.json(request, user)
+  async def delete_user(self, request: web.Request) -> web.Response:
+    (guild, user) = self.find_user(request)
+    del guild.users[user["id"]]
+    return self.json(request, user)
+  async def registry_user(self, request: web.Request, model: str) -> web.Response:
+    (guild, user) = self.find_user(request, "user_id")
+    key = "ability_id" if model == "ABILITY" else "family_id"
+    spec = self.find(self.specs(guild, model), request.match_info[key], model, guild_id=guild.id)
+    field = "abilities" if model == "ABILITY" else "families"
+    if spec["id"] not in user[field]:
+      user[field].append(spec["id"])
+    return self.json(request, user)
+  # CDN
+  async def upload(self, request: web.Request) -> web.Response:
+    if request.content_length is None:
+      # CdnApiController reads Content-Length before the body and fails without it.
+      return web.json_response({"extra": {}}, status=500)
+    header = await request.content.readexactly(12)
+    author_id = str(int.from_bytes(header[:8], byteorder="big"))
+    name = (await request.content.readexactly(int.from_bytes(header[8:], byteorder="big"))).decode("utf-8")
+    if (author_id, name) in self.uploads:
+      return web.json_response({"extra": {}}, status=500)
+    size = 0
+    async for chunk in request.content.iter_chunked(64 * 1024):
+      size += len(chunk)
+    self.uploads[(author_id, name)] = size
+    return web.Response(text="%s" % self.snowflakes.next())
+  async def stats(self, request: web.Request) -> web.Response:
+    return web.json_response(self.stats_payload())
+  def stats_payload(self) -> Payload:
+    return {"requests": dict(self.requests), "injected": dict(self.injected), "replayed": dict(self.replayed), "uploads": len(self.uploads)}
+  def for_model(self, handler: Callable[[web.Request, str], Awaitable[web.StreamResponse]], model: str) -> Callable[[web.Request], Awaitable[web.StreamResponse]]:
+    # aiohttp only takes coroutine functions as handlers, not lambdas returning a coroutine.
+    async def route(request: web.Request) -> web.StreamResponse:
+      return await handler(request, model)
+    return route
+  def create_app(self) -> web.Application:
+    app = web.Application(middlewares=[self.middleware], client_max_size=64 * 1024 * 1024)
+    router = app.router
+    router.add_get("/guilds/{guild_id}", self.get_guild_route)
+    router.add_get("/guilds/{guild_id}/snapshot", self.get_snapshot)
+    if self.change_log:
+      router.add_get("/guilds/{guild_id}/changes", self.get_changes)
+    router.add_get("/arts/{gid}", self.get_arts)
+    router.add_post("/arts/{gid}", self.create_art)
+    router.add_put("/arts/{guild_id}/{id}", self.update_art)
+    router.add_delete("/arts/{guild_id}/{id}", self.delete_art)
+    router.add_post("/attacks/{guild_id}/{art_id}", self.create_attack)
+    if self.bulk:
+      router.add_post("/attacks/{guild_id}/{art_id}/bulk", self.create_attacks)
+    router.add_put("/attacks/{guild_id}/{id}", self.update_attack)
+    router.add_delete("/attacks/{guild_id}/{id}", self.delete_attack)
+    for (path, model) in (("/abilities", "ABILITY"), ("/families", "FAMILY")):
+      router.add_get(path + "/{guild_id}", self.for_model(self.get_specs, model))
+      router.add_post(path + "/{guild_id}", self.for_model(self.create_spec, model))
+      if self.bulk:
+        router.add_post(path + "/{guild_id}/bulk", self.for_model(self.create_specs, model))
+      router.add_put(path + "/{guild_id}/{id}", self.for_model(self.update_spec, model))
+      router.add_delete(path + "/{guild_id}/{id}", self.for_model(self.delete_spec, model))
+    router.add_get("/users/{guild_id}/{id}", self.get_user)
+    router.add_post("/users/{guild_id}/{id}", self.create_user)
+    router.add_put("/users/{guild_id}/{id}", self.update_user)
+    router.add_delete("/users/{guild_id}/{id}", self.delete_user)
+    router.add_post("/users/{guild_id}/{user_id}/abilities/{ability_id}", self.for_model(self.registry_user, "ABILITY"))
+    router.add_post("/users/{guild_id}/{user_id}/families/{family_id}", self.for_model(self.registry_user, "FAMILY"))
+    router.add_post("/cdn/upload", self.upload)
+    router.add_get("/_fake/stats", self.stats)
+    return app
+  async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+    self.runner = web.AppRunner(self.create_app(), access_log=None)
+    await self.runner.setup()
+    await web.TCPSite(self.runner, host, port).start()
+    self.url = "http://%s:%s" % (host, self.runner.addresses[0][1])
+    return self.url
+  async def close(self) -> None:
+    if self.runner is not None:
+      await self.runner.cleanup()
+      self.runner = None
+  async def __aenter__(self) -> "FakeMorkatoAPI":
+    await self.start()
+    return self
+  async def __aexit__(self, *args: Any) -> None:
+    await self.close()
+def parse_route_latency(specs: List[str]) -> Dict[str, Latency]:
+  # "GET /arts/{gid}=lognormal:0.05:0.5"
+  routes: Dict[str, Latency] = {}
+  for spec in specs:
+    (key, latency) = spec.rsplit("=", 1)
+    routes[key] = Latency.parse(latency)
+  return routes
+async def serve(args: argparse.Namespace) -> None:
+  api = FakeMorkatoAPI(
+    latency = Latency.parse(args.latency),
+    route_latency = parse_route_latency(args.route_latency),
+    faults = Faults(error_rate=args.error_rate, ratelimit_rate=args.ratelimit_rate, reset_rate=args.reset_rate),
+    compress = args.compress,
+    etags = args.etags,
+    bulk = args.bulk,
+    seed = args.seed
+  )
+  guilds = api.populate(guilds=args.guilds, arts=args.arts, attacks=args.attacks, abilities=args.abilities, families=args.families, users=args.users, seed=args.seed)
+  url = await api.start(args.host, args.port)
+  print("listening on %s (point the bot at it with URL=%s)" % (url, url))
+  print("guilds: %s" % ", ".join(guilds))
+  try:
+    await asyncio.Event().wait()
+  finally:
+    print(api.stats_payload())
+    await api.close()
+def main() -> None:
+  parser = argparse.ArgumentParser(description="In-memory stand-in for the Morkato API with seeded data, latency and fault injection.")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=5500)
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--guilds", type=int, default=1)
+  parser.add_argument("--arts", type=int, default=100)
+  parser.add_argument("--attacks", type=int, default=10, help="attacks per art")
+  parser.add_argument("--abilities", type=int, default=50)
+  parser.add_argument("--families", type=int, default=20)
+  parser.add_argument("--users", type=int, default=1000)
+  parser.add_argument("--latency", default="constant:0", help="constant:S | uniform:LO:HI | exponential:MEAN | lognormal:MEDIAN:SIGMA")
+  parser.add_argument("--route-latency", action="append", default=[], help="per route override, e.g. 'GET /arts/{gid}=constant:0.05'")
+  parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+  parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+  parser.add_argument("--reset-rate", type=float, default=0.0, help="fraction of connections dropped without a response")
+  parser.add_argument("--compress", action="store_true", help="compress responses when the client accepts it")
+  parser.add_argument("--etags", action="store_true", help="send ETags and answer If-None-Match with 304")
+  parser.add_argument("--no-bulk", dest="bulk", action="store_false", help="leave out the bulk create routes, like an older API")
+  args = parser.parse_args()
+  try:
+    asyncio.run(serve(args))
+  except KeyboardInterrupt:
+    pass
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,146 @@
+from morkato.transport import HAS_HTTP2
+from morkato.pool import ConnectionPoolConfig
+from morkato.http import HTTPClient
+from collections import Counter
+from typing import (
+  Callable,
+  Tuple,
+  Dict,
+  List,
+  Set,
+  Any
+)
+import multiprocessing
+import statistics
+import argparse
+import asyncio
+import aiohttp
+import socket
+import orjson
+import time
+
+try:
+  from hypercorn.asyncio import serve
+  from hypercorn.config import Config
+except ImportError:
+  serve = None
+
+class StandIn:
+  # ASGI app: hypercorn serves it as HTTP/1.1 or, on the same port, as h2c with prior knowledge.
+  def __init__(self, latency: float) -> None:
+    self.latency = latency
+    self.sockets: Set[Tuple[str, int]] = set()
+    self.versions: Counter[str] = Counter()
+  async def respond(self, send: Callable[..., Any], payload: Any) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": orjson.dumps(payload)})
+  async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+    if scope["type"] == "lifespan":
+      while True:
+        message = await receive()
+        await send({"type": message["type"] + ".complete"})
+        if message["type"] == "lifespan.shutdown":
+          return
+    if scope["path"] == "/_stats":
+      # Read and reset between runs; not counted, it comes from a socket of its own.
+      payload = {"sockets": len(self.sockets), "versions": sorted(self.versions)}
+      self.sockets.clear()
+      self.versions.clear()
+      return await self.respond(send, payload)
+    self.sockets.add(tuple(scope["client"]))
+    self.versions[scope["http_version"]] += 1
+    (_, _, guild_id, id) = scope["path"].split("/")
+    await asyncio.sleep(self.latency)
+    await self.respond(send, {
+      "guild_id": guild_id,
+      "id": id,
+      "type": "HUMAN",
+      "flags": 0,
+      "ability_roll": 3,
+      "family_roll": 3,
+      "prodigy_roll": 1,
+      "mark_roll": 1,
+      "berserk_roll": 1,
+      "abilities": [],
+      "families": []
+    })
+def serve_standin(port: int, latency: float, streams: int) -> None:
+  config = Config()
+  config.bind = ["127.0.0.1:%s" % port]
+  config.accesslog = None
+  config.errorlog = None
+  config.h2_max_concurrent_streams = streams
+  # hypercorn recycles a connection after 1000 requests by default, which would cut streams mid-run.
+  config.keep_alive_max_requests = 2 ** 31
+  asyncio.run(serve(StandIn(latency), config)) # type: ignore
+async def standin_stats(base_url: str) -> Dict[str, Any]:
+  async with aiohttp.ClientSession() as session:
+    async with session.get(base_url + "/_stats") as response:
+      return await response.json()
+async def run(client: HTTPClient, concurrency: int, rounds: int) -> List[float]:
+  latencies: List[float] = []
+  async def one(id: int) -> None:
+    started = time.perf_counter()
+    await client.fetch_user(1, id)
+    latencies.append(time.perf_counter() - started)
+  for round in range(rounds):
+    await asyncio.gather(*(one(round * concurrency + id) for id in range(concurrency)))
+  return latencies
+async def measure(transport: str, base_url: str, concurrency: int, rounds: int) -> None:
+  # Both transports may hold one request per slot; HTTP/1.1 needs a socket for each.
+  pool = ConnectionPoolConfig(limit=concurrency, limit_per_host=concurrency)
+  client = HTTPClient(base_url=base_url, coalesce_gets=False, pool=pool, max_concurrency=concurrency, transport=transport)
+  await client.static_login()
+  try:
+    await run(client, concurrency, 1)
+    await standin_stats(base_url)
+    started = time.perf_counter()
+    cpu = time.process_time()
+    latencies = await run(client, concurrency, rounds)
+    cpu = time.process_time() - cpu
+    elapsed = time.perf_counter() - started
+    stats = await standin_stats(base_url)
+  finally:
+    await client.close()
+  latencies.sort()
+  p99 = latencies[int(len(latencies) * 0.99) - 1]
+  print("%-7s %8.0f req/s   p50 %7.2f ms   p99 %7.2f ms   client cpu %5.0f us/req   sockets %4s   %s" % (
+    transport,
+    len(latencies) / elapsed,
+    statistics.median(latencies) * 1000,
+    p99 * 1000,
+    cpu / len(latencies) * 1000000,
+    stats["sockets"],
+    ", ".join("HTTP/%s" % version for version in stats["versions"])
+  ))
+async def amain(port: int, concurrency: int, rounds: int) -> None:
+  base_url = "http://127.0.0.1:%s" % port
+  for _ in range(50):
+    try:
+      await standin_stats(base_url)
+      break
+    except aiohttp.ClientConnectionError:
+      await asyncio.sleep(0.1)
+  for transport in ("aiohttp", "http2"):
+    await measure(transport, base_url, concurrency, rounds)
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Compare the aiohttp and HTTP/2 transports under concurrent fetch_user calls.")
+  parser.add_argument("--concurrency", type=int, default=200)
+  parser.add_argument("--rounds", type=int, default=20)
+  parser.add_argument("--latency", type=float, default=0.005, help="seconds the stand-in waits before answering")
+  args = parser.parse_args()
+  if serve is None or not HAS_HTTP2:
+    parser.exit(1, "This benchmark needs hypercorn and httpx[http2] installed.\n")
+  with socket.socket() as sock:
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+  # The stand-in gets a process of its own so its HTTP/2 framing does not eat the client's CPU.
+  server = multiprocessing.Process(target=serve_standin, args=(port, args.latency, args.concurrency), daemon=True)
+  server.start()
+  try:
+    asyncio.run(amain(port, args.concurrency, args.rounds))
+  finally:
+    server.terminate()
+    server.join()
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,76 @@
+from morkato.pool import ConnectionPoolConfig
+from morkato.http import HTTPClient
+from aiohttp import web
+from typing import List
+import statistics
+import argparse
+import tempfile
+import asyncio
+import time
+import os
+
+GUILD = {
+  "human_initial_life": 1000,
+  "oni_initial_life": 1000,
+  "hybrid_initial_life": 1000,
+  "breath_initial": 100,
+  "blood_initial": 100,
+  "family_roll": 3,
+  "ability_roll": 3,
+  "roll_category_id": None,
+  "off_category_id": None
+}
+
+async def fetch_guild(request: web.Request) -> web.Response:
+  return web.json_response(GUILD)
+async def run(client: HTTPClient, requests: int, concurrency: int) -> List[float]:
+  latencies: List[float] = []
+  semaphore = asyncio.Semaphore(concurrency)
+  async def one(id: int) -> None:
+    async with semaphore:
+      started = time.perf_counter()
+      await client.fetch_guild(id)
+      latencies.append(time.perf_counter() - started)
+  await asyncio.gather(*(one(id) for id in range(requests)))
+  return latencies
+async def measure(name: str, base_url: str, requests: int, concurrency: int) -> None:
+  client = HTTPClient(base_url=base_url, coalesce_gets=False, pool=ConnectionPoolConfig(limit_per_host=concurrency))
+  await client.static_login()
+  try:
+    await run(client, concurrency, concurrency)
+    started = time.perf_counter()
+    latencies = await run(client, requests, concurrency)
+    elapsed = time.perf_counter() - started
+  finally:
+    await client.close()
+  latencies.sort()
+  p99 = latencies[int(len(latencies) * 0.99) - 1]
+  print("%-5s %8.0f req/s   p50 %6.2f ms   p99 %6.2f ms" % (
+    name,
+    requests / elapsed,
+    statistics.median(latencies) * 1000,
+    p99 * 1000
+  ))
+async def amain(requests: int, concurrency: int) -> None:
+  app = web.Application()
+  app.router.add_get("/guilds/{id}", fetch_guild)
+  runner = web.AppRunner(app, access_log=None)
+  await runner.setup()
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "morkato.sock")
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    await web.UnixSite(runner, path).start()
+    port = runner.addresses[0][1]
+    try:
+      await measure("tcp", "http://127.0.0.1:%s" % port, requests, concurrency)
+      await measure("unix", "unix://" + path, requests, concurrency)
+    finally:
+      await runner.cleanup()
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Compare HTTPClient throughput over TCP loopback and a UNIX socket.")
+  parser.add_argument("--requests", type=int, default=5000)
+  parser.add_argument("--concurrency", type=int, default=32)
+  args = parser.parse_args()
+  asyncio.run(amain(args.requests, args.concurrency))
+if __name__ == "__main__":
+  main()
@@ -2,6 +2,7 @@ from morkbmt.extension import ExtensionCommandBuilder
 from morkbmt.msgbuilder import UnknownMessageContent
 from morkbmt.context import MorkatoContext
 from morkbmt.core import registry
+from morkato.errors import (SchemaValidationError, MorkatoTimeoutError)
 from app.extension import BaseExtension
 from app.errors import (AppError, NoActionError)
 from typing_extensions import Self
@@ -23,6 +24,8 @@ class GlobalErrorExtension(BaseExtension):
     self.keys: Dict[Type[Exception], str] = {}
     commands.exception(NoActionError, self.on_no_action_error)
     commands.exception(AppError, self.on_app_error)
+    commands.exception(SchemaValidationError, self.on_schema_validation_error)
+    commands.exception(MorkatoTimeoutError, self.on_morkato_timeout_error)
     commands.exception(Exception, self.on_exception)
   def registry_message(self, cls: Type[Exception], key: str, /) -> None:
     self.keys[cls] = key
@@ -45,6 +48,11 @@ class GlobalErrorExtension(BaseExtension):
       content = "An unexpected error occurred: %s" % type(exc).__name__
       _log.error(content + '\n%s', traceback.format_exc())
     await ctx.send(content, reference=reply)
+  async def on_schema_validation_error(self, ctx: MorkatoContext, exc: SchemaValidationError) -> None:
+    await self.on_app_error(ctx, AppError("error%s" % exc.schema, field=exc.field))
+  async def on_morkato_timeout_error(self, ctx: MorkatoContext, exc: MorkatoTimeoutError) -> None:
+    _log.warning("%s %s excedeu o prazo do comando", exc.method, exc.url)
+    await self.on_app_error(ctx, AppError("errorMorkatoTimeout"))
   async def on_exception(self, ctx: MorkatoContext, exc: Exception) -> None:
     try:
       exc_type = type(exc)
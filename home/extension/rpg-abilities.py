@@ -77,7 +77,7 @@ class RPGAbilitiesExtension(BaseExtension):
     builder = app.embeds.AbilityBuilder(ability)
     await ctx.send_embed(builder)
   async def ability_roll(self, ctx: MorkatoContext, query: Optional[str]) -> None:
-    guild = await self.get_morkato_guild(ctx.guild)
+    guild = await self.get_morkato_guild(ctx.guild, hydrate=True)
     user = guild.get_cached_user(ctx.author.id)
     try:
       if user is None:
@@ -93,8 +93,9 @@ class RPGAbilitiesExtension(BaseExtension):
       raise app.errors.AppError("abilityRollEmpty")
     is_valid = user.ability_roll != 0
     if is_valid:
-      await user.sync_ability(ability)
-      await user.update(ability_roll = user.ability_roll - 1)
+      # Bookkeeping after a roll the user already saw: journaled if the API is down.
+      await user.sync_ability(ability, write_behind=True)
+      await user.update(ability_roll = user.ability_roll - 1, write_behind=True)
     builder = app.embeds.AbilityRegistryUser(ability, is_valid)
     await ctx.send_embed(builder, resolve_all=True)
   async def ability_simulate(self, ctx: MorkatoContext, query: Optional[str]) -> None:
@@ -103,7 +104,7 @@ class RPGAbilitiesExtension(BaseExtension):
       content = self.msgbuilder.get_content(self.LANGUAGE, "onQuantityOutRangeForSimRoll")
       await ctx.send(content)
       return
-    guild = await self.get_morkato_guild(ctx.guild)
+    guild = await self.get_morkato_guild(ctx.guild, hydrate=True)
     rolled_abilities: Dict[int, int] = {}
     try:
       for i in range(quantity):
@@ -3,6 +3,7 @@ from morkbmt.context import MorkatoContext
 from morkbmt.core import registry
 from morkato.abc import UnresolvedSnowflakeList
 from morkato.attack import Attack
+from morkato.guild import UnresolvedArtList
 from morkato.art import (ArtType, Art)
 from app.extension import BaseExtension
 from typing_extensions import Self
@@ -23,6 +24,7 @@ import app.utils
 class ArtOption(Enum):
   GET = "get"
   LIST = "list"
+  ALL = "all"
 @registry
 class RPGCommands(BaseExtension):
   RESPIRATION_KEYS: ClassVar[List[str]] = ["resp", "respiration"]
@@ -34,7 +36,8 @@ class RPGCommands(BaseExtension):
     self.LANGUAGE = self.msgbuilder.PT_BR
     self.ART_OPTIONS_HANDLERS: Dict[ArtOption, Callable[..., Coroutine[Any, Any, Any]]] = {
       ArtOption.GET: self.on_art_get,
-      ArtOption.LIST: self.on_art_list
+      ArtOption.LIST: self.on_art_list,
+      ArtOption.ALL: self.on_art_all
     }
     art = commands.command("art", self.art)
     attack = commands.command("attack", self.attack, aliases=['a'])
@@ -67,15 +70,22 @@ class RPGCommands(BaseExtension):
       line_style = self.msgbuilder.get_content(self.LANGUAGE, "selectMenuArtLineStyle"),
       key = lambda art: app.embeds.ArtBuilder(art)
     )
+  async def on_art_all(self, ctx: MorkatoContext, query: str, *, arts: UnresolvedArtList) -> None:
+    by_type = self.extract_art_type(query)
+    by_type_arts = (art async for art in arts.stream() if art.type == by_type)
+    await ctx.send_embed(app.embeds.ArtListBuilder(by_type_arts))
   async def art(self, ctx: MorkatoContext, opt: Optional[ArtOption], *, art_query: str) -> None:
     if opt is None:
       opt = ArtOption.GET
-    guild = await self.get_morkato_guild(ctx.guild)
+    # The full listing renders page by page from the stream instead of loading every art first.
+    single = opt != ArtOption.ALL
+    guild = await self.get_morkato_guild(ctx.guild, hydrate=single)
     handler = self.ART_OPTIONS_HANDLERS[opt]
-    await guild.arts.resolve()
+    if single:
+      await guild.arts.resolve()
     await handler(ctx, art_query, arts=guild.arts)
   async def attack(self, ctx: MorkatoContext, *, attack_query: str) -> None:
-    guild = await self.get_morkato_guild(ctx.guild)
+    guild = await self.get_morkato_guild(ctx.guild, hydrate=True)
     attack = await self.toattack(attack_query, arts=guild.arts, attacks=guild._attacks, to_art=self.toart)
     builder = app.embeds.AttackBuilder(attack)
     await ctx.send_embed(builder, resolve_all=True)
\ No newline at end of file
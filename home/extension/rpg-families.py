@@ -67,7 +67,7 @@ class RPGFamiliesExtension(BaseExtension):
       return family.user_type.hasflag(flag) and not family.id in user.families_id
     return predicate
   async def family_roll(self, ctx: MorkatoContext, query: Optional[str]) -> None:
-    guild = await self.get_morkato_guild(ctx.guild)
+    guild = await self.get_morkato_guild(ctx.guild, hydrate=True)
     user = guild.get_cached_user(ctx.author.id)
     try:
       if user is None:
@@ -83,8 +83,9 @@ class RPGFamiliesExtension(BaseExtension):
       raise app.errors.AppError("familyRollEmpty")
     is_valid = user.family_roll != 0
     if is_valid:
-      await user.sync_family(family)
-      await user.update(family_roll = user.family_roll - 1)
+      # Bookkeeping after a roll the user already saw: journaled if the API is down.
+      await user.sync_family(family, write_behind=True)
+      await user.update(family_roll = user.family_roll - 1, write_behind=True)
     builder = app.embeds.FamilyRegistryUser(family, is_valid)
     await ctx.send_embed(builder, resolve_all=True)
   async def family_simulate(self, ctx: MorkatoContext, query: Optional[str]) -> None:
@@ -93,7 +94,7 @@ class RPGFamiliesExtension(BaseExtension):
       content = self.msgbuilder.get_content(self.LANGUAGE, "onQuantityOutRangeForSimRoll")
       await ctx.send(content)
       return
-    guild = await self.get_morkato_guild(ctx.guild)
+    guild = await self.get_morkato_guild(ctx.guild, hydrate=True)
     rolled_families: Dict[int, int] = {}
     try:
       for i in range(quantity):
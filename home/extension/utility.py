@@ -1,5 +1,7 @@
 from morkbmt.extension import ExtensionCommandBuilder
 from morkbmt.core import registry
+from morkato.errors import ImageTooLargeError
+from morkato.upload import MAX_IMAGE_SIZE
 from morkato.utils import NoNullDict
 from app.extension import BaseExtension
 from discord.interactions import Interaction
@@ -12,7 +14,6 @@ from typing import (
 )
 import discord.ext.commands
 import app.errors
-import aiohttp
 import os
 
 @registry
@@ -44,25 +45,25 @@ class Utility(BaseExtension):
     commands.guild_only(image_upload_url)
     commands.guild_only(cache_clean)
     commands.guild_only(wipe_category)
-  async def image_upload(self, interaction: Interaction, filename: str, image: bytes) -> None:
-    await self.connection.upload_image(
-      author_id=interaction.user.id,
-      name=filename,
-      image=image
-    )
+  async def image_upload(self, interaction: Interaction, filename: str, url: str) -> None:
+    try:
+      await self.connection.upload_image_from_url(
+        url,
+        author_id=interaction.user.id,
+        name=filename
+      )
+    except ImageTooLargeError as exc:
+      raise app.errors.AppError("imageTooLarge", max_size=exc.max_size // (1024 * 1024))
     content = self.msgbuilder.get_content(self.LANGUAGE, "uploadImage", author_id=interaction.user.id, name=filename, cdn=self.cdn_url)
     await interaction.edit_original_response(content=content)
   async def image_upload_from_attach(self, interaction: Interaction, filename: str, attachment: Attachment) -> None:
     await interaction.response.defer()
-    attach_data = await attachment.read()
-    await self.image_upload(interaction, filename, attach_data)
+    if attachment.size > MAX_IMAGE_SIZE:
+      raise app.errors.AppError("imageTooLarge", max_size=MAX_IMAGE_SIZE // (1024 * 1024))
+    await self.image_upload(interaction, filename, attachment.url)
   async def image_upload_from_url(self, interaction: Interaction, filename: str, url: str) -> None:
     await interaction.response.defer()
-    image: bytes
-    async with aiohttp.ClientSession() as session:
-      async with session.request("GET", url) as resp:
-        image = await resp.content.read()
-    await self.image_upload(interaction, filename, image)
+    await self.image_upload(interaction, filename, url)
   async def ping(self, interaction: Interaction) -> None:
     await interaction.response.defer()
     content = self.msgbuilder.get_content(self.LANGUAGE, "onPing", round(interaction.client.latency * 1000, 2))
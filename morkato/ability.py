@@ -18,7 +18,7 @@ class Ability:
     self.state = state
     self.http = state.http
     self.guild = guild
-    self.id = int(payload["id"])
+    self.id = payload["id"]
     self.from_payload(payload)
   def from_payload(self, payload: AbilityPayload) -> None:
     self.name = payload["name"]
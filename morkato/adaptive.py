@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import (
+  TYPE_CHECKING,
+  Optional,
+  Dict,
+  Any
+)
+if TYPE_CHECKING:
+  from .scheduler import PriorityScheduler
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class AIMDLimiter:
+  def __init__(
+    self, *,
+    initial_limit: int = 16,
+    min_limit: int = 2,
+    max_limit: int = 256,
+    backoff: float = 0.7,
+    tolerance: float = 2.0,
+    window: float = 30.0
+  ) -> None:
+    self.min_limit = min_limit
+    self.max_limit = max_limit
+    self.backoff = backoff
+    self.tolerance = tolerance
+    self.window = window
+    self.limit = float(initial_limit)
+    self.current_min: Optional[float] = None
+    self.previous_min: Optional[float] = None
+    self.rotated_at = time.monotonic()
+    self.cooldown_until = 0.0
+    self.scheduler: Optional[PriorityScheduler] = None
+    self.increases = 0
+    self.decreases = 0
+  def bind(self, scheduler: PriorityScheduler) -> None:
+    self.scheduler = scheduler
+    scheduler.set_limit(int(self.limit))
+  def _apply(self) -> None:
+    if self.scheduler is not None:
+      self.scheduler.set_limit(int(self.limit))
+  @property
+  def baseline(self) -> Optional[float]:
+    if self.previous_min is None:
+      return self.current_min
+    if self.current_min is None:
+      return self.previous_min
+    return min(self.current_min, self.previous_min)
+  def _update_baseline(self, latency: float, now: float) -> None:
+    # No-load latency is the minimum over a rolling window, so a lasting
+    # slowdown becomes the new baseline once the window has passed.
+    if now - self.rotated_at >= self.window / 2:
+      self.previous_min = self.current_min
+      self.current_min = None
+      self.rotated_at = now
+    if self.current_min is None or latency < self.current_min:
+      self.current_min = latency
+  def record(self, latency: float, *, failed: bool = False) -> None:
+    now = time.monotonic()
+    baseline = self.baseline
+    congested = failed or (baseline is not None and latency > baseline * self.tolerance)
+    if not failed:
+      self._update_baseline(latency, now)
+    if congested:
+      # One congestion event usually fails a whole window of requests; cut only once per window.
+      if now < self.cooldown_until:
+        return
+      self.limit = max(float(self.min_limit), self.limit * self.backoff)
+      self.cooldown_until = now + (baseline if baseline is not None else latency) * self.tolerance
+      self.decreases += 1
+      logger.debug("Limite de concorrência reduzido para %s", int(self.limit))
+    elif self.scheduler is None or self.scheduler.active >= int(self.limit) - 1:
+      # Additive increase of one slot per window, and only while the limit is actually in use.
+      self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+      self.increases += 1
+    self._apply()
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "limit": int(self.limit),
+      "baseline": self.baseline,
+      "increases": self.increases,
+      "decreases": self.decreases
+    }
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from .utils import NoNullDict, extract_datetime_from_snowflake
 from .attack import AttackFlags, Attack
+from .errors import BulkWriteError
 from typing_extensions import Self
 from datetime import datetime
 from .types import (
@@ -13,8 +14,11 @@ from .types import (
 from typing import (
   TYPE_CHECKING,
   Optional,
+  Iterable,
+  Mapping,
   Dict,
-  List
+  List,
+  Any
 )
 if TYPE_CHECKING:
   from .state import MorkatoConnectionState
@@ -28,7 +32,7 @@ class Art:
     self.state = state
     self.http = state.http
     self.guild = guild
-    self.id = int(payload["id"])
+    self.id = payload["id"]
     self.from_payload(payload)
     self.clear()
   def from_payload(self, payload: ArtPayload) -> None:
@@ -128,4 +132,17 @@ class Art:
     )
     attack = Attack(self.state, self.guild, self, payload)
     self._add_attack(attack)
-    return attack
\ No newline at end of file
+    return attack
+  async def create_attacks(self, attacks: Iterable[Mapping[str, Any]], *, concurrency: Optional[int] = None) -> List[Attack]:
+    created: List[Attack] = []
+    try:
+      async for payload in self.http.bulk_create_attacks(self.guild.id, self.id, attacks, concurrency=concurrency):
+        created.append(Attack(self.state, self.guild, self, payload))
+    except BulkWriteError as exc:
+      created.extend(Attack(self.state, self.guild, self, payload) for payload in exc.created)
+      raise
+    finally:
+      # One pass once the batch is over, with whatever part of it the API holds.
+      for attack in created:
+        self._add_attack(attack)
+    return created
\ No newline at end of file
@@ -6,7 +6,9 @@ from datetime import datetime
 from typing import (
   TYPE_CHECKING,
   SupportsInt,
-  Optional
+  Optional,
+  Dict,
+  Any
 )
 if TYPE_CHECKING:
   from .types import Attack as AttackPayload
@@ -32,7 +34,7 @@ class Attack:
     self.http = state.http
     self.guild = guild
     self.art = art
-    self.id = int(payload["id"])
+    self.id = payload["id"]
     self.from_payload(payload)
   def from_payload(self, payload: AttackPayload) -> None:
     self.name = payload["name"]
@@ -74,7 +76,8 @@ class Attack:
     damage: Optional[int] = None,
     breath: Optional[int] = None,
     blood: Optional[int] = None,
-    flags: Optional[SupportsInt] = None
+    flags: Optional[SupportsInt] = None,
+    write_behind: bool = False
   ) -> Self:
     kwargs = NoNullDict(
       name=name,
@@ -97,9 +100,16 @@ class Attack:
       flags=flags
     )
     if kwargs:
-      payload = await self.http.update_attack(self.guild.id, self.id, **kwargs)
-      self.from_payload(payload)
+      payload = await self.http.update_attack(self.guild.id, self.id, write_behind=write_behind, **kwargs)
+      if payload is None:
+        # Deferred to the write journal: shown locally until the replay reaches the API.
+        self._apply(kwargs)
+      else:
+        self.from_payload(payload)
     return self
+  def _apply(self, changes: Dict[str, Any]) -> None:
+    for (key, value) in changes.items():
+      setattr(self, key, AttackFlags(int(value)) if key == "flags" else value)
   async def delete(self) -> Self:
     payload = await self.http.delete_attack(self.guild.id, self.id)
     self.from_payload(payload)
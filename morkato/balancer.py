@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import (
+  TYPE_CHECKING,
+  Optional,
+  Callable,
+  Iterable,
+  Tuple,
+  Dict,
+  List,
+  Any
+)
+if TYPE_CHECKING:
+  from .retry import CircuitBreaker
+  from .http import Route
+import logging
+import asyncio
+import aiohttp
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+UNIX_SCHEME = "unix://"
+UNIX_HTTP_BASE = "http://localhost"
+
+def split_unix_url(url: str) -> Tuple[str, Optional[str]]:
+  if url.startswith(UNIX_SCHEME):
+    return (UNIX_HTTP_BASE, url[len(UNIX_SCHEME):])
+  return (url, None)
+class Endpoint:
+  def __init__(self, url: str, breaker: CircuitBreaker, *, primary: bool = False) -> None:
+    self.url = url
+    (self.http_base, self.unix_socket) = split_unix_url(url)
+    self.breaker = breaker
+    self.primary = primary
+    self.outstanding = 0
+    self.requests = 0
+  def __repr__(self) -> str:
+    return "<Endpoint url=%r primary=%s outstanding=%s>" % (self.url, self.primary, self.outstanding)
+  def is_available(self) -> bool:
+    return self.breaker.is_available()
+  def acquire(self) -> None:
+    self.outstanding += 1
+    self.requests += 1
+  def release(self) -> None:
+    self.outstanding -= 1
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "url": self.url,
+      "primary": self.primary,
+      "available": self.is_available(),
+      "outstanding": self.outstanding,
+      "requests": self.requests
+    }
+class LoadBalancer:
+  POWER_OF_TWO = "p2c"
+  LEAST_OUTSTANDING = "least"
+  def __init__(
+    self, primary: str, replicas: Iterable[str] = (), *,
+    breaker_factory: Callable[[str], CircuitBreaker],
+    strategy: str = POWER_OF_TWO,
+    read_your_writes: float = 5.0
+  ) -> None:
+    if strategy not in (self.POWER_OF_TWO, self.LEAST_OUTSTANDING):
+      raise ValueError("Unknown balancing strategy: %s" % strategy)
+    self.primary = Endpoint(primary, breaker_factory(primary), primary=True)
+    self.replicas = [Endpoint(url, breaker_factory(url)) for url in replicas]
+    self.endpoints: List[Endpoint] = [self.primary, *self.replicas]
+    if len(self.endpoints) > 1 and any(endpoint.unix_socket is not None for endpoint in self.endpoints):
+      raise ValueError("A unix:// endpoint cannot be balanced with other endpoints")
+    self.strategy = strategy
+    self.read_your_writes = read_your_writes
+    self.recent_writes: Dict[int, float] = {}
+  def prefers_primary(self, route: Route) -> bool:
+    if route.method != "GET" or not self.replicas:
+      return True
+    if route.guild_id is None:
+      return False
+    until = self.recent_writes.get(route.guild_id)
+    if until is None:
+      return False
+    if until <= time.monotonic():
+      self.recent_writes.pop(route.guild_id, None)
+      return False
+    return True
+  def record_write(self, route: Route) -> None:
+    if route.guild_id is None or not self.replicas or self.read_your_writes <= 0:
+      return
+    now = time.monotonic()
+    if len(self.recent_writes) > 1024:
+      self.recent_writes = {id: until for (id, until) in self.recent_writes.items() if until > now}
+    self.recent_writes[route.guild_id] = now + self.read_your_writes
+  def choose(self, route: Route, *, primary: Optional[bool] = None, exclude: Optional[Endpoint] = None) -> Endpoint:
+    if primary is None:
+      primary = self.prefers_primary(route)
+    if primary:
+      return self.primary
+    candidates = [endpoint for endpoint in self.replicas if endpoint.is_available() and endpoint is not exclude]
+    if not candidates:
+      return exclude if exclude is not None else self.primary
+    if len(candidates) == 1:
+      return candidates[0]
+    if self.strategy == self.LEAST_OUTSTANDING:
+      return min(candidates, key=lambda endpoint: endpoint.outstanding)
+    (first, second) = random.sample(candidates, 2)
+    return first if first.outstanding <= second.outstanding else second
+  async def check(self, session: aiohttp.ClientSession, path: str, timeout: float) -> None:
+    async def probe(endpoint: Endpoint) -> None:
+      try:
+        async with session.get(endpoint.http_base + path, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+          await response.read()
+          healthy = response.status < 500
+      except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+        healthy = False
+      if healthy:
+        endpoint.breaker.record_success()
+      else:
+        logger.warning("Health check de %s falhou", endpoint.url)
+        endpoint.breaker.record_failure()
+    await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+  def stats(self) -> List[Dict[str, Any]]:
+    return [endpoint.stats() for endpoint in self.endpoints]
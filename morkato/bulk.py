@@ -0,0 +1,85 @@
+from __future__ import annotations
+from .errors import BulkWriteError
+from typing import (
+  AsyncIterator,
+  Awaitable,
+  Callable,
+  Sequence,
+  TypeVar,
+  Dict,
+  List,
+  Set,
+  Any
+)
+import logging
+import asyncio
+import os
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+SKIPPED: Any = object()
+
+class BulkPolicy:
+  def __init__(self, *, batch_size: int = 100, concurrency: int = 8, use_bulk_routes: bool = True) -> None:
+    # The API refuses batches above 500 items.
+    self.batch_size = batch_size
+    self.concurrency = concurrency
+    self.use_bulk_routes = use_bulk_routes
+    # An API older than the bulk routes answers 404 or 405 once; that route is not tried again.
+    self.unsupported: Set[str] = set()
+    self.batches = 0
+    self.batched = 0
+    self.fanned_out = 0
+  @classmethod
+  def from_env(cls) -> BulkPolicy:
+    return cls(
+      batch_size = int(os.getenv("MORKATO_BULK_BATCH_SIZE", "100")),
+      concurrency = int(os.getenv("MORKATO_BULK_CONCURRENCY", "8")),
+      use_bulk_routes = os.getenv("MORKATO_BULK_ROUTES", "1").lower() not in ("0", "false", "no")
+    )
+  def supports(self, key: str) -> bool:
+    return self.use_bulk_routes and key not in self.unsupported
+  def mark_unsupported(self, key: str) -> None:
+    self.unsupported.add(key)
+    logger.info("A API não tem a rota %s, usando requisições concorrentes", key)
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "batches": self.batches,
+      "batched": self.batched,
+      "fanned_out": self.fanned_out,
+      "unsupported": sorted(self.unsupported)
+    }
+async def fan_out(
+  items: Sequence[T],
+  call: Callable[[T], Awaitable[R]],
+  concurrency: int, *,
+  offset: int = 0
+) -> AsyncIterator[R]:
+  # Up to `concurrency` calls in flight; results come back in input order as soon as each is ready.
+  semaphore = asyncio.Semaphore(concurrency)
+  stopped = False
+  async def run(item: T) -> R:
+    async with semaphore:
+      if stopped:
+        return SKIPPED
+      return await call(item)
+  tasks: List[asyncio.Task[R]] = [asyncio.ensure_future(run(item)) for item in items]
+  try:
+    for (index, task) in enumerate(tasks):
+      try:
+        result = await task
+      except Exception as exc:
+        stopped = True
+        # Calls already sent may still land; they are waited for so the caller can cache what exists.
+        rest = tasks[index + 1:]
+        await asyncio.gather(*rest, return_exceptions=True)
+        created = [task.result() for task in rest if not task.cancelled() and task.exception() is None and task.result() is not SKIPPED]
+        raise BulkWriteError(offset + index, exc, created) from exc
+      yield result
+  finally:
+    for task in tasks:
+      if not task.done():
+        task.cancel()
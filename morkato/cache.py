@@ -0,0 +1,173 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import (
+  Optional,
+  Callable,
+  Iterator,
+  Generic,
+  TypeVar,
+  Dict,
+  List,
+  Any
+)
+import time
+import os
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+def _limit(name: str, default: Optional[float], type: Callable[[str], Any]) -> Any:
+  value = os.getenv(name)
+  if value is None or not value.strip():
+    return default
+  # Zero or less turns the limit off.
+  limit = type(value)
+  return limit if limit > 0 else None
+class CacheStats:
+  __slots__ = ("hits", "misses", "evictions", "expirations")
+  def __init__(self) -> None:
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+  def as_dict(self) -> Dict[str, Any]:
+    lookups = self.hits + self.misses
+    return {
+      "hits": self.hits,
+      "misses": self.misses,
+      "hit_rate": self.hits / lookups if lookups else 0.0,
+      "evictions": self.evictions,
+      "expirations": self.expirations
+    }
+class CacheEntry(Generic[V]):
+  __slots__ = ("value", "expires_at", "weight")
+  def __init__(self, value: V, expires_at: Optional[float], weight: int) -> None:
+    self.value = value
+    self.expires_at = expires_at
+    self.weight = weight
+class LRUCache(Generic[K, V]):
+  def __init__(
+    self, maxlen: Optional[int] = None, *,
+    ttl: Optional[float] = None,
+    max_weight: Optional[int] = None,
+    weigh: Optional[Callable[[V], int]] = None,
+    stats: Optional[CacheStats] = None
+  ) -> None:
+    self.maxlen = maxlen
+    self.ttl = ttl
+    self.max_weight = max_weight
+    self.weigh = weigh
+    # Shared when many small caches (one per guild) should report as one.
+    self.counters = stats if stats is not None else CacheStats()
+    self.entries: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+    self.weight = 0
+  def __repr__(self) -> str:
+    return "<LRUCache entries=%s weight=%s>" % (len(self.entries), self.weight)
+  def __len__(self) -> int:
+    return len(self.entries)
+  def __iter__(self) -> Iterator[K]:
+    return iter(list(self.entries))
+  def __contains__(self, key: object) -> bool:
+    return self._lookup(key) is not None # type: ignore
+  def __getitem__(self, key: K) -> V:
+    entry = self._lookup(key)
+    if entry is None:
+      self.counters.misses += 1
+      raise KeyError(key)
+    return self._hit(key, entry)
+  def __setitem__(self, key: K, value: V) -> None:
+    old = self.entries.pop(key, None)
+    if old is not None:
+      self.weight -= old.weight
+    weight = self.weigh(value) if self.weigh is not None else 0
+    expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+    self.entries[key] = CacheEntry(value, expires_at, weight)
+    self.weight += weight
+    self._evict()
+  def __delitem__(self, key: K) -> None:
+    entry = self.entries.pop(key)
+    self.weight -= entry.weight
+  def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+    entry = self._lookup(key)
+    if entry is None:
+      self.counters.misses += 1
+      return default
+    return self._hit(key, entry)
+  def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+    entry = self.entries.pop(key, None)
+    if entry is None:
+      return default
+    self.weight -= entry.weight
+    return entry.value
+  def values(self) -> List[V]:
+    # Expired entries are left for the next lookup or expire() to drop.
+    now = time.monotonic()
+    return [entry.value for entry in self.entries.values() if entry.expires_at is None or entry.expires_at > now]
+  def clear(self) -> None:
+    self.entries.clear()
+    self.weight = 0
+  def expire(self) -> int:
+    now = time.monotonic()
+    expired = [key for (key, entry) in self.entries.items() if entry.expires_at is not None and entry.expires_at <= now]
+    for key in expired:
+      del self[key]
+    self.counters.expirations += len(expired)
+    return len(expired)
+  def _lookup(self, key: K) -> Optional[CacheEntry[V]]:
+    entry = self.entries.get(key)
+    if entry is None:
+      return None
+    if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+      del self[key]
+      self.counters.expirations += 1
+      return None
+    return entry
+  def _hit(self, key: K, entry: CacheEntry[V]) -> V:
+    self.counters.hits += 1
+    self.entries.move_to_end(key)
+    if self.weigh is not None:
+      # Cached objects grow in place (a guild resolving its arts); reading is when that is noticed.
+      weight = self.weigh(entry.value)
+      self.weight += weight - entry.weight
+      entry.weight = weight
+      self._evict()
+    return entry.value
+  def _over(self) -> bool:
+    if self.maxlen is not None and len(self.entries) > self.maxlen:
+      return True
+    return self.max_weight is not None and self.weight > self.max_weight
+  def _evict(self) -> None:
+    # The newest entry always stays, even when it alone is heavier than the limit.
+    now = time.monotonic()
+    while len(self.entries) > 1 and self._over():
+      (_, entry) = self.entries.popitem(last=False)
+      self.weight -= entry.weight
+      if entry.expires_at is not None and entry.expires_at <= now:
+        self.counters.expirations += 1
+      else:
+        self.counters.evictions += 1
+  def stats(self) -> Dict[str, Any]:
+    return dict(
+      self.counters.as_dict(),
+      entries = len(self.entries),
+      weight = self.weight,
+      maxlen = self.maxlen,
+      max_weight = self.max_weight,
+      ttl = self.ttl
+    )
+class CacheConfig:
+  def __init__(self, *, maxlen: Optional[int] = None, ttl: Optional[float] = None, max_bytes: Optional[int] = None) -> None:
+    self.maxlen = maxlen
+    self.ttl = ttl
+    self.max_bytes = max_bytes
+  def __repr__(self) -> str:
+    return "<CacheConfig maxlen=%s ttl=%s max_bytes=%s>" % (self.maxlen, self.ttl, self.max_bytes)
+  @classmethod
+  def from_env(cls, prefix: str, *, maxlen: Optional[int] = None, ttl: Optional[float] = None, max_bytes: Optional[int] = None) -> CacheConfig:
+    return cls(
+      maxlen = _limit(prefix + "_SIZE", maxlen, int),
+      ttl = _limit(prefix + "_TTL", ttl, float),
+      max_bytes = _limit(prefix + "_MAX_BYTES", max_bytes, int)
+    )
+  def create(self, *, weigh: Optional[Callable[[V], int]] = None, stats: Optional[CacheStats] = None) -> LRUCache[Any, V]:
+    return LRUCache(self.maxlen, ttl=self.ttl, max_weight=self.max_bytes, weigh=weigh, stats=stats)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from typing import (
+  get_type_hints,
+  Optional,
+  Generic,
+  TypeVar,
+  Mapping,
+  Union,
+  Tuple,
+  Dict,
+  List,
+  Any
+)
+from . import types
+import orjson
+
+T = TypeVar('T')
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+  return orjson.loads(data)
+def dumps(payload: Any) -> bytes:
+  return orjson.dumps(payload)
+def compact(**fields: Any) -> Dict[str, Any]:
+  # Plain dict in a single pass; NoNullDict pays for an OrderedDict per request body.
+  return {key: value for (key, value) in fields.items() if value is not None}
+def _is_snowflake(key: str, hint: Any) -> bool:
+  return (key == "id" or key.endswith("_id")) and hint in (str, Optional[str])
+class Codec(Generic[T]):
+  def __init__(
+    self, type: Any, *,
+    nested: Optional[Mapping[str, Codec[Any]]] = None,
+    references: Tuple[str, ...] = ("guild_id",)
+  ) -> None:
+    hints = get_type_hints(type)
+    self.type = type
+    # References to the parent object are left as sent: models take the parent from context.
+    self.snowflakes: Tuple[str, ...] = tuple(key for (key, hint) in hints.items() if _is_snowflake(key, hint) and key not in references)
+    self.snowflake_lists: Tuple[str, ...] = tuple(key for (key, hint) in hints.items() if hint == List[str])
+    self.nested: Tuple[Tuple[str, Codec[Any]], ...] = tuple(nested.items()) if nested is not None else ()
+  def __repr__(self) -> str:
+    return "<Codec type=%s>" % self.type.__name__
+  def decode(self, payload: Dict[str, Any]) -> T:
+    # Snowflakes travel as strings; they become ints here, once, so models never convert them.
+    for key in self.snowflakes:
+      value = payload.get(key)
+      if value is not None:
+        payload[key] = int(value)
+    for key in self.snowflake_lists:
+      values = payload.get(key)
+      if values is not None:
+        payload[key] = list(map(int, values))
+    for (key, codec) in self.nested:
+      values = payload.get(key)
+      if values is not None:
+        codec(values)
+    return payload # type: ignore
+  def decode_many(self, payloads: List[Dict[str, Any]]) -> List[T]:
+    decode = self.decode
+    for payload in payloads:
+      decode(payload)
+    return payloads # type: ignore
+  def __call__(self, data: Any) -> Any:
+    if isinstance(data, list):
+      return self.decode_many(data)
+    if isinstance(data, dict):
+      return self.decode(data)
+    return data
+  def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    return self(loads(data))
+  def copy_one(self, payload: Dict[str, Any]) -> T:
+    payload = payload.copy()
+    for key in self.snowflake_lists:
+      values = payload.get(key)
+      if values is not None:
+        payload[key] = values.copy()
+    for (key, codec) in self.nested:
+      values = payload.get(key)
+      if values is not None:
+        payload[key] = codec.copy(values)
+    return payload # type: ignore
+  def copy(self, data: Any) -> Any:
+    # A decoded payload only holds containers where its type says so: copying those levels
+    # is a deep copy at a fraction of what deepcopy or a dumps/loads round trip costs.
+    if isinstance(data, list):
+      copy_one = self.copy_one
+      return [copy_one(payload) for payload in data]
+    if isinstance(data, dict):
+      return self.copy_one(data)
+    return data
+GUILD: Codec[types.Guild] = Codec(types.Guild)
+ATTACK: Codec[types.Attack] = Codec(types.Attack, references=("guild_id", "art_id"))
+ART: Codec[types.Art] = Codec(types.Art, nested={"attacks": ATTACK})
+ABILITY: Codec[types.Ability] = Codec(types.Ability)
+FAMILY: Codec[types.Family] = Codec(types.Family)
+USER: Codec[types.User] = Codec(types.User)
+SNAPSHOT: Codec[types.GuildSnapshot] = Codec(types.GuildSnapshot, nested={"guild": GUILD, "arts": ART, "abilities": ABILITY, "families": FAMILY})
+CHANGES_DELETED: Codec[types.GuildChangesDeleted] = Codec(types.GuildChangesDeleted)
+CHANGES: Codec[types.GuildChanges] = Codec(types.GuildChanges, nested={"arts": ART, "attacks": ATTACK, "abilities": ABILITY, "families": FAMILY, "deleted": CHANGES_DELETED})
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import (
+  Optional,
+  Iterable,
+  Tuple,
+  Type,
+  Dict,
+  Any
+)
+import functools
+import asyncio
+import zlib
+
+try:
+  import brotli
+except ImportError:
+  try:
+    import brotlicffi as brotli # type: ignore
+  except ImportError:
+    brotli = None
+
+HAS_BROTLI = brotli is not None
+# What decompress raises for a coding it does not know or a body it cannot inflate.
+DECODE_ERRORS: Tuple[Type[Exception], ...] = (ValueError, zlib.error) + ((brotli.error,) if brotli is not None else ())
+LIST_ROUTES = (
+  "GET /arts/{gid}",
+  "GET /abilities/{guild_id}",
+  "GET /families/{guild_id}"
+)
+
+def _decompress(encoding: str, data: bytes) -> bytes:
+  if encoding in ("", "identity"):
+    return data
+  if encoding in ("gzip", "x-gzip"):
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+  if encoding == "deflate":
+    try:
+      return zlib.decompress(data)
+    except zlib.error:
+      # Some servers send raw deflate without the zlib header.
+      return zlib.decompress(data, -zlib.MAX_WBITS)
+  if encoding == "br" and brotli is not None:
+    return brotli.decompress(data)
+  raise ValueError("Unsupported Content-Encoding: %s" % encoding)
+def decompress(encoding: Optional[str], data: bytes) -> bytes:
+  if not data or encoding is None:
+    return data
+  # Codings are listed in the order they were applied, so they come off last one first.
+  for coding in reversed(encoding.split(",")):
+    data = _decompress(coding.strip().lower(), data)
+  return data
+class RouteCompression:
+  __slots__ = ("responses", "compressed", "wire_bytes", "decoded_bytes", "last_size")
+  def __init__(self) -> None:
+    self.responses = 0
+    self.compressed = 0
+    self.wire_bytes = 0
+    self.decoded_bytes = 0
+    self.last_size: Optional[int] = None
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "responses": self.responses,
+      "compressed": self.compressed,
+      "wire_bytes": self.wire_bytes,
+      "decoded_bytes": self.decoded_bytes,
+      "saved_bytes": self.decoded_bytes - self.wire_bytes
+    }
+class CompressionPolicy:
+  def __init__(
+    self, *,
+    routes: Optional[Iterable[str]] = LIST_ROUTES,
+    threshold: int = 1024,
+    executor_size: int = 256 * 1024,
+    use_brotli: bool = True
+  ) -> None:
+    self.routes = frozenset(routes) if routes is not None else None
+    self.threshold = threshold
+    self.executor_size = executor_size
+    encodings = ["gzip", "deflate"]
+    if use_brotli and HAS_BROTLI:
+      encodings.append("br")
+    self.accept = ", ".join(encodings)
+    self.route_stats: Dict[str, RouteCompression] = {}
+    self.wire_bytes = 0
+    self.decoded_bytes = 0
+  def get_route(self, key: str) -> RouteCompression:
+    route = self.route_stats.get(key)
+    if route is None:
+      route = self.route_stats[key] = RouteCompression()
+    return route
+  def is_enabled(self, key: str) -> bool:
+    return self.routes is None or key in self.routes
+  def accept_encoding(self, key: str) -> str:
+    if not self.is_enabled(key):
+      return "identity"
+    route = self.route_stats.get(key)
+    # Small bodies cost more CPU to inflate than the bytes they save; stop asking once a route proves small.
+    if route is not None and route.last_size is not None and route.last_size < self.threshold:
+      return "identity"
+    return self.accept
+  async def decode(self, key: str, encoding: Optional[str], data: bytes) -> bytes:
+    if encoding is not None and len(data) >= self.executor_size:
+      # Inflating megabytes of JSON would stall every other request on the loop.
+      decoded = await asyncio.get_running_loop().run_in_executor(None, functools.partial(decompress, encoding, data))
+    else:
+      decoded = decompress(encoding, data)
+    route = self.get_route(key)
+    route.responses += 1
+    if decoded is not data:
+      route.compressed += 1
+    route.wire_bytes += len(data)
+    route.decoded_bytes += len(decoded)
+    route.last_size = len(decoded)
+    self.wire_bytes += len(data)
+    self.decoded_bytes += len(decoded)
+    return decoded
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "accept": self.accept,
+      "wire_bytes": self.wire_bytes,
+      "decoded_bytes": self.decoded_bytes,
+      "saved_bytes": self.decoded_bytes - self.wire_bytes,
+      "routes": {key: route.stats() for (key, route) in self.route_stats.items()}
+    }
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from .codec import Codec
+from .cache import LRUCache
+from copy import deepcopy
+from typing import (
+  Optional,
+  Mapping,
+  Dict,
+  Any
+)
+
+class ConditionalEntry:
+  __slots__ = ("etag", "last_modified", "payload", "codec")
+  def __init__(self, etag: Optional[str], last_modified: Optional[str], payload: Any, codec: Optional[Codec[Any]] = None) -> None:
+    self.etag = etag
+    self.last_modified = last_modified
+    self.payload = payload
+    self.codec = codec
+  def copy(self) -> Any:
+    if self.codec is None:
+      return deepcopy(self.payload)
+    return self.codec.copy(self.payload)
+  def headers(self) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if self.etag is not None:
+      headers["If-None-Match"] = self.etag
+    if self.last_modified is not None:
+      headers["If-Modified-Since"] = self.last_modified
+    return headers
+class ConditionalCache:
+  def __init__(self, maxlen: int = 256) -> None:
+    self.entries: LRUCache[str, ConditionalEntry] = LRUCache(maxlen)
+    self.revalidated = 0
+    self.stored = 0
+  def __len__(self) -> int:
+    return len(self.entries)
+  def clear(self) -> None:
+    self.entries.clear()
+  def get(self, url: str) -> Optional[ConditionalEntry]:
+    return self.entries.get(url)
+  def store(self, url: str, headers: Mapping[str, str], payload: Any, codec: Optional[Codec[Any]] = None) -> None:
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if etag is None and last_modified is None:
+      self.entries.pop(url, None)
+      return
+    # Kept as a private copy: the decoded payload goes on to callers that may mutate it, and
+    # every 304 must hand out the response as it was sent, not as it was left.
+    entry = ConditionalEntry(etag, last_modified, payload, codec)
+    entry.payload = entry.copy()
+    self.entries[url] = entry
+    self.stored += 1
+  def revalidate(self, entry: ConditionalEntry) -> Any:
+    self.revalidated += 1
+    return entry.copy()
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "entries": len(self.entries),
+      "stored": self.stored,
+      "revalidated": self.revalidated
+    }
@@ -0,0 +1,50 @@
+from __future__ import annotations
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import (
+  Callable,
+  Iterator,
+  Optional
+)
+import time
+
+_deadline: ContextVar[Optional[float]] = ContextVar("morkato_deadline", default=None)
+_until: ContextVar[Optional[Callable[[], bool]]] = ContextVar("morkato_deadline_until", default=None)
+
+def current_deadline() -> Optional[float]:
+  deadline = _deadline.get()
+  if deadline is not None:
+    until = _until.get()
+    if until is not None and until():
+      return None
+  return deadline
+def remaining() -> Optional[float]:
+  deadline = current_deadline()
+  if deadline is None:
+    return None
+  return max(deadline - time.monotonic(), 0.0)
+def expired(deadline: Optional[float]) -> bool:
+  # Timers may fire a clock tick early, so "at the deadline" counts as past it.
+  return deadline is not None and deadline - time.monotonic() <= 0.001
+def resolve_deadline(timeout: Optional[float]) -> Optional[float]:
+  ambient = current_deadline()
+  if timeout is None:
+    return ambient
+  deadline = time.monotonic() + timeout
+  if ambient is not None and ambient < deadline:
+    return ambient
+  return deadline
+@contextmanager
+def deadline(timeout: float, *, until: Optional[Callable[[], bool]] = None) -> Iterator[float]:
+  # A nested deadline can only shrink the time left, never extend it. With `until`, the
+  # deadline stops applying once it returns True, e.g. when an interaction is acknowledged.
+  value = resolve_deadline(timeout)
+  if until is None and value == current_deadline():
+    until = _until.get()
+  token = _deadline.set(value)
+  until_token = _until.set(until)
+  try:
+    yield value
+  finally:
+    _until.reset(until_token)
+    _deadline.reset(token)
\ No newline at end of file
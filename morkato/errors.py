@@ -1,8 +1,10 @@
 from __future__ import annotations
-from aiohttp import ClientResponse
+from .transport import Response
 from enum import Enum
 from typing import (
+  Optional,
   Dict,
+  List,
   Any
 )
 
@@ -20,17 +22,60 @@ class ModelType(Enum):
   GENERIC = "GENERIC"
 class MorkatoException(Exception):
   pass
+class MorkatoTimeoutError(MorkatoException):
+  def __init__(self, method: str, url: str, timeout: Optional[float]) -> None:
+    super().__init__("%s %s did not complete before its deadline" % (method, url))
+    self.method = method
+    self.url = url
+    self.timeout = timeout
 class HTTPException(MorkatoException):
-  def __init__(self, response: ClientResponse, extra: Dict[str, Any]):
-    self.response: ClientResponse = response
+  def __init__(self, response: Response, extra: Dict[str, Any]):
+    self.response: Response = response
     self.status: int = response.status
     self.extra = extra
 class NotFoundError(HTTPException):
-  def __init__(self, response: ClientResponse, model: ModelType, extra: Dict[str, Any]) -> None:
+  def __init__(self, response: Response, model: ModelType, extra: Dict[str, Any]) -> None:
     super().__init__(response, extra)
     self.model = model
 class UserNotFoundError(NotFoundError):
-  def __init__(self, response: ClientResponse, extra: Dict[str, Any]) -> None:
+  def __init__(self, response: Response, extra: Dict[str, Any]) -> None:
     super().__init__(response, ModelType.USER, extra)
 class MorkatoServerError(HTTPException):
-  pass
\ No newline at end of file
+  pass
+class ContentEncodingError(HTTPException):
+  def __init__(self, response: Response, encoding: str) -> None:
+    super().__init__(response, {"encoding": encoding})
+    self.encoding = encoding
+class RateLimitedError(HTTPException):
+  def __init__(self, response: Response, extra: Dict[str, Any], retry_after: float) -> None:
+    super().__init__(response, extra)
+    self.retry_after = retry_after
+class CircuitOpenError(MorkatoException):
+  def __init__(self, host: str, retry_after: float) -> None:
+    super().__init__("Circuit breaker for %s is open" % host)
+    self.host = host
+    self.retry_after = retry_after
+class SchemaValidationError(MorkatoException):
+  def __init__(self, field: str, value: Any, schema: str, reason: str) -> None:
+    super().__init__("%s is invalid (%s): %s" % (field, schema, reason))
+    self.field = field
+    self.value = value
+    self.schema = schema
+    self.reason = reason
+class JournalFullError(MorkatoException):
+  def __init__(self, path: str, max_bytes: int) -> None:
+    super().__init__("Write journal %s is full (%s bytes)" % (path, max_bytes))
+    self.path = path
+    self.max_bytes = max_bytes
+class BulkWriteError(MorkatoException):
+  def __init__(self, index: int, error: Exception, created: List[Any]) -> None:
+    super().__init__("Bulk write failed at item %s: %s" % (index, error))
+    self.index = index
+    self.error = error
+    # Items after the failure that the API had already created, in order.
+    self.created = created
+class ImageTooLargeError(MorkatoException):
+  def __init__(self, size: int, max_size: int) -> None:
+    super().__init__("Image of %s bytes exceeds the %s bytes limit" % (size, max_size))
+    self.size = size
+    self.max_size = max_size
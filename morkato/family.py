@@ -23,7 +23,7 @@ class Family:
     self.state = state
     self.http = state.http
     self.guild = guild
-    self.id = int(payload["id"])
+    self.id = payload["id"]
     self.from_payload(payload)
   def from_payload(self, payload: FamilyPayload) -> None:
     self.name = payload["name"]
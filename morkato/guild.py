@@ -1,27 +1,48 @@
 from __future__ import annotations
-from .utils import (UnresolvedSnowflakeListImpl, CircularDict)
-from .abc import (UnresolvedSnowflakeList, Snowflake)
+from .utils import UnresolvedSnowflakeListImpl
+from .cache import LRUCache
+from .abc import Snowflake
 from .ability import Ability
 from .family import Family
 from .attack import Attack
 from .user import User
+from .scheduler import (Priority, request_priority)
+from .errors import BulkWriteError
 from .art import Art
 from .types import (
   Guild as GuildPayload,
+  GuildChanges,
   UserType,
   ArtType
 )
 from typing import (
   TYPE_CHECKING,
+  AsyncIterator,
   SupportsInt,
   Optional,
+  Iterable,
+  Mapping,
   TypeVar,
-  Dict
+  Dict,
+  List,
+  Set,
+  Any
 )
 if TYPE_CHECKING:
   from .state import MorkatoConnectionState
+import logging
+import asyncio
+import time
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T', bound='Snowflake')
+# Approximate bytes a cached model keeps alive, measured with tracemalloc and rounded up.
+GUILD_SIZE = 2048
+OBJECT_SIZE = 512
+
+def user_size(user: User) -> int:
+  return OBJECT_SIZE
 class Guild:
   def __init__(self, state: MorkatoConnectionState, id: int, payload: GuildPayload) -> None:
     self.state = state
@@ -35,21 +56,103 @@ class Guild:
     self.hybrid_initial_life = payload["hybrid_initial_life"]
     self.breath_initial = payload["breath_initial"]
     self.blood_initial = payload["blood_initial"]
-    self.roll_category_id = int(payload["roll_category_id"]) if payload["roll_category_id"] is not None else None
-    self.off_category_id = int(payload["off_category_id"]) if payload["off_category_id"] is not None else None
+    self.roll_category_id = payload["roll_category_id"]
+    self.off_category_id = payload["off_category_id"]
   def clear(self) -> None:
     self.abilities_percent = 0
     self.families_percent = 0
     self._attacks: Dict[int, Attack] = {}
-    self._users: CircularDict[int, User] = CircularDict(128)
+    self._users: LRUCache[int, User] = self.state.user_cache.create(weigh=user_size, stats=self.state.user_cache_stats)
+    self.sync_cursor: Optional[int] = None
+    self.synced_at = time.monotonic()
 
-    self.arts: UnresolvedSnowflakeList[Art] = UnresolvedArtList(self.state, self)
-    self.abilities: UnresolvedSnowflakeList[Ability] = UnresolvedAbilityList(self.state, self)
-    self.families: UnresolvedSnowflakeList[Family] = UnresolvedFamilyList(self.state, self)
+    self.arts: UnresolvedArtList = UnresolvedArtList(self.state, self)
+    self.abilities: UnresolvedAbilityList = UnresolvedAbilityList(self.state, self)
+    self.families: UnresolvedFamilyList = UnresolvedFamilyList(self.state, self)
+  def approximate_size(self) -> int:
+    objects = len(self.arts) + len(self._attacks) + len(self.abilities) + len(self.families)
+    return GUILD_SIZE + OBJECT_SIZE * objects + self._users.weight
+  def _hydrate(self, arts: List[Any], abilities: List[Any], families: List[Any]) -> None:
+    self.abilities.load(self.abilities.build(data) for data in abilities)
+    self.families.load(self.families.build(data) for data in families)
+    self.arts.load(self.arts.build(data) for data in arts)
+  async def sync(self, *, priority: Optional[Priority] = None) -> Dict[str, int]:
+    with request_priority(priority):
+      changes = await self.state.fetch_guild_changes(self.id, since=self.sync_cursor)
+    if changes is None:
+      # No change log to ask: keep what is cached instead of reloading it every interval.
+      return {"patched": 0, "refetched": 0}
+    lists: List[UnresolvedObjectListImpl[Any]] = [self.arts, self.abilities, self.families]
+    since = self.sync_cursor
+    # Taken before reloading: whatever changes during the reload is replayed by the next sync.
+    self.sync_cursor = int(changes["cursor"])
+    if changes["reset"] or since is None:
+      refetched = await self._refetch(lists, priority)
+      return {"patched": 0, "refetched": refetched}
+    stale: Set[UnresolvedObjectListImpl[Any]] = set()
+    patched = self._patch(changes, stale)
+    refetched = await self._refetch(stale, priority)
+    logger.debug("Guild %s sincronizada até %s: %s entidades atualizadas, %s recarregadas", self.id, self.sync_cursor, patched, refetched)
+    return {"patched": patched, "refetched": refetched}
+  def _patch(self, changes: GuildChanges, stale: Set[UnresolvedObjectListImpl[Any]]) -> int:
+    deleted = changes["deleted"]
+    patched = self.abilities.patch(changes["abilities"], deleted["abilities"])
+    patched += self.families.patch(changes["families"], deleted["families"])
+    arts = self.arts
+    if not arts.already_loaded():
+      return patched
+    patched += arts.patch(changes["arts"], ())
+    for data in changes["attacks"]:
+      art = arts.get(int(data["art_id"]))
+      if art is None:
+        # The art was created and removed again, or the list drifted: only a reload is trustworthy.
+        stale.add(arts)
+        continue
+      attack = self._attacks.get(data["id"])
+      if attack is None:
+        attack = Attack(self.state, self, art, data)
+      else:
+        if attack.art is not art:
+          attack.art._del_attack(attack)
+          attack.art = art
+        attack.from_payload(data)
+      art._add_attack(attack)
+      patched += 1
+    for id in deleted["attacks"]:
+      attack = self._attacks.get(id)
+      if attack is not None:
+        attack.art._del_attack(attack)
+        patched += 1
+    for id in deleted["arts"]:
+      art = arts.get(id)
+      if art is not None:
+        for attack in list(art._attacks.values()):
+          art._del_attack(attack)
+        arts.remove(art)
+        patched += 1
+    return patched
+  async def _refetch(self, lists: Iterable[UnresolvedObjectListImpl[Any]], priority: Optional[Priority]) -> int:
+    lists = [objects for objects in lists if objects.already_loaded()]
+    if not lists:
+      return 0
+    for objects in lists:
+      objects.clear()
+    if self.arts in lists:
+      self._attacks.clear()
+    if self.abilities in lists:
+      self.abilities_percent = 0
+    if self.families in lists:
+      self.families_percent = 0
+    await asyncio.gather(*(objects.resolve(priority=priority) for objects in lists))
+    refetched = sum(len(objects) for objects in lists)
+    if self.arts in lists:
+      refetched += len(self._attacks)
+    return refetched
   def get_cached_user(self, id: int) -> Optional[User]:
     return self._users.get(id)
-  async def fetch_user(self, id: int) -> User:
-    payload = await self.http.fetch_user(self.id, id)
+  async def fetch_user(self, id: int, *, priority: Optional[Priority] = None) -> User:
+    with request_priority(priority):
+      payload = await self.http.fetch_user(self.id, id)
     user = User(self.state, self, payload)
     self._users[user.id] = user
     return user
@@ -137,63 +240,163 @@ class Guild:
     family = Family(self.state, self, payload)
     self.families.add(family)
     return family
+  async def create_abilities(self, abilities: Iterable[Mapping[str, Any]], *, concurrency: Optional[int] = None) -> List[Ability]:
+    created: List[Ability] = []
+    try:
+      async for payload in self.http.bulk_create_abilities(self.id, abilities, concurrency=concurrency):
+        created.append(Ability(self.state, self, payload))
+    except BulkWriteError as exc:
+      created.extend(Ability(self.state, self, payload) for payload in exc.created)
+      raise
+    finally:
+      # One pass once the batch is over, with whatever part of it the API holds.
+      for ability in created:
+        self.abilities.add(ability)
+    return created
+  async def create_families(self, families: Iterable[Mapping[str, Any]], *, concurrency: Optional[int] = None) -> List[Family]:
+    created: List[Family] = []
+    try:
+      async for payload in self.http.bulk_create_families(self.id, families, concurrency=concurrency):
+        created.append(Family(self.state, self, payload))
+    except BulkWriteError as exc:
+      created.extend(Family(self.state, self, payload) for payload in exc.created)
+      raise
+    finally:
+      for family in created:
+        self.families.add(family)
+    return created
 class UnresolvedObjectListImpl(UnresolvedSnowflakeListImpl[T]):
-  def __init__(self, state: MorkatoConnectionState, guild: Guild) -> None:
+  def __init__(self, state: MorkatoConnectionState, guild: Guild, *, priority: Optional[Priority] = None) -> None:
     super().__init__()
     self.state = state
     self.http = state.http
     self.guild = guild
+    self.priority = priority
+  def clear(self) -> None:
+    super().clear()
+    # Pages fetched by any stream so far, in id order from the start: "cursor" is the last id they cover.
+    self.streamed: Dict[int, T] = {}
+    self.cursor: Optional[int] = None
+  async def resolve(self, *, priority: Optional[Priority] = None) -> None:
+    with request_priority(priority if priority is not None else self.priority):
+      await super().resolve()
+  async def fetch_page(self, after: Optional[int], limit: int) -> List[Any]:
+    raise NotImplementedError
+  def patch(self, payloads: Iterable[Any], deleted: Iterable[int]) -> int:
+    if not self.already_loaded():
+      return 0
+    patched = 0
+    for data in payloads:
+      object = self.get(data["id"])
+      if object is None:
+        self.add(self.build(data))
+      else:
+        # Out and back in, so lists that keep running totals see the new values.
+        self.remove(object)
+        object.from_payload(data)
+        self.add(object)
+      patched += 1
+    for id in deleted:
+      object = self.get(id)
+      if object is not None:
+        self.remove(object)
+        patched += 1
+    return patched
+  def build(self, payload: Any) -> T:
+    raise NotImplementedError
+  async def stream(self, *, page_size: int = 100, priority: Optional[Priority] = None) -> AsyncIterator[T]:
+    if self.already_loaded():
+      for object in self.order():
+        yield object
+      return
+    # Each call walks with its own cursor; pages go into the shared "streamed" as they arrive,
+    # so a later call (or one that stopped halfway) resumes from there instead of refetching.
+    streamed = self.streamed
+    cursor = self.cursor
+    for object in list(streamed.values()):
+      yield object
+    while True:
+      with request_priority(priority if priority is not None else self.priority):
+        payload = await self.fetch_page(cursor, page_size)
+      # An API without pagination answers with the whole collection: keep what is new and stop.
+      fresh = [data for data in payload if cursor is None or data["id"] > cursor]
+      objects = [self.build(data) for data in fresh]
+      if objects:
+        cursor = max(object.id for object in objects)
+      # A clear() while the page was in flight leaves it to this call alone.
+      if self.streamed is streamed:
+        for object in objects:
+          streamed.setdefault(object.id, object)
+        if self.cursor is None or (cursor is not None and cursor > self.cursor):
+          self.cursor = cursor
+      for object in objects:
+        yield streamed.get(object.id, object)
+      if len(payload) != page_size or not fresh:
+        break
+    if not self.already_loaded() and self.streamed is streamed:
+      self.load(streamed.values())
+      self.streamed = {}
+  def add(self, object: T, /) -> None:
+    super().add(object)
+    # Created behind the pages already streamed: no later page will bring it.
+    if not self.already_loaded() and self.cursor is not None and object.id <= self.cursor:
+      self.streamed[object.id] = object
+  def remove(self, object: Snowflake, /) -> Optional[T]:
+    removed = super().remove(object)
+    if not self.already_loaded():
+      self.streamed.pop(object.id, None)
+    return removed
+  def get(self, id: int, /) -> Optional[T]:
+    if not self.already_loaded():
+      # Streamed pages answer lookups before the whole list is loaded.
+      return self.streamed.get(id)
+    return super().get(id)
 class UnresolvedArtList(UnresolvedObjectListImpl[Art]):
-  async def resolve_impl(self) -> None:
+  async def fetch_page(self, after: Optional[int], limit: int) -> List[Any]:
+    return await self.http.fetch_arts(self.guild.id, after=after, limit=limit)
+  def build(self, payload: Any) -> Art:
     guild = self.guild
-    http = self.http
     state = self.state
-    payload = await http.fetch_arts(guild.id)
-    for art_data in payload:
-      art = Art(state, guild, art_data)
-      attack_datas = art_data["attacks"]
-      for attack_data in attack_datas:
-        attack = Attack(state, guild, art, attack_data)
-        art._add_attack(attack)
-      self.add(art)
+    art = Art(state, guild, payload)
+    for attack_data in payload["attacks"]:
+      attack = Attack(state, guild, art, attack_data)
+      art._add_attack(attack)
+    return art
+  async def resolve_impl(self) -> List[Art]:
+    payload = await self.http.fetch_arts(self.guild.id)
+    return [self.build(art_data) for art_data in payload]
 class UnresolvedAbilityList(UnresolvedObjectListImpl[Ability]):
-  async def resolve_impl(self) -> None:
-    guild = self.guild
-    state = self.state
-    http = self.http
-    payload = await http.fetch_abilities(guild.id)
-    for ability_data in payload:
-      ability = Ability(state, guild, ability_data)
-      self.add(ability)
+  async def fetch_page(self, after: Optional[int], limit: int) -> List[Any]:
+    return await self.http.fetch_abilities(self.guild.id, after=after, limit=limit)
+  def build(self, payload: Any) -> Ability:
+    return Ability(self.state, self.guild, payload)
+  async def resolve_impl(self) -> List[Ability]:
+    payload = await self.http.fetch_abilities(self.guild.id)
+    return [self.build(ability_data) for ability_data in payload]
   def add(self, object: Ability, /) -> None:
+    # Before loading the base class only queues the write for the resolve in flight.
+    super().add(object)
     if self.already_loaded():
-      super().add(object)
       self.guild.abilities_percent += object.percent
   def remove(self, object: Snowflake, /) -> Optional[Ability]:
-    if not self.already_loaded():
-      return None
     ability = super().remove(object)
     if ability is not None:
       self.guild.abilities_percent -= ability.percent
     return ability
 class UnresolvedFamilyList(UnresolvedObjectListImpl[Family]):
-  async def resolve_impl(self) -> None:
+  async def fetch_page(self, after: Optional[int], limit: int) -> List[Any]:
+    return await self.http.fetch_families(self.guild.id, after=after, limit=limit)
+  def build(self, payload: Any) -> Family:
+    return Family(self.state, self.guild, payload)
+  async def resolve_impl(self) -> List[Family]:
     guild = self.guild
-    state = self.state
-    http = self.http
-    abilities = guild.abilities
-    payload = await http.fetch_families(guild.id)
-    await abilities.resolve()
-    for family_data in payload:
-      family = Family(state, guild, family_data)
-      self.add(family)
+    (payload, _) = await asyncio.gather(self.http.fetch_families(guild.id), guild.abilities.resolve())
+    return [self.build(family_data) for family_data in payload]
   def add(self, object: Family, /) -> None:
+    super().add(object)
     if self.already_loaded():
-      super().add(object)
       self.guild.families_percent += object.percent
   def remove(self, object: Snowflake, /) -> Optional[Family]:
-    if not self.already_loaded():
-      return None
     family = super().remove(object)
     if family is not None:
       self.guild.families_percent -= family.percent
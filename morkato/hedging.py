@@ -0,0 +1,71 @@
+from __future__ import annotations
+from collections import deque
+from typing import (
+  Optional,
+  Mapping,
+  Deque,
+  Dict,
+  Any
+)
+
+class RouteLatency:
+  def __init__(self, samples: int) -> None:
+    self.samples: Deque[float] = deque(maxlen=samples)
+    self.requests = 0
+    self.hedged = 0
+    self.hedge_wins = 0
+  def percentile(self, percentile: float) -> float:
+    ordered = sorted(self.samples)
+    idx = min(int(len(ordered) * percentile), len(ordered) - 1)
+    return ordered[idx]
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "requests": self.requests,
+      "hedged": self.hedged,
+      "hedge_wins": self.hedge_wins,
+      "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+      "win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0
+    }
+class HedgePolicy:
+  def __init__(
+    self, *,
+    percentile: float = 0.95,
+    routes: Optional[Mapping[str, Optional[float]]] = None,
+    min_samples: int = 20,
+    samples: int = 256,
+    min_delay: float = 0.005,
+    max_hedge_ratio: float = 0.1
+  ) -> None:
+    self.percentile = percentile
+    self.routes = routes
+    self.min_samples = min_samples
+    self.samples = samples
+    self.min_delay = min_delay
+    self.max_hedge_ratio = max_hedge_ratio
+    self.latencies: Dict[str, RouteLatency] = {}
+  def get_latency(self, key: str) -> RouteLatency:
+    latency = self.latencies.get(key)
+    if latency is None:
+      latency = self.latencies[key] = RouteLatency(self.samples)
+    return latency
+  def is_enabled(self, key: str) -> bool:
+    return self.routes is None or key in self.routes
+  def delay_for(self, key: str) -> Optional[float]:
+    if not self.is_enabled(key):
+      return None
+    latency = self.get_latency(key)
+    latency.requests += 1
+    if len(latency.samples) < self.min_samples:
+      return None
+    # Hedges are extra load: stop issuing them once they exceed the allowed share.
+    if latency.hedged >= latency.requests * self.max_hedge_ratio:
+      return None
+    percentile = self.percentile
+    if self.routes is not None and self.routes[key] is not None:
+      percentile = self.routes[key]
+    return max(latency.percentile(percentile), self.min_delay)
+  def record(self, key: str, elapsed: float) -> None:
+    if self.is_enabled(key):
+      self.get_latency(key).samples.append(elapsed)
+  def stats(self) -> Dict[str, Dict[str, Any]]:
+    return {key: latency.stats() for (key, latency) in self.latencies.items()}
@@ -1,18 +1,69 @@
-from urllib.parse import quote
-from .utils import NoNullDict
+from urllib.parse import (quote, urlencode)
+from .ratelimit import (RateLimiter, parse_retry_after)
+from .balancer import (LoadBalancer, Endpoint)
+from .scheduler import (PriorityScheduler, Priority, current_priority)
+from .adaptive import AIMDLimiter
+from .hedging import HedgePolicy
+from .retry import (RetryPolicy, RetryBudget, CircuitBreaker)
+from .transport import (TransportConnectError, Transport, Response, create_transport)
+from .pool import ConnectionPoolConfig
+from .conditional import ConditionalCache
+from .compression import (CompressionPolicy, DECODE_ERRORS)
+from .validation import ValidationPolicy
+from .journal import (WriteJournal, JournalEntry, IDEMPOTENCY_HEADER, OUTAGE_ERRORS)
+from .bulk import (BulkPolicy, fan_out)
+from .deadline import (resolve_deadline, current_deadline, expired)
+from .singleflight import SingleFlight
+from .upload import (
+  MAX_IMAGE_SIZE,
+  CHUNK_SIZE,
+  Buffer,
+  image_header,
+  check_size,
+  iter_buffer,
+  iter_file,
+  spool,
+  stream_image
+)
+from .codec import (
+  Codec,
+  compact,
+  loads,
+  dumps,
+  GUILD,
+  ART,
+  ATTACK,
+  ABILITY,
+  FAMILY,
+  USER,
+  SNAPSHOT,
+  CHANGES
+)
+from .utils import MISSING
 from .errors import (
   MorkatoServerError,
+  ContentEncodingError,
   UserNotFoundError,
+  MorkatoTimeoutError,
+  RateLimitedError,
+  SchemaValidationError,
+  BulkWriteError,
   HTTPException,
   NotFoundError,
   ModelType
 )
 from typing_extensions import Self
 from typing import (
+  AsyncIterable,
+  AsyncIterator,
   Optional,
   ClassVar,
   SupportsInt,
+  Sequence,
+  Iterable,
+  Mapping,
   Union,
+  Tuple,
   Dict,
   List,
   Any
@@ -22,6 +73,8 @@ from .types import (
   Family as FamilyPayload,
   Attack as AttackPayload,
   Guild as GuildPayload,
+  GuildSnapshot,
+  GuildChanges,
   User as UserPayload,
   Art as ArtPayload,
   ArtWithAttacks,
@@ -32,32 +85,47 @@ from .types import (
 import logging
 import asyncio
 import aiohttp
-import orjson
+import uuid
+import time
 import sys
 import re
 import os
 
 logger = logging.getLogger(__name__)
 
-async def json_or_text(response: aiohttp.ClientResponse) -> Union[Dict[str, Any], str]:
-  text = await response.text(encoding='utf-8')
+async def json_or_text(response: Response, compression: CompressionPolicy, key: str) -> Union[Dict[str, Any], str]:
+  encoding = response.headers.get('Content-Encoding')
+  try:
+    data = await compression.decode(key, encoding, response.body)
+  except DECODE_ERRORS as exc:
+    raise ContentEncodingError(response, encoding) from exc
   try:
     type = response.headers['Content-Type'].split(';', 1)[0]
     if type == 'application/json':
-      return orjson.loads(text)
+      return loads(data)
   except KeyError:
     pass
-  return text
+  return data.decode('utf-8')
 class Route:
   BASE: ClassVar[str] = os.getenv("URL", "http://localhost:5500")
   CDN_URL: ClassVar[str] = os.getenv("CDN_URL", "http://localhost:5050")
-  def __init__(self, method: str, path: str, **parameters):
+  def __init__(self, method: str, path: str, *, query: Optional[Dict[str, Any]] = None, **parameters):
     self.path: str = path
     self.method: str = method
-    url = self.BASE + self.path
+    self.parameters: Dict[str, Any] = parameters
+    self.key: str = "%s %s" % (method, path)
+    endpoint = self.path
     if parameters:
-      url = url.format_map({k: quote(v) if isinstance(v, str) else v for k, v in parameters.items()})
-    self.url: str = url
+      endpoint = endpoint.format_map({k: quote(v) if isinstance(v, str) else v for k, v in parameters.items()})
+    if query:
+      # Part of the url, so coalescing and conditional caching tell pages apart; the key stays per path.
+      query = {k: v for k, v in query.items() if v is not None}
+      if query:
+        endpoint += "?" + urlencode(query)
+    self.endpoint: str = endpoint
+    self.url: str = self.BASE + endpoint
+    guild_id = parameters.get("guild_id", parameters.get("gid"))
+    self.guild_id: Optional[int] = int(guild_id) if guild_id is not None else None
   @classmethod
   def from_cdn(cls, query: str, /) -> str:
     matcher = re.match(r'^cdn://([0,9]{15,30})/([^:0-9\s\/]{0,32})$', query, re.IGNORECASE)
@@ -68,11 +136,71 @@ class HTTPClient:
   def __init__(
     self,
     loop: Optional[asyncio.AbstractEventLoop] = None,
-    connector: Optional[aiohttp.BaseConnector] = None
+    connector: Optional[aiohttp.BaseConnector] = None,
+    ratelimiter: Optional[RateLimiter] = None,
+    max_ratelimit_retries: int = 5,
+    coalesce_gets: bool = True,
+    conditional_cache: Optional[ConditionalCache] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    timeout: Optional[float] = 10.0,
+    timeouts: Optional[Dict[str, Optional[float]]] = None,
+    pool: Optional[ConnectionPoolConfig] = None,
+    base_url: Optional[str] = None,
+    replicas: Optional[Sequence[str]] = None,
+    balancing: str = LoadBalancer.POWER_OF_TWO,
+    read_your_writes: float = 5.0,
+    health_check_path: Optional[str] = None,
+    health_check_interval: float = 10.0,
+    hedge_policy: Optional[HedgePolicy] = None,
+    max_concurrency: Optional[int] = None,
+    adaptive_concurrency: Optional[AIMDLimiter] = None,
+    compression: Optional[CompressionPolicy] = None,
+    validation: Optional[ValidationPolicy] = None,
+    journal: Optional[WriteJournal] = None,
+    bulk_policy: Optional[BulkPolicy] = None,
+    transport: Union[str, Transport, None] = None
   ) -> None:
     self.loop = loop
     self.connector = connector
+    self.pool = pool if pool is not None else ConnectionPoolConfig.from_env()
+    self.ratelimiter = ratelimiter if ratelimiter is not None else RateLimiter()
+    self.max_ratelimit_retries = max_ratelimit_retries
+    self.coalesce_gets = coalesce_gets
+    self.inflight: SingleFlight[str, Any] = SingleFlight()
+    self.conditional_cache = conditional_cache
+    self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+    self.retry_budget = retry_budget if retry_budget is not None else RetryBudget()
+    if replicas is None:
+      replicas = [url.strip() for url in os.getenv("REPLICA_URLS", "").split(",") if url.strip()]
+    self.balancer = LoadBalancer(
+      base_url if base_url is not None else Route.BASE,
+      replicas,
+      breaker_factory = self.retry_policy.create_circuit_breaker,
+      strategy = balancing,
+      read_your_writes = read_your_writes
+    )
+    self.hedge_policy = hedge_policy
+    self.scheduler = PriorityScheduler(max_concurrency if max_concurrency is not None else self.pool.limit_per_host)
+    self.adaptive_concurrency = adaptive_concurrency
+    if adaptive_concurrency is not None:
+      adaptive_concurrency.bind(self.scheduler)
+    self.compression = compression if compression is not None else CompressionPolicy()
+    self.validation = validation if validation is not None else ValidationPolicy()
+    self.journal = journal if journal is not None else WriteJournal.from_env()
+    self.__replay_task: Optional[asyncio.Task[None]] = None
+    self.bulk_policy = bulk_policy if bulk_policy is not None else BulkPolicy.from_env()
+    self.health_check_path = health_check_path
+    self.health_check_interval = health_check_interval
+    self.__health_check_task: Optional[asyncio.Task[None]] = None
+    self.timeout = timeout
+    self.timeouts: Dict[str, Optional[float]] = timeouts if timeouts is not None else {}
     self.__session: aiohttp.ClientSession = None # type: ignore
+    self.__download_session: Optional[aiohttp.ClientSession] = None
+    # A name is resolved at login, once the session it may wrap exists; None reads MORKATO_HTTP_TRANSPORT.
+    self.__transport_name: Optional[str] = transport if not isinstance(transport, Transport) else None
+    self.transport: Transport = transport if isinstance(transport, Transport) else None # type: ignore
+    self.__owns_transport = False
     user_agent = 'morkato (https://github.com/morkato/morkato-Bot {0}) Python/{1[0]}.{1[1]} aiohttp/{2}'
     self.user_agent: str = user_agent.format(1.0, sys.version_info, aiohttp.__version__)
   async def __aenter__(self) -> Self:
@@ -93,67 +221,396 @@ class HTTPClient:
     if self.loop is None:
       self.loop = asyncio.get_running_loop()
     if self.connector is None:
-      self.connector = aiohttp.TCPConnector(limit=0)
+      self.connector = self.pool.create_connector(unix_socket=self.balancer.primary.unix_socket)
     self.__session = aiohttp.ClientSession(
-      connector=self.connector
+      connector=self.connector,
+      auto_decompress=False,
+      timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.pool.connect_timeout)
     )
+    if self.transport is None:
+      self.transport = create_transport(
+        self.__transport_name,
+        session = self.__session,
+        pool = self.pool,
+        unix_socket = self.balancer.primary.unix_socket
+      )
+      self.__owns_transport = True
+    logger.info("Usando o transporte HTTP %s", self.transport.name)
+    if self.pool.warmup_connections > 0:
+      await self.warmup(self.pool.warmup_connections)
+    if self.health_check_path is not None:
+      self.__health_check_task = self.loop.create_task(self.__health_check_loop())
+    if self.journal is not None:
+      self.journal.open()
+      self.__replay_task = self.loop.create_task(self.__replay_loop())
+  async def __health_check_loop(self) -> None:
+    while True:
+      await asyncio.sleep(self.health_check_interval)
+      await self.balancer.check(self.__session, self.health_check_path, self.health_check_interval)
+  async def __replay_loop(self) -> None:
+    journal = self.journal
+    while True:
+      await journal.wait()
+      # An open breaker means the API is still down; its first probe is the replay itself.
+      if not journal.pending or not self.balancer.primary.breaker.is_available():
+        continue
+      try:
+        await journal.replay(self._replay)
+      except Exception:
+        logger.exception("Falha inesperada ao reaplicar o journal de escritas")
+  async def _replay(self, entry: JournalEntry) -> None:
+    route = Route(entry.method, entry.path, **entry.parameters)
+    kwargs: Dict[str, Any] = {}
+    if entry.json is not None:
+      kwargs["json"] = entry.json
+    await self.request(route, idempotent=True, priority=Priority.BACKGROUND, headers={IDEMPOTENCY_HEADER: entry.key}, **kwargs)
+  async def warmup(self, connections: int) -> int:
+    if not self.__session:
+      raise NotImplementedError
+    # A UNIX socket session can only reach the co-located API, not the CDN.
+    urls = [endpoint.http_base for endpoint in self.balancer.endpoints]
+    if self.balancer.primary.unix_socket is None:
+      urls.append(Route.CDN_URL)
+    opened = await self.transport.warmup(urls, connections)
+    logger.info("%s conexões pré-aquecidas com a API", opened)
+    return opened
+  def pool_stats(self) -> Dict[str, int]:
+    return self.transport.stats()
   async def close(self) -> None:
+    if self.__health_check_task is not None:
+      self.__health_check_task.cancel()
+      self.__health_check_task = None
+    if self.__replay_task is not None:
+      # Awaited so an in-flight replay cannot outlive the transport it is using.
+      self.__replay_task.cancel()
+      await asyncio.gather(self.__replay_task, return_exceptions=True)
+      self.__replay_task = None
+    if self.transport is not None:
+      await self.transport.close()
+      if self.__owns_transport:
+        self.transport = None # type: ignore
+        self.__owns_transport = False
     if self.__session is not None:
       await self.__session.close()
       self.__session = None # type: ignore
-  async def request(self, route: Route, **kwargs) -> Any:
+    if self.__download_session is not None:
+      await self.__download_session.close()
+      self.__download_session = None
+  def download_session(self) -> aiohttp.ClientSession:
     if not self.__session:
       raise NotImplementedError
+    if self.balancer.primary.unix_socket is None:
+      return self.__session
+    # A UNIX socket session can only reach the co-located API; remote files need a TCP pool of their own.
+    if self.__download_session is None:
+      self.__download_session = aiohttp.ClientSession(
+        connector=self.pool.create_connector(),
+        auto_decompress=False,
+        timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.pool.connect_timeout)
+      )
+    return self.__download_session
+  @property
+  def circuit_breakers(self) -> Dict[str, CircuitBreaker]:
+    return {endpoint.url: endpoint.breaker for endpoint in self.balancer.endpoints}
+  def get_timeout(self, route: Route) -> Optional[float]:
+    return self.timeouts.get(route.key, self.timeout)
+  async def request(
+    self, route: Route, *,
+    idempotent: Optional[bool] = None,
+    timeout: Optional[float] = MISSING,
+    priority: Optional[Priority] = None,
+    codec: Optional[Codec[Any]] = None,
+    write_behind: bool = False,
+    **kwargs
+  ) -> Any:
+    if not self.__session:
+      raise NotImplementedError
+    if "json" in kwargs:
+      # The API's own DTO rules, checked before the request costs a round trip.
+      self.validation.validate(route.key, kwargs["json"])
+    if write_behind and self.journal is not None:
+      return await self._write_behind(route, timeout=timeout, priority=priority, codec=codec, **kwargs)
+    if priority is None:
+      priority = current_priority()
+    route_timeout = self.get_timeout(route)
+    if timeout is MISSING:
+      timeout = route_timeout
+    deadline = resolve_deadline(timeout)
+    # Set when the caller's deadline, not the route's own timeout, bounds the request:
+    # running out of it is not the server's fault.
+    caller_deadline: Optional[float] = None
+    if deadline is not None and (deadline == current_deadline() or route_timeout is None or timeout < route_timeout):
+      caller_deadline = deadline
+    primary = self.balancer.prefers_primary(route)
+    # Urls the attempts were sent to: the balancer picks the host, not Route.BASE.
+    sent: List[str] = []
+    if self.coalesce_gets and route.method == "GET" and not kwargs:
+      # The shared request is bounded by the route timeout only; each waiter
+      # still gives up at its own deadline without cancelling the others.
+      # Reads pinned to the primary never join a flight that may hit a stale replica.
+      shared_timeout = self.get_timeout(route)
+      shared_deadline = time.monotonic() + shared_timeout if shared_timeout is not None else None
+      key = route.url if not primary else "primary:" + route.url
+      coro = self.inflight.do(key, lambda: self._request(route, deadline=shared_deadline, idempotent=idempotent, primary=primary, priority=priority, codec=codec, sent=sent))
+    else:
+      coro = self._request(route, deadline=deadline, caller_deadline=caller_deadline, idempotent=idempotent, primary=primary, priority=priority, codec=codec, sent=sent, **kwargs)
+    if deadline is None:
+      return await coro
+    try:
+      return await asyncio.wait_for(coro, max(deadline - time.monotonic(), 0.0))
+    except asyncio.TimeoutError:
+      # Nothing sent yet (still queued, or waiting on another caller's flight): report where it would go.
+      url = sent[-1] if sent else self.balancer.choose(route, primary=primary).http_base + route.endpoint
+      raise MorkatoTimeoutError(route.method, url, timeout) from None
+  async def _write_behind(
+    self, route: Route, *,
+    timeout: Optional[float] = MISSING,
+    priority: Optional[Priority] = None,
+    codec: Optional[Codec[Any]] = None,
+    **kwargs
+  ) -> Any:
+    journal = self.journal
+    entry = JournalEntry.create(route.method, route.path, route.parameters, kwargs.get("json"))
+    # Once something is journaled, later writes queue behind it so the API sees them in order.
+    if not journal.pending:
+      try:
+        # The key lets the API recognise the replay of a write that landed before the failure.
+        return await self.request(route, idempotent=True, timeout=timeout, priority=priority, codec=codec, headers={IDEMPOTENCY_HEADER: entry.key}, **kwargs)
+      except OUTAGE_ERRORS as exc:
+        logger.warning("%s %s falhou (%s), adiando a escrita para o journal", route.method, route.endpoint, type(exc).__name__)
+    await journal.append(entry)
+    return None
+  async def _bulk_create(
+    self, single: Route, bulk: Route, payloads: List[Dict[str, Any]], *,
+    codec: Codec[Any],
+    concurrency: Optional[int] = None
+  ) -> AsyncIterator[Any]:
+    if not self.__session:
+      raise NotImplementedError
+    # Every item is checked before the first one is sent, so a bad row cannot leave half a seed behind.
+    for (index, payload) in enumerate(payloads):
+      try:
+        self.validation.validate(single.key, payload)
+      except SchemaValidationError as exc:
+        raise BulkWriteError(index, exc, []) from exc
+    policy = self.bulk_policy
+    start = 0
+    while start < len(payloads) and policy.supports(bulk.key):
+      batch = payloads[start:start + policy.batch_size]
+      try:
+        # Bulk routes sit behind the API's idempotency filter, so a batch with a key is safe to retry.
+        data = await self.request(bulk, idempotent=True, json=batch, codec=codec, headers={IDEMPOTENCY_HEADER: uuid.uuid4().hex})
+      except HTTPException as exc:
+        # No model in a 404, or a 405: the route is missing, not the guild or art.
+        if type(exc) is HTTPException and exc.status in (404, 405):
+          policy.mark_unsupported(bulk.key)
+          break
+        raise BulkWriteError(start, exc, []) from exc
+      except Exception as exc:
+        raise BulkWriteError(start, exc, []) from exc
+      policy.batches += 1
+      policy.batched += len(batch)
+      for payload in data:
+        yield payload
+      start += len(batch)
+    if start == len(payloads):
+      return
+    policy.fanned_out += len(payloads) - start
+    async for payload in fan_out(
+      payloads[start:],
+      lambda payload: self.request(single, json=payload, codec=codec),
+      concurrency if concurrency is not None else policy.concurrency,
+      offset = start
+    ):
+      yield payload
+  async def _perform(self, route: Route, endpoint: Endpoint, *, caller_deadline: Optional[float] = None, **kwargs) -> Tuple[Response, Any]:
+    breaker = endpoint.breaker
+    endpoint.acquire()
+    try:
+      response = await self.transport.request(route.method, endpoint.http_base + route.endpoint, **kwargs)
+      data = await json_or_text(response, self.compression, route.key)
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError, OSError) as exc:
+      # Only transport and server faults count against the host; a caller that ran out of
+      # time (or a cancelled request, which never gets here) says nothing about its health.
+      if not (isinstance(exc, asyncio.TimeoutError) and expired(caller_deadline)):
+        breaker.record_failure()
+      raise
+    finally:
+      endpoint.release()
+    if response.status >= 500:
+      breaker.record_failure()
+    else:
+      breaker.record_success()
+    return (response, data)
+  async def _perform_hedged(self, route: Route, endpoint: Endpoint, delay: float, *, caller_deadline: Optional[float] = None, **kwargs) -> Tuple[Response, Any]:
+    latency = self.hedge_policy.get_latency(route.key)
+    first = asyncio.ensure_future(self._perform(route, endpoint, caller_deadline=caller_deadline, **kwargs))
+    tasks = [first]
+    try:
+      (done, _) = await asyncio.wait(tasks, timeout=delay)
+      if done:
+        return first.result()
+      other = self.balancer.choose(route, primary=endpoint.primary, exclude=endpoint)
+      second = asyncio.ensure_future(self._perform(route, other, caller_deadline=caller_deadline, **kwargs))
+      tasks.append(second)
+      latency.hedged += 1
+      logger.debug("%s %s demorou mais que %.3fs, enviando requisição de hedge", route.method, route.url, delay)
+      pending = set(tasks)
+      while True:
+        (done, pending) = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          if task.exception() is None:
+            if task is second:
+              latency.hedge_wins += 1
+            return task.result()
+        if not pending:
+          return task.result()
+    finally:
+      # Whoever lost the race is cancelled so it does not hold a connection.
+      for task in tasks:
+        if not task.done():
+          task.cancel()
+  async def _request(
+    self, route: Route, *,
+    deadline: Optional[float] = None,
+    caller_deadline: Optional[float] = None,
+    idempotent: Optional[bool] = None,
+    primary: bool = True,
+    priority: Priority = Priority.NORMAL,
+    codec: Optional[Codec[Any]] = None,
+    sent: Optional[List[str]] = None,
+    **kwargs
+  ) -> Any:
     headers: Dict[str, Union[str, int]] = {
-      "User-Agent": self.user_agent
+      "User-Agent": self.user_agent,
+      "Accept-Encoding": self.compression.accept_encoding(route.key)
     }
+    if "headers" in kwargs:
+      headers.update(kwargs.pop("headers"))
+    # A streamed body is consumed by the first attempt and cannot be sent again.
+    replayable = not isinstance(kwargs.get("data"), AsyncIterable)
     if "json" in kwargs:
       headers["Content-Type"] = "application/json; charset=utf-8"
       json = kwargs.pop("json")
-      kwargs["data"] = orjson.dumps(json)
-    kwargs["headers"] = headers
+      kwargs["data"] = dumps(json)
     method = route.method
-    url = route.url
-    for tries in range(5):
+    conditional = None
+    if method == "GET" and self.conditional_cache is not None:
+      conditional = self.conditional_cache.get(route.url)
+      if conditional is not None:
+        headers.update(conditional.headers())
+    kwargs["headers"] = headers
+    bucket = self.ratelimiter.get_bucket(route)
+    policy = self.retry_policy
+    retryable = policy.is_idempotent(method, idempotent)
+    hedging = self.hedge_policy is not None and method == "GET" and retryable
+    self.retry_budget.deposit()
+    retries = 0
+    ratelimited = 0
+    while True:
+      await bucket.acquire(self.ratelimiter, priority)
+      endpoint = self.balancer.choose(route, primary=primary)
+      endpoint.breaker.before_request()
+      url = endpoint.http_base + route.endpoint
+      if sent is not None:
+        sent.append(url)
+      error: Exception
+      retry_after: Optional[float] = None
+      await self.scheduler.acquire(priority)
+      started = time.monotonic()
       try:
-        async with self.__session.request(method, url, **kwargs) as response:
-          status = response.status
-          data = await json_or_text(response)
-          logger.debug("%s %s retornou: %s", method, url, status)
-          if status in range(200, 300):
-            return data
-          logger.debug("Response Data: %s", data)
-          extra = data.get("extra", {})
-          if status == 404:
-            model_name = data["model"]
-            model = ModelType[model_name]
-            if model == ModelType.USER:
-              raise UserNotFoundError(response, extra)
-            raise NotFoundError(response, model, extra)
-          elif status >= 500:
-            raise MorkatoServerError(response, extra)
-          raise HTTPException(response, extra)
-      except OSError as err:
-        if tries < 4 and err.errno in (54, 10054):
-          await asyncio.sleep(1 + tries * 2)
+        if deadline is not None:
+          kwargs["timeout"] = max(deadline - time.monotonic(), 0.0)
+        hedge_delay = self.hedge_policy.delay_for(route.key) if hedging else None
+        if hedge_delay is not None:
+          (response, data) = await self._perform_hedged(route, endpoint, hedge_delay, caller_deadline=caller_deadline, **kwargs)
+        else:
+          (response, data) = await self._perform(route, endpoint, caller_deadline=caller_deadline, **kwargs)
+      except (aiohttp.ClientConnectionError, asyncio.TimeoutError, OSError) as exc:
+        if self.adaptive_concurrency is not None and not (isinstance(exc, asyncio.TimeoutError) and expired(caller_deadline)):
+          self.adaptive_concurrency.record(time.monotonic() - started, failed=True)
+        # The request never reached the server, so even a POST is safe to resend.
+        if not (retryable or isinstance(exc, (aiohttp.ClientConnectorError, TransportConnectError))):
+          raise
+        error = exc
+      else:
+        status = response.status
+        elapsed = time.monotonic() - started
+        bucket.update(response.headers)
+        logger.debug("%s %s retornou: %s", method, url, status)
+        if self.adaptive_concurrency is not None:
+          self.adaptive_concurrency.record(elapsed, failed=status >= 500 or status == 429)
+        if hedging and status < 500:
+          self.hedge_policy.record(route.key, elapsed)
+        if status == 304 and conditional is not None:
+          return self.conditional_cache.revalidate(conditional)
+        if status in range(200, 300):
+          if codec is not None:
+            data = codec(data)
+          if method != "GET":
+            self.balancer.record_write(route)
+          elif self.conditional_cache is not None:
+            self.conditional_cache.store(route.url, response.headers, data, codec)
+          return data
+        logger.debug("Response Data: %s", data)
+        extra = data.get("extra", {}) if isinstance(data, dict) else {}
+        if status == 429:
+          retry_after = parse_retry_after(response.headers, data)
+          if retry_after is None:
+            retry_after = 1.0
+          if response.headers.get("X-RateLimit-Global"):
+            self.ratelimiter.ratelimit_global(retry_after)
+          bucket.ratelimit(retry_after)
+          ratelimited += 1
+          if ratelimited > self.max_ratelimit_retries or not replayable:
+            raise RateLimitedError(response, extra, retry_after)
+          logger.warning("%s %s sofreu rate limit, tentando novamente em %.2fs", method, url, retry_after)
           continue
-        raise
+        if status == 404:
+          if not isinstance(data, dict) or "model" not in data:
+            # No model in the body: the route itself is unknown to this API.
+            raise HTTPException(response, extra)
+          model_name = data["model"]
+          model = ModelType[model_name]
+          if model == ModelType.USER:
+            raise UserNotFoundError(response, extra)
+          raise NotFoundError(response, model, extra)
+        elif status < 500:
+          raise HTTPException(response, extra)
+        error = MorkatoServerError(response, extra)
+        if not (retryable and policy.should_retry_status(status)):
+          raise error
+        retry_after = parse_retry_after(response.headers)
+      finally:
+        self.scheduler.release()
+      if not policy.can_retry(retries) or not self.retry_budget.withdraw():
+        raise error
+      delay = policy.backoff(retries, retry_after)
+      retries += 1
+      logger.warning("%s %s falhou (%s), tentativa %s em %.2fs", method, url, type(error).__name__, retries, delay)
+      await asyncio.sleep(delay)
   async def fetch_guild(self, id: int) -> GuildPayload:
-    route = Route("GET", "/guilds/{id}", id=id)
-    return await self.request(route)
-  async def fetch_arts(self, guild_id: int) -> List[Union[ArtWithAttacks, ArtPayload]]:
-    route = Route("GET", "/arts/{gid}", gid=guild_id)
-    payload = await self.request(route)
+    route = Route("GET", "/guilds/{guild_id}", guild_id=id)
+    return await self.request(route, codec=GUILD)
+  async def fetch_guild_snapshot(self, id: int) -> GuildSnapshot:
+    route = Route("GET", "/guilds/{guild_id}/snapshot", guild_id=id)
+    return await self.request(route, codec=SNAPSHOT)
+  async def fetch_guild_changes(self, id: int, *, since: Optional[int] = None) -> GuildChanges:
+    route = Route("GET", "/guilds/{guild_id}/changes", guild_id=id, query={"since": since})
+    return await self.request(route, codec=CHANGES)
+  async def fetch_arts(self, guild_id: int, *, after: Optional[int] = None, limit: Optional[int] = None) -> List[Union[ArtWithAttacks, ArtPayload]]:
+    route = Route("GET", "/arts/{gid}", gid=guild_id, query={"after": after, "limit": limit})
+    payload = await self.request(route, codec=ART)
     return payload
   async def fetch_user(self, guild_id: int, id: int) -> UserPayload:
     route = Route("GET", "/users/{guild_id}/{id}", guild_id=guild_id, id=id)
-    return await self.request(route)
-  async def fetch_families(self, guild_id: int) -> List[FamilyPayload]:
-    route = Route("GET", "/families/{guild_id}", guild_id=guild_id)
-    return await self.request(route)
-  async def fetch_abilities(self, guild_id: int) -> List[AbilityPayload]:
-    route = Route("GET", "/abilities/{guild_id}", guild_id=guild_id)
-    return await self.request(route)
+    return await self.request(route, codec=USER)
+  async def fetch_families(self, guild_id: int, *, after: Optional[int] = None, limit: Optional[int] = None) -> List[FamilyPayload]:
+    route = Route("GET", "/families/{guild_id}", guild_id=guild_id, query={"after": after, "limit": limit})
+    return await self.request(route, codec=FAMILY)
+  async def fetch_abilities(self, guild_id: int, *, after: Optional[int] = None, limit: Optional[int] = None) -> List[AbilityPayload]:
+    route = Route("GET", "/abilities/{guild_id}", guild_id=guild_id, query={"after": after, "limit": limit})
+    return await self.request(route, codec=ABILITY)
   async def create_art(
     self, guild_id: int, *,
     name: str,
@@ -166,7 +623,7 @@ class HTTPClient:
     banner: Optional[str] = None
   ) -> ArtPayload:
     route = Route("POST", "/arts/{gid}", gid=guild_id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       type = type,
       energy = energy,
@@ -176,7 +633,7 @@ class HTTPClient:
       description = description,
       banner = banner
     )
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=ART)
   async def update_art(
     self, guild_id: int, id: int, *,
     name: Optional[str] = None,
@@ -189,7 +646,7 @@ class HTTPClient:
     banner: Optional[str] = None
   ) -> Union[ArtPayload, ArtWithAttacks]:
     route = Route("PUT", "/arts/{guild_id}/{id}", guild_id=guild_id, id=id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       type = type,
       energy = energy,
@@ -199,11 +656,11 @@ class HTTPClient:
       description = description,
       banner = banner
     )
-    payload = await self.request(route, json=payload)
+    payload = await self.request(route, json=payload, codec=ART)
     return payload
   async def delete_art(self, guild_id: int, id: int) -> Union[ArtWithAttacks, ArtPayload]:
     route = Route("DELETE", "/arts/{guild_id}/{id}", guild_id=guild_id, id=id)
-    return await self.request(route)
+    return await self.request(route, codec=ART)
   async def create_attack(
     self, guild_id: int, art_id: int, *,
     name: str,
@@ -225,7 +682,7 @@ class HTTPClient:
     flags: Optional[SupportsInt] = None
   ) -> AttackPayload:
     route = Route("POST", "/attacks/{guild_id}/{art_id}", guild_id=guild_id, art_id=art_id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       name_prefix_art = name_prefix_art,
       description = description,
@@ -245,7 +702,20 @@ class HTTPClient:
     )
     if flags is not None:
       payload.update(flags=int(flags))
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=ATTACK)
+  def bulk_create_attacks(
+    self, guild_id: int, art_id: int, attacks: Iterable[Mapping[str, Any]], *,
+    concurrency: Optional[int] = None
+  ) -> AsyncIterator[AttackPayload]:
+    single = Route("POST", "/attacks/{guild_id}/{art_id}", guild_id=guild_id, art_id=art_id)
+    bulk = Route("POST", "/attacks/{guild_id}/{art_id}/bulk", guild_id=guild_id, art_id=art_id)
+    payloads = []
+    for attack in attacks:
+      payload = compact(**attack)
+      if "flags" in payload:
+        payload.update(flags=int(payload["flags"]))
+      payloads.append(payload)
+    return self._bulk_create(single, bulk, payloads, codec=ATTACK, concurrency=concurrency)
   async def update_attack(
     self, guild_id: int, id: int, *,
     name: Optional[str] = None,
@@ -264,10 +734,11 @@ class HTTPClient:
     damage: Optional[int] = None,
     breath: Optional[int] = None,
     blood: Optional[int] = None,
-    flags: Optional[SupportsInt] = None
-  ) -> AttackPayload:
+    flags: Optional[SupportsInt] = None,
+    write_behind: bool = False
+  ) -> Optional[AttackPayload]:
     route = Route("PUT", "/attacks/{guild_id}/{id}", guild_id=guild_id, id=id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       name_prefix_art = name_prefix_art,
       description = description,
@@ -287,10 +758,10 @@ class HTTPClient:
     )
     if flags is not None:
       payload.update(flags=int(flags))
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=ATTACK, write_behind=write_behind)
   async def delete_attack(self, guild_id: int, id: int) -> AttackPayload:
     route = Route("DELETE", "/attacks/{guild_id}/{id}", guild_id=guild_id, id=id)
-    return await self.request(route)
+    return await self.request(route, codec=ATTACK)
   async def create_user(
     self, guild_id: int, id: int, *,
     type: UserType,
@@ -302,7 +773,7 @@ class HTTPClient:
     berserk_roll: Optional[int] = None
   ) -> UserPayload:
     route = Route("POST", "/users/{guild_id}/{id}", guild_id=guild_id, id=id)
-    payload = NoNullDict(
+    payload = compact(
       type = type,
       flags = flags,
       ability_roll = ability_roll,
@@ -311,7 +782,7 @@ class HTTPClient:
       mark_roll = mark_roll,
       berserk_roll = berserk_roll
     )
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=USER)
   async def update_user(
     self, guild_id: int, id: int, *,
     flags: Optional[int] = None,
@@ -319,10 +790,11 @@ class HTTPClient:
     family_roll: Optional[int] = None,
     prodigy_roll: Optional[int] = None,
     mark_roll: Optional[int] = None,
-    berserk_roll: Optional[int] = None
-  ) -> UserPayload:
+    berserk_roll: Optional[int] = None,
+    write_behind: bool = False
+  ) -> Optional[UserPayload]:
     route = Route("PUT", "/users/{guild_id}/{id}", guild_id=guild_id, id=id)
-    payload = NoNullDict(
+    payload = compact(
       flags = flags,
       ability_roll = ability_roll,
       family_roll = family_roll,
@@ -330,10 +802,10 @@ class HTTPClient:
       mark_roll = mark_roll,
       berserk_roll = berserk_roll
     )
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=USER, write_behind=write_behind)
   async def delete_user(self, guild_id: int, id: int) -> UserPayload:
     route = Route("DELETE", "/users/{guild_id}/{id}", guild_id=guild_id, id=id)
-    return await self.request(route)
+    return await self.request(route, codec=USER)
   async def create_ability(
     self, guild_id: int, *,
     name: str,
@@ -343,14 +815,27 @@ class HTTPClient:
     banner: Optional[str] = None
   ) -> AbilityPayload:
     route = Route("POST", "/abilities/{guild_id}", guild_id=guild_id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       percent = percent,
       user_type = int(user_type) if user_type is not None else None,
       description = description,
       banner = banner
     )
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=ABILITY)
+  def bulk_create_abilities(
+    self, guild_id: int, abilities: Iterable[Mapping[str, Any]], *,
+    concurrency: Optional[int] = None
+  ) -> AsyncIterator[AbilityPayload]:
+    single = Route("POST", "/abilities/{guild_id}", guild_id=guild_id)
+    bulk = Route("POST", "/abilities/{guild_id}/bulk", guild_id=guild_id)
+    payloads = []
+    for ability in abilities:
+      payload = compact(**ability)
+      if "user_type" in payload:
+        payload.update(user_type=int(payload["user_type"]))
+      payloads.append(payload)
+    return self._bulk_create(single, bulk, payloads, codec=ABILITY, concurrency=concurrency)
   async def update_ability(
     self, guild_id: int, id: int, *,
     name: Optional[str] = None,
@@ -360,7 +845,7 @@ class HTTPClient:
     banner: Optional[str] = None
   ) -> AbilityPayload:
     route = Route("PUT", "/abilities/{guild_id}/{id}", guild_id=guild_id, id=id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       percent = percent,
       description = description,
@@ -368,10 +853,10 @@ class HTTPClient:
     )
     if user_type is not None:
       payload.update(user_type=int(user_type))
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=ABILITY)
   async def delete_ability(self, guild_id: int, id: int) -> AbilityPayload:
     route = Route("DELETE", "/abilities/{guild_id}/{id}", guild_id=guild_id, id=id)
-    return await self.request(route)
+    return await self.request(route, codec=ABILITY)
   async def create_family(
     self, guild_id: int, *,
     name: str,
@@ -381,7 +866,7 @@ class HTTPClient:
     banner: Optional[str] = None
   ) -> FamilyPayload:
     route = Route("POST", "/families/{guild_id}", guild_id=guild_id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       percent = percent,
       description = description,
@@ -389,7 +874,20 @@ class HTTPClient:
     )
     if user_type is not None:
       payload.update(user_type=int(user_type))
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=FAMILY)
+  def bulk_create_families(
+    self, guild_id: int, families: Iterable[Mapping[str, Any]], *,
+    concurrency: Optional[int] = None
+  ) -> AsyncIterator[FamilyPayload]:
+    single = Route("POST", "/families/{guild_id}", guild_id=guild_id)
+    bulk = Route("POST", "/families/{guild_id}/bulk", guild_id=guild_id)
+    payloads = []
+    for family in families:
+      payload = compact(**family)
+      if "user_type" in payload:
+        payload.update(user_type=int(payload["user_type"]))
+      payloads.append(payload)
+    return self._bulk_create(single, bulk, payloads, codec=FAMILY, concurrency=concurrency)
   async def update_family(
     self, guild_id: int, id: int, *,
     name: Optional[str] = None,
@@ -399,7 +897,7 @@ class HTTPClient:
     banner: Optional[str] = None
   ) -> FamilyPayload:
     route = Route("PUT", "/families/{guild_id}/{id}", guild_id=guild_id, id=id)
-    payload = NoNullDict(
+    payload = compact(
       name = name,
       percent = percent,
       description = description,
@@ -407,25 +905,69 @@ class HTTPClient:
     )
     if user_type is not None:
       payload.update(user_type=int(user_type))
-    return await self.request(route, json=payload)
+    return await self.request(route, json=payload, codec=FAMILY)
   async def delete_family(self, guild_id: int, id: int) -> FamilyPayload:
     route = Route("DELETE", "/families/{guild_id}/{id}", guild_id=guild_id, id=id)
-    return await self.request(route)
+    return await self.request(route, codec=FAMILY)
   async def upload_image(
-    self, image: bytes, *,
+    self, image: Union[Buffer, AsyncIterable[Buffer]], *,
     author_id: int,
-    name: str
+    name: str,
+    size: Optional[int] = None,
+    max_size: int = MAX_IMAGE_SIZE
   ) -> None:
     route = Route("POST", "/cdn/upload")
-    headers = bytes()
-    headers += author_id.to_bytes(8, byteorder='big')
-    headers += len(name).to_bytes(4, byteorder='big')
-    headers += name.encode('utf8')
-    content = headers + image
-    await self.request(route, data=content)
-  async def registry_user_ability(self, guild_id: int, user_id: int, ability_id: int) -> UserPayload:
+    header = image_header(author_id, name)
+    spooled = None
+    if isinstance(image, (bytes, bytearray, memoryview)):
+      size = len(image)
+      chunks: AsyncIterable[Buffer] = iter_buffer(image)
+    else:
+      chunks = image
+    check_size(size, max_size)
+    try:
+      if size is None:
+        # The CDN reads Content-Length before the body, so a stream of unknown length is spooled first.
+        (spooled, size) = await spool(chunks, max_size=max_size)
+        chunks = iter_file(spooled)
+      body = stream_image(header, chunks, size=size, max_size=max_size)
+      await self.request(route, idempotent=False, data=body, headers={"Content-Length": str(len(header) + size)})
+    finally:
+      if spooled is not None:
+        spooled.close()
+  def _download(self, url: str) -> Any:
+    # Only stalls are bounded while downloading: the body is read for as long as its consumer takes.
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.pool.connect_timeout, sock_read=self.timeout)
+    return self.download_session().get(url, headers={"Accept-Encoding": "identity"}, timeout=timeout)
+  async def download_image(self, url: str, *, max_size: int = MAX_IMAGE_SIZE) -> bytearray:
+    async with self._download(url) as response:
+      response.raise_for_status()
+      check_size(response.content_length, max_size)
+      image = bytearray()
+      async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        image += chunk
+        check_size(len(image), max_size)
+      return image
+  async def upload_image_from_url(
+    self, url: str, *,
+    author_id: int,
+    name: str,
+    max_size: int = MAX_IMAGE_SIZE
+  ) -> None:
+    async with self._download(url) as response:
+      response.raise_for_status()
+      # Refused from the headers alone, before a byte of the body is read.
+      check_size(response.content_length, max_size)
+      await self.upload_image(
+        response.content.iter_chunked(CHUNK_SIZE),
+        author_id = author_id,
+        name = name,
+        size = response.content_length,
+        max_size = max_size
+      )
+  async def registry_user_ability(self, guild_id: int, user_id: int, ability_id: int, *, write_behind: bool = False) -> Optional[UserPayload]:
     route = Route("POST", "/users/{guild_id}/{user_id}/abilities/{ability_id}", guild_id=guild_id, user_id=user_id, ability_id=ability_id)
-    return await self.request(route)
-  async def registry_user_family(self, guild_id: int, user_id: int, family_id: int) -> UserPayload:
+    return await self.request(route, codec=USER, write_behind=write_behind)
+  async def registry_user_family(self, guild_id: int, user_id: int, family_id: int, *, write_behind: bool = False) -> Optional[UserPayload]:
     route = Route("POST", "/users/{guild_id}/{user_id}/families/{family_id}", guild_id=guild_id, user_id=user_id, family_id=family_id)
-    return await self.request(route)
\ No newline at end of file
+    return await self.request(route, codec=USER, write_behind=write_behind)
\ No newline at end of file
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+  Optional,
+  Union,
+  Dict,
+  Any
+)
+import logging
+import asyncio
+import io
+import os
+
+try:
+  from PIL import (Image, ImageOps)
+except ImportError:
+  Image = None
+  ImageOps = None
+
+HAS_PIL = Image is not None
+
+logger = logging.getLogger(__name__)
+
+def preprocess(data: Union[bytes, bytearray], max_dimension: int, quality: int) -> bytes:
+  # Runs in a worker process: everything it touches must be picklable.
+  with Image.open(io.BytesIO(data)) as source:
+    if getattr(source, "is_animated", False):
+      # Re-encoding an animation keeps only its first frame.
+      return bytes(data)
+    # JPEG can decode at 1/2, 1/4 or 1/8 scale straight away, skipping most of the work for huge photos.
+    source.draft("RGB", (max_dimension, max_dimension))
+    image = ImageOps.exif_transpose(source)
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    transparent = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if transparent else "RGB")
+    # Nothing from the source survives: EXIF, ICC profiles and text chunks are dropped.
+    image.info = {}
+    output = io.BytesIO()
+    if transparent:
+      image.save(output, format="PNG", optimize=True)
+    else:
+      image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return output.getvalue()
+class ImageSettings:
+  __slots__ = ("max_dimension", "quality")
+  def __init__(self, *, max_dimension: Optional[int] = None, quality: int = 82) -> None:
+    self.max_dimension = max_dimension
+    self.quality = quality
+  def __repr__(self) -> str:
+    return "<ImageSettings max_dimension=%s quality=%s>" % (self.max_dimension, self.quality)
+  @property
+  def enabled(self) -> bool:
+    return self.max_dimension is not None and HAS_PIL
+  @classmethod
+  def from_env(cls) -> ImageSettings:
+    max_dimension = int(os.getenv("MORKATO_IMAGE_MAX_DIMENSION", "0"))
+    return cls(
+      max_dimension = max_dimension if max_dimension > 0 else None,
+      quality = int(os.getenv("MORKATO_IMAGE_QUALITY", "82"))
+    )
+class ImagePreprocessor:
+  def __init__(self, *, workers: Optional[int] = None) -> None:
+    self.workers = workers if workers is not None else min(2, os.cpu_count() or 1)
+    self.executor: Optional[ProcessPoolExecutor] = None
+    self.processed = 0
+    self.kept = 0
+    self.failed = 0
+    self.original_bytes = 0
+    self.output_bytes = 0
+  async def process(self, image: Union[bytes, bytearray], settings: ImageSettings) -> Union[bytes, bytearray]:
+    if not settings.enabled:
+      return image
+    if self.executor is None:
+      self.executor = ProcessPoolExecutor(max_workers=self.workers)
+    loop = asyncio.get_running_loop()
+    try:
+      result = await loop.run_in_executor(self.executor, preprocess, image, settings.max_dimension, settings.quality)
+    except Exception as exc:
+      # Anything Pillow cannot read goes up untouched; the CDN still validates the signature.
+      self.failed += 1
+      logger.warning("Falha ao pré-processar imagem de %s bytes: %s", len(image), exc)
+      return image
+    self.processed += 1
+    self.original_bytes += len(image)
+    if len(result) >= len(image):
+      self.kept += 1
+      self.output_bytes += len(image)
+      logger.debug("Imagem de %s bytes mantida: a versão processada teria %s bytes", len(image), len(result))
+      return image
+    self.output_bytes += len(result)
+    logger.info("Imagem reduzida de %s para %s bytes (%s economizados)", len(image), len(result), len(image) - len(result))
+    return result
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "processed": self.processed,
+      "kept": self.kept,
+      "failed": self.failed,
+      "original_bytes": self.original_bytes,
+      "output_bytes": self.output_bytes,
+      "saved_bytes": self.original_bytes - self.output_bytes
+    }
+  def close(self) -> None:
+    if self.executor is not None:
+      self.executor.shutdown(wait=False, cancel_futures=True)
+      self.executor = None
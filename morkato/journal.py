@@ -0,0 +1,253 @@
+from __future__ import annotations
+from .errors import (
+  MorkatoServerError,
+  MorkatoTimeoutError,
+  MorkatoException,
+  JournalFullError,
+  RateLimitedError,
+  CircuitOpenError,
+  HTTPException
+)
+from collections import deque
+from typing import (
+  Awaitable,
+  Callable,
+  Optional,
+  Deque,
+  Tuple,
+  Dict,
+  Any
+)
+import logging
+import asyncio
+import aiohttp
+import orjson
+import uuid
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# Failures that say nothing about the write itself: the API was down, slow or unreachable.
+OUTAGE_ERRORS: Tuple[type, ...] = (
+  aiohttp.ClientConnectionError,
+  asyncio.TimeoutError,
+  OSError,
+  CircuitOpenError,
+  MorkatoTimeoutError,
+  MorkatoServerError,
+  RateLimitedError
+)
+
+class JournalEntry:
+  __slots__ = ("key", "method", "path", "parameters", "json", "created_at", "end")
+  def __init__(
+    self, key: str, method: str, path: str,
+    parameters: Dict[str, Any],
+    json: Any,
+    created_at: float,
+    end: int = 0
+  ) -> None:
+    self.key = key
+    self.method = method
+    self.path = path
+    self.parameters = parameters
+    self.json = json
+    self.created_at = created_at
+    # Offset right after this record; the replay cursor moves there once it is applied.
+    self.end = end
+  def __repr__(self) -> str:
+    return "<JournalEntry key=%s %s %s>" % (self.key, self.method, self.path)
+  @classmethod
+  def create(cls, method: str, path: str, parameters: Dict[str, Any], json: Any) -> JournalEntry:
+    return cls(uuid.uuid4().hex, method, path, parameters, json, time.time())
+  @classmethod
+  def from_record(cls, record: bytes, end: int) -> JournalEntry:
+    data = orjson.loads(record)
+    return cls(data["key"], data["method"], data["path"], data["parameters"], data["json"], data["created_at"], end)
+  def to_record(self) -> bytes:
+    return orjson.dumps({
+      "key": self.key,
+      "method": self.method,
+      "path": self.path,
+      "parameters": self.parameters,
+      "json": self.json,
+      "created_at": self.created_at
+    }) + b"\n"
+class WriteJournal:
+  def __init__(
+    self, path: str, *,
+    max_bytes: int = 16 * 1024 * 1024,
+    max_age: float = 3600.0,
+    replay_interval: float = 5.0,
+    fsync: bool = True
+  ) -> None:
+    self.path = path
+    self.cursor_path = path + ".cursor"
+    self.max_bytes = max_bytes
+    self.max_age = max_age
+    self.replay_interval = replay_interval
+    self.fsync = fsync
+    self.pending: Deque[JournalEntry] = deque()
+    self.size = 0
+    self.cursor = 0
+    # Guards the file, never a network call: appends must not wait for a replay.
+    self.lock = asyncio.Lock()
+    self.replaying = False
+    self.wakeup = asyncio.Event()
+    self.appended = 0
+    self.replayed = 0
+    self.expired = 0
+    self.dropped = 0
+    self.replay_rate = 0.0
+    self.last_replay_at: Optional[float] = None
+    self.opened = False
+  @classmethod
+  def from_env(cls) -> Optional[WriteJournal]:
+    # Opt-in: without a path there is no journal and failed writes raise as before.
+    path = os.getenv("MORKATO_JOURNAL_PATH")
+    if not path:
+      return None
+    return cls(
+      path,
+      max_bytes = int(os.getenv("MORKATO_JOURNAL_MAX_BYTES", str(16 * 1024 * 1024))),
+      max_age = float(os.getenv("MORKATO_JOURNAL_MAX_AGE", "3600")),
+      replay_interval = float(os.getenv("MORKATO_JOURNAL_REPLAY_INTERVAL", "5")),
+      fsync = os.getenv("MORKATO_JOURNAL_FSYNC", "1").lower() not in ("0", "false", "no")
+    )
+  def open(self) -> None:
+    if self.opened:
+      return
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    try:
+      with open(self.cursor_path, "rb") as fp:
+        self.cursor = int(fp.read() or b"0")
+    except FileNotFoundError:
+      self.cursor = 0
+    try:
+      with open(self.path, "rb") as fp:
+        data = fp.read()
+    except FileNotFoundError:
+      data = b""
+    # A crash mid-append leaves a torn last record; it was never acknowledged, so it goes.
+    complete = data.rfind(b"\n") + 1
+    if complete < len(data):
+      logger.warning("Descartando registro incompleto no fim do journal %s", self.path)
+      with open(self.path, "r+b") as fp:
+        fp.truncate(complete)
+    self.size = complete
+    self.cursor = min(self.cursor, complete)
+    offset = self.cursor
+    while offset < complete:
+      end = data.index(b"\n", offset) + 1
+      try:
+        self.pending.append(JournalEntry.from_record(data[offset:end], end))
+      except (orjson.JSONDecodeError, KeyError):
+        logger.warning("Registro inválido no journal %s (offset %s), ignorando", self.path, offset)
+      offset = end
+    self.opened = True
+    if self.pending:
+      logger.info("%s escritas pendentes no journal %s", len(self.pending), self.path)
+  def __len__(self) -> int:
+    return len(self.pending)
+  def _write(self, record: bytes) -> None:
+    with open(self.path, "ab") as fp:
+      fp.write(record)
+      fp.flush()
+      if self.fsync:
+        os.fsync(fp.fileno())
+  def _save_cursor(self) -> None:
+    # Not fsynced: a lost cursor only replays applied entries, which their keys make harmless.
+    temporary = self.cursor_path + ".tmp"
+    with open(temporary, "wb") as fp:
+      fp.write(str(self.cursor).encode())
+    os.replace(temporary, self.cursor_path)
+  def _compact(self) -> None:
+    with open(self.path, "wb"):
+      pass
+    self.size = 0
+    self.cursor = 0
+    self._save_cursor()
+  async def append(self, entry: JournalEntry) -> None:
+    self.open()
+    record = entry.to_record()
+    loop = asyncio.get_running_loop()
+    async with self.lock:
+      if not self.pending and self.size > 0:
+        await loop.run_in_executor(None, self._compact)
+      if self.size + len(record) > self.max_bytes:
+        raise JournalFullError(self.path, self.max_bytes)
+      await loop.run_in_executor(None, self._write, record)
+      self.size += len(record)
+      entry.end = self.size
+      self.pending.append(entry)
+      self.appended += 1
+    self.wakeup.set()
+  async def wait(self) -> None:
+    # A timer instead of wait_for, whose timeout can swallow a cancellation arriving in the same tick.
+    handle = asyncio.get_running_loop().call_later(self.replay_interval, self.wakeup.set)
+    try:
+      await self.wakeup.wait()
+    finally:
+      handle.cancel()
+    self.wakeup.clear()
+  async def replay(self, send: Callable[[JournalEntry], Awaitable[Any]]) -> int:
+    # Strictly in order, one at a time: a later write may depend on an earlier one.
+    if self.replaying:
+      return 0
+    loop = asyncio.get_running_loop()
+    replayed = 0
+    started = time.monotonic()
+    self.replaying = True
+    try:
+      while self.pending:
+        entry = self.pending[0]
+        if time.time() - entry.created_at > self.max_age:
+          self.expired += 1
+          logger.warning("Escrita %s %s expirou no journal sem ser aplicada", entry.method, entry.path)
+        else:
+          try:
+            await send(entry)
+          except OUTAGE_ERRORS as exc:
+            logger.info("API ainda indisponível (%s), %s escritas seguem no journal", type(exc).__name__, len(self.pending))
+            break
+          except MorkatoException as exc:
+            # Refused, not lost: sending it again would get the same answer.
+            self.dropped += 1
+            status = exc.status if isinstance(exc, HTTPException) else type(exc).__name__
+            logger.warning("Escrita %s %s do journal recusada (%s), descartando", entry.method, entry.path, status)
+          else:
+            replayed += 1
+            self.replayed += 1
+        async with self.lock:
+          self.pending.popleft()
+          self.cursor = entry.end
+          await loop.run_in_executor(None, self._save_cursor)
+      async with self.lock:
+        if not self.pending and self.size > 0:
+          await loop.run_in_executor(None, self._compact)
+    finally:
+      self.replaying = False
+    if replayed:
+      elapsed = time.monotonic() - started
+      self.replay_rate = replayed / elapsed if elapsed > 0 else float(replayed)
+      self.last_replay_at = time.time()
+      logger.info("%s escritas do journal aplicadas (%.1f/s)", replayed, self.replay_rate)
+    return replayed
+  def stats(self) -> Dict[str, Any]:
+    oldest = self.pending[0].created_at if self.pending else None
+    return {
+      "depth": len(self.pending),
+      "bytes": self.size - self.cursor,
+      "max_bytes": self.max_bytes,
+      "oldest_age": time.time() - oldest if oldest is not None else 0.0,
+      "appended": self.appended,
+      "replayed": self.replayed,
+      "expired": self.expired,
+      "dropped": self.dropped,
+      "replay_rate": self.replay_rate,
+      "last_replay_at": self.last_replay_at
+    }
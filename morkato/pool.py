@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import (
+  Optional,
+  Iterable,
+  Dict,
+  List
+)
+import logging
+import asyncio
+import aiohttp
+import os
+
+logger = logging.getLogger(__name__)
+
+class ConnectionPoolConfig:
+  def __init__(
+    self, *,
+    limit: int = 100,
+    limit_per_host: int = 32,
+    keepalive_timeout: float = 60.0,
+    ttl_dns_cache: Optional[int] = 300,
+    warmup_connections: int = 0,
+    connect_timeout: Optional[float] = 5.0
+  ) -> None:
+    self.limit = limit
+    self.limit_per_host = limit_per_host
+    self.keepalive_timeout = keepalive_timeout
+    self.ttl_dns_cache = ttl_dns_cache
+    self.warmup_connections = warmup_connections
+    self.connect_timeout = connect_timeout
+  @classmethod
+  def from_env(cls) -> ConnectionPoolConfig:
+    ttl_dns_cache = int(os.getenv("MORKATO_POOL_DNS_TTL", "300"))
+    return cls(
+      limit = int(os.getenv("MORKATO_POOL_LIMIT", "100")),
+      limit_per_host = int(os.getenv("MORKATO_POOL_LIMIT_PER_HOST", "32")),
+      keepalive_timeout = float(os.getenv("MORKATO_POOL_KEEPALIVE", "60")),
+      ttl_dns_cache = ttl_dns_cache if ttl_dns_cache > 0 else None,
+      warmup_connections = int(os.getenv("MORKATO_POOL_WARMUP", "0")),
+      connect_timeout = float(os.getenv("MORKATO_POOL_CONNECT_TIMEOUT", "5"))
+    )
+  def create_connector(self, *, unix_socket: Optional[str] = None) -> aiohttp.BaseConnector:
+    if unix_socket is not None:
+      return aiohttp.UnixConnector(
+        unix_socket,
+        limit = self.limit,
+        limit_per_host = self.limit_per_host,
+        keepalive_timeout = self.keepalive_timeout
+      )
+    return aiohttp.TCPConnector(
+      limit = self.limit,
+      limit_per_host = self.limit_per_host,
+      keepalive_timeout = self.keepalive_timeout,
+      ttl_dns_cache = self.ttl_dns_cache,
+      use_dns_cache = self.ttl_dns_cache is not None
+    )
+async def warmup(session: aiohttp.ClientSession, urls: Iterable[str], connections: int) -> int:
+  # Concurrent requests force distinct sockets; reading the body hands each
+  # one back to the pool as an idle keep-alive connection.
+  async def touch(url: str) -> bool:
+    try:
+      async with session.request("HEAD", url) as response:
+        await response.read()
+      return True
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as exc:
+      logger.warning("Falha ao aquecer conexão com %s: %s", url, exc)
+      return False
+  tasks: List[asyncio.Task[bool]] = []
+  for url in urls:
+    tasks.extend(asyncio.ensure_future(touch(url)) for _ in range(connections))
+  results = await asyncio.gather(*tasks)
+  return sum(results)
+def pool_stats(connector: Optional[aiohttp.BaseConnector]) -> Dict[str, int]:
+  if connector is None:
+    return {"idle": 0, "active": 0, "waiting": 0, "limit": 0}
+  # aiohttp has no public gauges, so these read the connector's bookkeeping.
+  conns = getattr(connector, "_conns", {})
+  acquired = getattr(connector, "_acquired", ())
+  waiters = getattr(connector, "_waiters", {})
+  return {
+    "idle": sum(len(items) for items in conns.values()),
+    "active": len(acquired),
+    "waiting": sum(len(items) for items in waiters.values()),
+    "limit": connector.limit
+  }
@@ -0,0 +1,121 @@
+from __future__ import annotations
+from .scheduler import (PriorityScheduler, Priority)
+from typing import (
+  TYPE_CHECKING,
+  Optional,
+  Mapping,
+  Dict,
+  Any
+)
+if TYPE_CHECKING:
+  from .http import Route
+import logging
+import asyncio
+import time
+
+logger = logging.getLogger(__name__)
+
+def parse_retry_after(headers: Mapping[str, str], payload: Any = None) -> Optional[float]:
+  value = headers.get("Retry-After")
+  if value is None:
+    value = headers.get("X-RateLimit-Reset-After")
+  if value is None and isinstance(payload, dict):
+    value = payload.get("retry_after")
+  if value is None:
+    return None
+  try:
+    return max(float(value), 0.0)
+  except (TypeError, ValueError):
+    return None
+class RateLimitBucket:
+  def __init__(self, key: str) -> None:
+    self.key = key
+    self.limit: Optional[int] = None
+    self.remaining: Optional[int] = None
+    self.reset_at: float = 0.0
+    self.queue = PriorityScheduler(1, reserved=0)
+    self.requests = 0
+    self.ratelimited = 0
+    self.waits = 0
+    self.total_wait = 0.0
+    self.max_wait = 0.0
+  def __repr__(self) -> str:
+    return "<RateLimitBucket key=%r limit=%s remaining=%s>" % (self.key, self.limit, self.remaining)
+  def is_exhausted(self, now: float) -> bool:
+    if now >= self.reset_at:
+      return False
+    return self.remaining is not None and self.remaining <= 0
+  def _record_wait(self, delay: float) -> None:
+    self.waits += 1
+    self.total_wait += delay
+    if delay > self.max_wait:
+      self.max_wait = delay
+  async def acquire(self, limiter: RateLimiter, priority: Priority = Priority.NORMAL) -> None:
+    # Waiters are admitted by priority and, within a priority, in arrival order.
+    started = time.monotonic()
+    queued = self.queue.active > 0
+    await self.queue.acquire(priority)
+    try:
+      while True:
+        now = time.monotonic()
+        delay = max(limiter.global_reset_at - now, 0.0)
+        if self.is_exhausted(now):
+          delay = max(delay, self.reset_at - now)
+        if delay <= 0.0:
+          break
+        logger.debug("Bucket %s esgotado, aguardando %.2fs", self.key, delay)
+        await asyncio.sleep(delay)
+        queued = True
+      if queued:
+        self._record_wait(time.monotonic() - started)
+      if self.remaining is not None and time.monotonic() < self.reset_at:
+        self.remaining -= 1
+      self.requests += 1
+    finally:
+      self.queue.release()
+  def update(self, headers: Mapping[str, str]) -> None:
+    limit = headers.get("X-RateLimit-Limit")
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset_after = headers.get("X-RateLimit-Reset-After")
+    try:
+      if limit is not None:
+        self.limit = int(limit)
+      if remaining is not None:
+        self.remaining = int(remaining)
+      if reset_after is not None:
+        self.reset_at = time.monotonic() + float(reset_after)
+    except ValueError:
+      logger.warning("Cabeçalhos de rate limit inválidos para o bucket %s", self.key)
+  def ratelimit(self, retry_after: float) -> None:
+    self.ratelimited += 1
+    self.remaining = 0
+    self.reset_at = max(self.reset_at, time.monotonic() + retry_after)
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "key": self.key,
+      "limit": self.limit,
+      "remaining": self.remaining,
+      "requests": self.requests,
+      "ratelimited": self.ratelimited,
+      "waits": self.waits,
+      "total_wait": self.total_wait,
+      "max_wait": self.max_wait,
+      "mean_wait": self.total_wait / self.waits if self.waits else 0.0
+    }
+class RateLimiter:
+  def __init__(self) -> None:
+    self.buckets: Dict[str, RateLimitBucket] = {}
+    self.global_reset_at: float = 0.0
+  @staticmethod
+  def key(route: Route) -> str:
+    return route.key
+  def get_bucket(self, route: Route) -> RateLimitBucket:
+    key = self.key(route)
+    bucket = self.buckets.get(key)
+    if bucket is None:
+      bucket = self.buckets[key] = RateLimitBucket(key)
+    return bucket
+  def ratelimit_global(self, retry_after: float) -> None:
+    self.global_reset_at = max(self.global_reset_at, time.monotonic() + retry_after)
+  def stats(self) -> Dict[str, Dict[str, Any]]:
+    return {key: bucket.stats() for (key, bucket) in self.buckets.items()}
@@ -0,0 +1,136 @@
+from __future__ import annotations
+from .errors import CircuitOpenError
+from typing import (
+  Optional,
+  Iterable,
+  Dict,
+  Any
+)
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+class RetryPolicy:
+  def __init__(
+    self, *,
+    max_retries: int = 4,
+    base_delay: float = 0.5,
+    max_delay: float = 10.0,
+    jitter: bool = True,
+    retry_post: bool = False,
+    statuses: Iterable[int] = (500, 502, 503, 504),
+    breaker_threshold: int = 5,
+    breaker_timeout: float = 30.0
+  ) -> None:
+    self.max_retries = max_retries
+    self.base_delay = base_delay
+    self.max_delay = max_delay
+    self.jitter = jitter
+    self.retry_post = retry_post
+    self.statuses = frozenset(statuses)
+    self.breaker_threshold = breaker_threshold
+    self.breaker_timeout = breaker_timeout
+  def is_idempotent(self, method: str, idempotent: Optional[bool] = None) -> bool:
+    if idempotent is not None:
+      return idempotent
+    if method in IDEMPOTENT_METHODS:
+      return True
+    return method == "POST" and self.retry_post
+  def can_retry(self, retries: int) -> bool:
+    return retries < self.max_retries
+  def should_retry_status(self, status: int) -> bool:
+    return status in self.statuses
+  def backoff(self, retries: int, retry_after: Optional[float] = None) -> float:
+    delay = min(self.max_delay, self.base_delay * (2 ** retries))
+    if self.jitter:
+      # "Full jitter": spreads clients that failed together over the whole window.
+      delay = random.uniform(0.0, delay)
+    if retry_after is not None:
+      delay = max(delay, retry_after)
+    return delay
+  def create_circuit_breaker(self, host: str) -> CircuitBreaker:
+    return CircuitBreaker(host, threshold=self.breaker_threshold, timeout=self.breaker_timeout)
+class CircuitBreaker:
+  CLOSED = "CLOSED"
+  OPEN = "OPEN"
+  HALF_OPEN = "HALF_OPEN"
+  def __init__(self, host: str, *, threshold: int = 5, timeout: float = 30.0) -> None:
+    self.host = host
+    self.threshold = threshold
+    self.timeout = timeout
+    self.state = self.CLOSED
+    self.failures = 0
+    self.opened_at = 0.0
+    self.rejected = 0
+    self.trips = 0
+  def __repr__(self) -> str:
+    return "<CircuitBreaker host=%r state=%s failures=%s>" % (self.host, self.state, self.failures)
+  def is_available(self) -> bool:
+    return self.state == self.CLOSED or time.monotonic() - self.opened_at >= self.timeout
+  def before_request(self) -> None:
+    if self.state == self.CLOSED:
+      return
+    now = time.monotonic()
+    elapsed = now - self.opened_at
+    if elapsed >= self.timeout:
+      # Let a single probe through per window; a lost probe reopens the next window.
+      self.state = self.HALF_OPEN
+      self.opened_at = now
+      return
+    self.rejected += 1
+    raise CircuitOpenError(self.host, self.timeout - elapsed)
+  def record_success(self) -> None:
+    if self.state != self.CLOSED:
+      logger.info("Circuit breaker de %s fechado novamente", self.host)
+    self.state = self.CLOSED
+    self.failures = 0
+  def record_failure(self) -> None:
+    self.failures += 1
+    if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+      if self.state != self.OPEN:
+        self.trips += 1
+        logger.warning("Circuit breaker de %s aberto após %s falhas", self.host, self.failures)
+      self.state = self.OPEN
+      self.opened_at = time.monotonic()
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "host": self.host,
+      "state": self.state,
+      "failures": self.failures,
+      "trips": self.trips,
+      "rejected": self.rejected
+    }
+class RetryBudget:
+  def __init__(self, *, ratio: float = 0.2, min_per_second: float = 1.0, max_balance: float = 10.0) -> None:
+    self.ratio = ratio
+    self.min_per_second = min_per_second
+    self.max_balance = max_balance
+    self.balance = max_balance
+    self.updated_at = time.monotonic()
+    self.withdrawn = 0
+    self.exhausted = 0
+  def _refill(self) -> None:
+    now = time.monotonic()
+    self.balance = min(self.max_balance, self.balance + (now - self.updated_at) * self.min_per_second)
+    self.updated_at = now
+  def deposit(self) -> None:
+    self._refill()
+    self.balance = min(self.max_balance, self.balance + self.ratio)
+  def withdraw(self) -> bool:
+    self._refill()
+    if self.balance < 1.0:
+      self.exhausted += 1
+      return False
+    self.balance -= 1.0
+    self.withdrawn += 1
+    return True
+  def stats(self) -> Dict[str, Any]:
+    self._refill()
+    return {
+      "balance": self.balance,
+      "withdrawn": self.withdrawn,
+      "exhausted": self.exhausted
+    }
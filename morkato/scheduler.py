@@ -0,0 +1,119 @@
+from __future__ import annotations
+from contextvars import ContextVar
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import (
+  Iterator,
+  Optional,
+  Tuple,
+  Dict,
+  List,
+  Any
+)
+import itertools
+import asyncio
+import heapq
+import time
+
+class Priority(IntEnum):
+  INTERACTIVE = 0
+  NORMAL = 1
+  BACKGROUND = 2
+_priority: ContextVar[Priority] = ContextVar("morkato_priority", default=Priority.NORMAL)
+
+def current_priority() -> Priority:
+  return _priority.get()
+@contextmanager
+def request_priority(priority: Optional[Priority]) -> Iterator[Priority]:
+  if priority is None:
+    yield _priority.get()
+    return
+  token = _priority.set(priority)
+  try:
+    yield priority
+  finally:
+    _priority.reset(token)
+class LaneStats:
+  __slots__ = ("admitted", "queued", "total_wait", "max_wait")
+  def __init__(self) -> None:
+    self.admitted = 0
+    self.queued = 0
+    self.total_wait = 0.0
+    self.max_wait = 0.0
+  def record(self, waited: float) -> None:
+    self.queued += 1
+    self.total_wait += waited
+    if waited > self.max_wait:
+      self.max_wait = waited
+class PriorityScheduler:
+  def __init__(self, limit: int, *, reserved: Optional[int] = None) -> None:
+    self.limit = limit
+    self.reserved = reserved
+    self.active = 0
+    self.waiters: List[Tuple[int, int, asyncio.Future[None]]] = []
+    self.counter = itertools.count()
+    self.lanes: Dict[Priority, LaneStats] = {priority: LaneStats() for priority in Priority}
+  def _can_admit(self, priority: int) -> bool:
+    if self.active >= self.limit:
+      return False
+    # Slots background work may never take, so foreground always finds room.
+    reserved = self.reserved if self.reserved is not None else self.limit // 4
+    if priority >= Priority.BACKGROUND and self.active >= self.limit - reserved:
+      return False
+    return True
+  def _wake(self) -> None:
+    while self.waiters:
+      (priority, _, future) = self.waiters[0]
+      if future.done():
+        heapq.heappop(self.waiters)
+        continue
+      if not self._can_admit(priority):
+        return
+      heapq.heappop(self.waiters)
+      self.active += 1
+      future.set_result(None)
+  def set_limit(self, limit: int) -> None:
+    self.limit = limit
+    self._wake()
+  async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+    lane = self.lanes[priority]
+    if self._can_admit(priority) and (not self.waiters or self.waiters[0][0] > priority):
+      self.active += 1
+      lane.admitted += 1
+      return
+    future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    heapq.heappush(self.waiters, (int(priority), next(self.counter), future))
+    started = time.monotonic()
+    try:
+      await future
+    except asyncio.CancelledError:
+      if future.done() and not future.cancelled():
+        # Admitted and cancelled in the same tick: hand the slot back.
+        self.release()
+      raise
+    lane.admitted += 1
+    lane.record(time.monotonic() - started)
+  def release(self) -> None:
+    self.active -= 1
+    self._wake()
+  def queued(self) -> Dict[str, int]:
+    depth = {priority.name: 0 for priority in Priority}
+    for (priority, _, future) in self.waiters:
+      if not future.done():
+        depth[Priority(priority).name] += 1
+    return depth
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "limit": self.limit,
+      "active": self.active,
+      "queued": self.queued(),
+      "lanes": {
+        priority.name: {
+          "admitted": lane.admitted,
+          "queued": lane.queued,
+          "mean_wait": lane.total_wait / lane.queued if lane.queued else 0.0,
+          "max_wait": lane.max_wait
+        }
+        for (priority, lane) in self.lanes.items()
+      }
+    }
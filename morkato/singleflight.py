@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import (
+  Awaitable,
+  Callable,
+  Hashable,
+  Generic,
+  TypeVar,
+  Dict,
+  Any
+)
+import asyncio
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+class SingleFlightCall(Generic[T]):
+  __slots__ = ("task", "waiters")
+  def __init__(self, task: asyncio.Task[T]) -> None:
+    self.task = task
+    self.waiters = 0
+class SingleFlight(Generic[K, T]):
+  def __init__(self) -> None:
+    self.calls: Dict[K, SingleFlightCall[T]] = {}
+    self.executed = 0
+    self.saved = 0
+  def __len__(self) -> int:
+    return len(self.calls)
+  def _forget(self, key: K, call: SingleFlightCall[T]) -> None:
+    if self.calls.get(key) is call:
+      del self.calls[key]
+  def _on_done(self, key: K, call: SingleFlightCall[T], task: asyncio.Task[T]) -> None:
+    self._forget(key, call)
+    if not task.cancelled():
+      # Mark the exception as retrieved even when every waiter already left.
+      task.exception()
+  async def do(self, key: K, factory: Callable[[], Awaitable[T]]) -> T:
+    call = self.calls.get(key)
+    if call is None:
+      task = asyncio.ensure_future(factory())
+      call = self.calls[key] = SingleFlightCall(task)
+      task.add_done_callback(lambda task, call=call: self._on_done(key, call, task))
+      self.executed += 1
+    else:
+      self.saved += 1
+    call.waiters += 1
+    try:
+      return await asyncio.shield(call.task)
+    finally:
+      call.waiters -= 1
+      if call.waiters == 0 and not call.task.done():
+        # The last interested caller was cancelled: nobody will read the result.
+        self._forget(key, call)
+        call.task.cancel()
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "inflight": len(self.calls),
+      "executed": self.executed,
+      "saved": self.saved
+    }
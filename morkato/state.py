@@ -1,35 +1,182 @@
 from __future__ import annotations
-from .utils import CircularDict
+from .errors import (MorkatoException, HTTPException, NotFoundError)
+from .cache import (LRUCache, CacheConfig, CacheStats)
+from .imaging import (ImagePreprocessor, ImageSettings)
 from .http import HTTPClient
+from .scheduler import Priority
 from .guild import Guild
+from .types import GuildChanges
 from typing import (
   Callable,
-  Optional
+  Optional,
+  Union,
+  Dict,
+  Any
 )
+import logging
+import asyncio
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_RETRY_INTERVAL = 600.0
 
 class MorkatoConnectionState:
-  def __init__(self, dispatch: Callable[..., None], *, http: HTTPClient) -> None:
+  def __init__(
+    self, dispatch: Callable[..., None], *,
+    http: HTTPClient,
+    hydrate_guilds: bool = False,
+    image_settings: Optional[ImageSettings] = None,
+    image_preprocessor: Optional[ImagePreprocessor] = None,
+    guild_cache: Optional[CacheConfig] = None,
+    user_cache: Optional[CacheConfig] = None,
+    sync_interval: Optional[float] = None
+  ) -> None:
     self.dispatch = dispatch
     self.http = http
+    self.image_settings = image_settings if image_settings is not None else ImageSettings.from_env()
+    self.image_preprocessor = image_preprocessor if image_preprocessor is not None else ImagePreprocessor()
+    self.hydrate_guilds = hydrate_guilds
+    self.guild_cache = guild_cache if guild_cache is not None else CacheConfig.from_env("MORKATO_GUILD_CACHE", maxlen=32)
+    # Every guild has its own user cache; they all count into one set of stats.
+    self.user_cache = user_cache if user_cache is not None else CacheConfig.from_env("MORKATO_USER_CACHE", maxlen=128)
+    self.user_cache_stats = CacheStats()
+    if sync_interval is None:
+      sync_interval = float(os.getenv("MORKATO_GUILD_SYNC_INTERVAL", "60"))
+    # Zero or less: cached guilds are never synced and only the bot's own writes update them.
+    self.sync_interval = sync_interval if sync_interval > 0 else None
+    self.snapshot_retry_at = 0.0
+    self.changes_retry_at = 0.0
+    self.sync_task: Optional[asyncio.Task[None]] = None
     self.clear()
   def clear(self) -> None:
-    self._guilds: CircularDict[int, Guild] = CircularDict(32)
+    self._guilds: LRUCache[int, Guild] = self.guild_cache.create(weigh=Guild.approximate_size)
   def get_cached_guild(self, id: int) -> Optional[Guild]:
     return self._guilds.get(id)
   def _add_guild(self, guild: Guild) -> None:
     self._guilds[guild.id] = guild
-  async def fetch_guild(self, id: int) -> Guild:
-    payload = await self.http.fetch_guild(id)
-    guild = Guild(self, id, payload)
+  def cache_stats(self) -> Dict[str, Any]:
+    guilds = self._guilds.values()
+    return {
+      "guilds": self._guilds.stats(),
+      "users": dict(
+        self.user_cache_stats.as_dict(),
+        entries = sum(len(guild._users) for guild in guilds),
+        weight = sum(guild._users.weight for guild in guilds)
+      )
+    }
+  async def fetch_guild(self, id: int, *, hydrate: Optional[bool] = None) -> Guild:
+    if hydrate is None:
+      hydrate = self.hydrate_guilds
+    if hydrate:
+      guild = await self.fetch_guild_snapshot(id)
+    else:
+      guild = Guild(self, id, await self.http.fetch_guild(id))
     self._add_guild(guild)
     return guild
+  async def fetch_guild_snapshot(self, id: int) -> Guild:
+    http = self.http
+    snapshot = None
+    if time.monotonic() >= self.snapshot_retry_at:
+      try:
+        snapshot = await http.fetch_guild_snapshot(id)
+      except HTTPException as exc:
+        if isinstance(exc, NotFoundError) or exc.status not in (404, 405, 501):
+          raise
+        # Older APIs have no snapshot route; stop asking for a while instead of paying a round trip each time.
+        self.snapshot_retry_at = time.monotonic() + SNAPSHOT_RETRY_INTERVAL
+        logger.info("API sem rota de snapshot, buscando as coleções da guild %s separadamente", id)
+    cursor = None
+    if snapshot is None:
+      (guild_data, arts, abilities, families) = await asyncio.gather(
+        http.fetch_guild(id),
+        http.fetch_arts(id),
+        http.fetch_abilities(id),
+        http.fetch_families(id)
+      )
+    else:
+      guild_data = snapshot["guild"]
+      arts = snapshot["arts"]
+      abilities = snapshot["abilities"]
+      families = snapshot["families"]
+      # Older APIs send no cursor: the first sync then reloads what it holds.
+      cursor = snapshot.get("cursor")
+    guild = Guild(self, id, guild_data)
+    guild._hydrate(arts, abilities, families)
+    if cursor is not None:
+      guild.sync_cursor = int(cursor)
+    return guild
+  def start_sync(self) -> None:
+    # Cached guilds pick up writes made by other bot instances or straight through the API,
+    # in the background: commands never wait on a sync.
+    if self.sync_interval is None or self.sync_task is not None:
+      return
+    self.sync_task = asyncio.get_running_loop().create_task(self.__sync_loop())
+  async def close(self) -> None:
+    if self.sync_task is not None:
+      self.sync_task.cancel()
+      await asyncio.gather(self.sync_task, return_exceptions=True)
+      self.sync_task = None
+  async def __sync_loop(self) -> None:
+    interval = self.sync_interval
+    assert interval is not None
+    while True:
+      guilds = self._guilds.values()
+      for guild in guilds:
+        try:
+          await self.sync_guild(guild)
+        except Exception:
+          logger.exception("Falha inesperada ao sincronizar a guild %s", guild.id)
+      due = min((guild.synced_at + interval for guild in guilds), default=time.monotonic() + interval)
+      await asyncio.sleep(min(max(due - time.monotonic(), 1.0), interval))
+  async def sync_guild(self, guild: Guild) -> Guild:
+    interval = self.sync_interval
+    if interval is None or time.monotonic() - guild.synced_at < interval:
+      return guild
+    # Marked before the request, so a failing sync waits a whole interval before trying again.
+    guild.synced_at = time.monotonic()
+    try:
+      await guild.sync(priority=Priority.BACKGROUND)
+    except MorkatoException as exc:
+      # A stale guild still answers commands; the next interval tries again.
+      logger.warning("Falha ao sincronizar a guild %s: %s", guild.id, exc)
+    return guild
+  async def fetch_guild_changes(self, id: int, *, since: Optional[int] = None) -> Optional[GuildChanges]:
+    if time.monotonic() < self.changes_retry_at:
+      return None
+    try:
+      return await self.http.fetch_guild_changes(id, since=since)
+    except HTTPException as exc:
+      if isinstance(exc, NotFoundError) or exc.status not in (404, 405, 501):
+        raise
+      self.changes_retry_at = time.monotonic() + SNAPSHOT_RETRY_INTERVAL
+      logger.info("API sem rota de alterações, mantendo as coleções da guild %s em cache", id)
+      return None
   async def upload_image(
-    self, image: bytes, *,
+    self, image: Union[bytes, bytearray], *,
     author_id: int,
     name: str
   ) -> None:
+    image = await self.image_preprocessor.process(image, self.image_settings)
     await self.http.upload_image(
       image=image,
       author_id=author_id,
       name=name
+    )
+  async def upload_image_from_url(
+    self, url: str, *,
+    author_id: int,
+    name: str
+  ) -> None:
+    settings = self.image_settings
+    if settings.enabled:
+      # Decoding needs the whole file, so only preprocessed uploads are buffered.
+      image = await self.image_preprocessor.process(await self.http.download_image(url), settings)
+      await self.http.upload_image(image, author_id=author_id, name=name)
+      return
+    await self.http.upload_image_from_url(
+      url,
+      author_id=author_id,
+      name=name
     )
\ No newline at end of file
@@ -0,0 +1,173 @@
+from __future__ import annotations
+from .pool import (ConnectionPoolConfig, pool_stats, warmup)
+from typing import (
+  AsyncIterable,
+  Optional,
+  Sequence,
+  ClassVar,
+  Mapping,
+  Union,
+  Dict,
+  Any
+)
+import logging
+import asyncio
+import aiohttp
+import os
+
+try:
+  # Optional: the http2 transport needs httpx[http2], see MORKATO_HTTP_TRANSPORT.
+  import httpx
+  import h2 # noqa: F401
+except ImportError:
+  httpx = None
+
+logger = logging.getLogger(__name__)
+
+HAS_HTTP2 = httpx is not None
+Body = Union[bytes, bytearray, memoryview, AsyncIterable[Any], None]
+
+class TransportConnectError(aiohttp.ClientConnectionError):
+  # No connection could be opened, so the request never reached the server.
+  pass
+class Response:
+  __slots__ = ("status", "headers", "body", "version")
+  def __init__(self, status: int, headers: Mapping[str, str], body: bytes, version: str) -> None:
+    self.status = status
+    self.headers = headers
+    self.body = body
+    self.version = version
+  def __repr__(self) -> str:
+    return "<Response status=%s version=%s>" % (self.status, self.version)
+class Transport:
+  name: ClassVar[str]
+  async def request(
+    self, method: str, url: str, *,
+    headers: Mapping[str, Any],
+    data: Body = None,
+    timeout: Optional[float] = None
+  ) -> Response:
+    raise NotImplementedError
+  async def warmup(self, urls: Sequence[str], connections: int) -> int:
+    return 0
+  def stats(self) -> Dict[str, int]:
+    raise NotImplementedError
+  async def close(self) -> None:
+    pass
+class AiohttpTransport(Transport):
+  name = "aiohttp"
+  def __init__(self, session: aiohttp.ClientSession) -> None:
+    # The session belongs to the client, which also uses it for websockets and downloads.
+    self.session = session
+  async def request(
+    self, method: str, url: str, *,
+    headers: Mapping[str, Any],
+    data: Body = None,
+    timeout: Optional[float] = None
+  ) -> Response:
+    kwargs: Dict[str, Any] = {}
+    if timeout is not None:
+      # Only the total is per request; the pool's connect timeout and the rest still apply.
+      base = self.session.timeout
+      kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout, connect=base.connect, sock_read=base.sock_read, sock_connect=base.sock_connect)
+    async with self.session.request(method, url, headers=headers, data=data, **kwargs) as response:
+      body = await response.read()
+    return Response(response.status, response.headers, body, "HTTP/%s.%s" % response.version)
+  async def warmup(self, urls: Sequence[str], connections: int) -> int:
+    return await warmup(self.session, urls, connections)
+  def stats(self) -> Dict[str, int]:
+    return pool_stats(self.session.connector)
+class HTTP2Transport(Transport):
+  name = "http2"
+  def __init__(
+    self, pool: ConnectionPoolConfig, *,
+    prior_knowledge: bool = True,
+    unix_socket: Optional[str] = None
+  ) -> None:
+    if httpx is None:
+      raise RuntimeError("The http2 transport needs httpx[http2] installed")
+    self.pool = pool
+    # Without TLS there is no ALPN: plain http:// only speaks HTTP/2 when the client assumes it.
+    self.prior_knowledge = prior_knowledge
+    self.transport = httpx.AsyncHTTPTransport(
+      http1 = not prior_knowledge,
+      http2 = True,
+      uds = unix_socket,
+      limits = httpx.Limits(
+        max_connections = pool.limit,
+        max_keepalive_connections = pool.limit,
+        keepalive_expiry = pool.keepalive_timeout
+      )
+    )
+    self.client = httpx.AsyncClient(
+      transport = self.transport,
+      timeout = httpx.Timeout(None, connect=pool.connect_timeout)
+    )
+  async def request(
+    self, method: str, url: str, *,
+    headers: Mapping[str, Any],
+    data: Body = None,
+    timeout: Optional[float] = None
+  ) -> Response:
+    if isinstance(data, (bytearray, memoryview)):
+      # httpx iterates anything that is not bytes, which would send a bytearray one int at a time.
+      data = bytes(data)
+    try:
+      if timeout is None:
+        return await self._request(method, url, headers, data)
+      return await asyncio.wait_for(self._request(method, url, headers, data), timeout)
+    except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
+      raise TransportConnectError(str(exc)) from exc
+    except httpx.TimeoutException:
+      raise asyncio.TimeoutError from None
+    except httpx.TransportError as exc:
+      raise aiohttp.ClientConnectionError(str(exc)) from exc
+  async def _request(self, method: str, url: str, headers: Mapping[str, Any], data: Body) -> Response:
+    headers = {key: str(value) for (key, value) in headers.items()}
+    async with self.client.stream(method, url, headers=headers, content=data) as response:
+      # Raw bytes: decoding stays with the compression policy, as with aiohttp.
+      body = b"".join([chunk async for chunk in response.aiter_raw()])
+    return Response(response.status_code, response.headers, body, response.http_version)
+  async def warmup(self, urls: Sequence[str], connections: int) -> int:
+    # Every request to a host shares one connection, so one handshake per host is enough.
+    async def touch(url: str) -> bool:
+      try:
+        await self._request("HEAD", url, {}, None)
+        return True
+      except (httpx.HTTPError, OSError) as exc:
+        logger.warning("Falha ao aquecer conexão com %s: %s", url, exc)
+        return False
+    results = await asyncio.gather(*(touch(url) for url in urls))
+    return sum(results)
+  def stats(self) -> Dict[str, int]:
+    # httpcore has no public gauges either; these read the pool's bookkeeping.
+    pool = getattr(self.transport, "_pool", None)
+    connections = getattr(pool, "connections", [])
+    requests = getattr(pool, "_requests", [])
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+      "idle": idle,
+      "active": len(connections) - idle,
+      "waiting": sum(1 for request in requests if request.is_queued()),
+      "limit": self.pool.limit
+    }
+  async def close(self) -> None:
+    await self.client.aclose()
+def create_transport(
+  name: Optional[str], *,
+  session: aiohttp.ClientSession,
+  pool: ConnectionPoolConfig,
+  unix_socket: Optional[str] = None
+) -> Transport:
+  if name is None:
+    name = os.getenv("MORKATO_HTTP_TRANSPORT", AiohttpTransport.name)
+  name = name.strip().lower()
+  if name == AiohttpTransport.name:
+    return AiohttpTransport(session)
+  if name == HTTP2Transport.name:
+    if not HAS_HTTP2:
+      logger.warning("httpx[http2] não está instalado, usando o transporte aiohttp")
+      return AiohttpTransport(session)
+    prior_knowledge = os.getenv("MORKATO_HTTP2_PRIOR_KNOWLEDGE", "1").lower() not in ("0", "false", "no")
+    return HTTP2Transport(pool, prior_knowledge=prior_knowledge, unix_socket=unix_socket)
+  raise ValueError("Unknown HTTP transport: %s" % name)
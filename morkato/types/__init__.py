@@ -74,6 +74,25 @@ class Family(TypedDict):
   description: Optional[str]
   banner: Optional[str]
   abilities: List[str]
+class GuildSnapshot(TypedDict):
+  cursor: str
+  guild: Guild
+  arts: List[Art]
+  abilities: List[Ability]
+  families: List[Family]
+class GuildChangesDeleted(TypedDict):
+  arts: List[str]
+  attacks: List[str]
+  abilities: List[str]
+  families: List[str]
+class GuildChanges(TypedDict):
+  cursor: str
+  reset: bool
+  arts: List[Art]
+  attacks: List[Attack]
+  abilities: List[Ability]
+  families: List[Family]
+  deleted: GuildChangesDeleted
 class User(TypedDict):
   guild_id: str
   id: str
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from .errors import ImageTooLargeError
+from typing import (
+  AsyncIterable,
+  AsyncIterator,
+  Optional,
+  Union,
+  Tuple,
+  IO
+)
+import tempfile
+import os
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+MAX_NAME_LENGTH = 32
+# Same ceiling as the CDN (CdnApiController.MAX_IMAGE_LENGTH); anything above it would be refused after the transfer.
+MAX_IMAGE_SIZE = int(os.getenv("MORKATO_MAX_IMAGE_SIZE", str(50 * 1024 * 1024)))
+
+def image_header(author_id: int, name: str) -> bytes:
+  encoded = name.encode("utf-8")
+  if len(encoded) > MAX_NAME_LENGTH:
+    raise ValueError("Image name must be at most %s bytes long" % MAX_NAME_LENGTH)
+  return b"".join((author_id.to_bytes(8, byteorder="big"), len(encoded).to_bytes(4, byteorder="big"), encoded))
+def check_size(size: Optional[int], max_size: int) -> None:
+  if size is not None and size > max_size:
+    raise ImageTooLargeError(size, max_size)
+async def iter_buffer(image: Buffer, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[memoryview]:
+  # Slices of a memoryview share the image's memory; nothing is copied on our side.
+  view = memoryview(image)
+  for offset in range(0, len(view), chunk_size):
+    yield view[offset:offset + chunk_size]
+async def iter_file(file: IO[bytes], chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+  while True:
+    chunk = file.read(chunk_size)
+    if not chunk:
+      return
+    yield chunk
+async def spool(chunks: AsyncIterable[Buffer], *, max_size: int) -> Tuple[IO[bytes], int]:
+  # Kept in memory up to SPOOL_SIZE, then rolled over to a temporary file.
+  file = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+  size = 0
+  try:
+    async for chunk in chunks:
+      size += len(chunk)
+      check_size(size, max_size)
+      file.write(chunk)
+  except BaseException:
+    file.close()
+    raise
+  file.seek(0)
+  return (file, size) # type: ignore
+async def stream_image(header: bytes, chunks: AsyncIterable[Buffer], *, size: int, max_size: int) -> AsyncIterator[Buffer]:
+  yield header
+  received = 0
+  async for chunk in chunks:
+    received += len(chunk)
+    # A source that sends more than it announced is cut off instead of overrunning Content-Length.
+    check_size(received, min(size, max_size))
+    yield chunk
+  if received != size:
+    raise ValueError("Image stream ended after %s of %s bytes" % (received, size))
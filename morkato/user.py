@@ -12,7 +12,9 @@ from typing_extensions import Self
 from typing import (
   TYPE_CHECKING,
   Optional,
-  ClassVar
+  ClassVar,
+  Dict,
+  Any
 )
 if TYPE_CHECKING:
   from .state import MorkatoConnectionState
@@ -39,7 +41,7 @@ class User:
     self.state = state
     self.http  = state.http
     self.guild = guild
-    self.id = int(payload["id"])
+    self.id = payload["id"]
     self.from_payload(payload)
   def from_payload(self, payload: UserPayload) -> None:
     self.type = payload["type"]
@@ -49,8 +51,8 @@ class User:
     self.prodigy_roll = payload["prodigy_roll"]
     self.mark_roll = payload["mark_roll"]
     self.berserk_roll = payload["berserk_roll"]
-    self.abilities_id = [int(id) for id in payload["abilities"]]
-    self.families_id = [int(id) for id in payload["families"]]
+    self.abilities_id = list(payload["abilities"])
+    self.families_id = list(payload["families"])
   async def update(
     self, *,
     flags: Optional[int] = None,
@@ -58,7 +60,8 @@ class User:
     family_roll: Optional[int] = None,
     prodigy_roll: Optional[int] = None,
     mark_roll: Optional[int] = None,
-    berserk_roll: Optional[int] = None
+    berserk_roll: Optional[int] = None,
+    write_behind: bool = False
   ) -> Self:
     kwargs = NoNullDict(
       flags = flags,
@@ -69,15 +72,22 @@ class User:
       berserk_roll = berserk_roll
     )
     if kwargs:
-      payload = await self.http.update_user(self.guild.id, self.id, **kwargs)
-      self.from_payload(payload)
+      payload = await self.http.update_user(self.guild.id, self.id, write_behind=write_behind, **kwargs)
+      if payload is None:
+        # Deferred to the write journal: shown locally until the replay reaches the API.
+        self._apply(kwargs)
+      else:
+        self.from_payload(payload)
     return self
+  def _apply(self, changes: Dict[str, Any]) -> None:
+    for (key, value) in changes.items():
+      setattr(self, key, UserFlags(value) if key == "flags" else value)
   async def delete(self) -> None:
     await self.http.delete_user(self.guild.id, self.id)
     self.guild._users.pop(self.id, None)
-  async def sync_ability(self, ability: Snowflake) -> None:
-    await self.http.registry_user_ability(self.guild.id, self.id, ability.id)
+  async def sync_ability(self, ability: Snowflake, *, write_behind: bool = False) -> None:
+    await self.http.registry_user_ability(self.guild.id, self.id, ability.id, write_behind=write_behind)
     self.abilities_id.append(ability.id)
-  async def sync_family(self, family: Snowflake) -> None:
-    await self.http.registry_user_family(self.guild.id, self.id, family.id)
+  async def sync_family(self, family: Snowflake, *, write_behind: bool = False) -> None:
+    await self.http.registry_user_family(self.guild.id, self.id, family.id, write_behind=write_behind)
     self.families_id.append(family.id)
\ No newline at end of file
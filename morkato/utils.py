@@ -13,6 +13,7 @@ from .abc import (
   UnresolvedSnowflakeList,
   Snowflake
 )
+from .singleflight import SingleFlight
 from collections import OrderedDict
 from types import MappingProxyType
 from datetime import datetime
@@ -37,15 +38,6 @@ class _MissingSpecialType:
     return "<Missing ...>"
 MISSING: Any = _MissingSpecialType()
 del _MissingSpecialType
-class CircularDict(OrderedDict[K, V]):
-  def __init__(self, maxlen: int) -> None:
-    self.maxlen = maxlen
-  def __getitem__(self, key: K) -> V:
-    return OrderedDict.__getitem__(self, key)
-  def __setitem__(self, key: K, value: V) -> None:
-    OrderedDict.__setitem__(self, key, value)
-    if len(self) > self.maxlen:
-      self.popitem(last=False)
 class NoNullDict(OrderedDict[K, V]):
   def __setitem__(self, key: K, value: V) -> None:
     if value is None:
@@ -53,6 +45,8 @@ class NoNullDict(OrderedDict[K, V]):
     super().__setitem__(key, value)
 class UnresolvedSnowflakeListImpl(UnresolvedSnowflakeList[T_SNOWFLAKE]):
   def __init__(self) -> None:
+    self.__generation = 0
+    self.__flight: SingleFlight[int, None] = SingleFlight()
     self.clear()
   def __iter__(self) -> Iterator[T]:
     return iter(self.items.values())
@@ -61,27 +55,58 @@ class UnresolvedSnowflakeListImpl(UnresolvedSnowflakeList[T_SNOWFLAKE]):
   def clear(self) -> None:
     self.items: Dict[int, T_SNOWFLAKE] = {}
     self.__already_loaded = False
+    # A resolve started before this point must not publish into the cleared list.
+    self.__generation += 1
+    self.__pending: Optional[List[Tuple[bool, T_SNOWFLAKE]]] = None
   def order(self) -> List[T]:
     return sorted(self, key=lambda item: item.id)
   def already_loaded(self) -> bool:
     return self.__already_loaded
-  async def resolve_impl(self) -> None:
+  async def resolve_impl(self) -> Iterable[T_SNOWFLAKE]:
     raise NotImplementedError
   async def resolve(self) -> None:
+    # Concurrent callers share one fetch; a clear() mid-flight sends them after a fresh one.
+    while not self.__already_loaded:
+      await self.__flight.do(self.__generation, self.__resolve)
+  async def __resolve(self) -> None:
+    # Owned by this flight: a clear() or a newer flight replaces it.
+    pending: List[Tuple[bool, T_SNOWFLAKE]] = []
+    self.__pending = pending
     try:
-      if self.already_loaded():
-        return None
-      self.__already_loaded = True
-      return await self.resolve_impl()
-    except Exception as exc:
-      self.clear()
-      raise exc
+      objects = await self.resolve_impl()
+    except BaseException:
+      # Nothing was published, so the next resolve simply tries again.
+      if self.__pending is pending:
+        self.__pending = None
+      raise
+    if self.__pending is not pending:
+      return
+    self.__pending = None
+    # No await from here on: other tasks see the list empty or complete, never half-filled.
+    if not self.__already_loaded:
+      self.load(objects)
+    # Local writes made while the fetch was in flight may be missing from it.
+    for (added, object) in pending:
+      existing = self.get(object.id)
+      if existing is not None:
+        self.remove(existing)
+      if added:
+        self.add(object)
+  def load(self, objects: Iterable[T], /) -> None:
+    self.__already_loaded = True
+    for object in objects:
+      self.add(object)
   def add(self, object: T, /) -> None:
     if self.__already_loaded:
       self.items[object.id] = object
+    elif self.__pending is not None:
+      self.__pending.append((True, object))
   def remove(self, object: Snowflake, /) -> Optional[T]:
     if self.__already_loaded:
       return self.items.pop(object.id, None)
+    if self.__pending is not None:
+      self.__pending.append((False, object))
+    return None
   def get(self, id: int, /) -> Optional[T]:
     if not self.__already_loaded:
       return None
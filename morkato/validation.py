@@ -0,0 +1,193 @@
+from __future__ import annotations
+from .errors import SchemaValidationError
+from decimal import (Decimal, InvalidOperation)
+from typing import (
+  Optional,
+  Mapping,
+  Tuple,
+  Dict,
+  Any
+)
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Java's `.` stops at every line terminator, not only "\n".
+ANY = "[^\n\r\u0085\u2028\u2029]"
+
+def java_length(value: str) -> int:
+  # @Length counts UTF-16 code units, so characters outside the BMP weigh two.
+  return len(value.encode("utf-16-le")) // 2
+class Rule:
+  __slots__ = ("schema",)
+  def __init__(self, schema: str) -> None:
+    self.schema = schema
+  def __repr__(self) -> str:
+    return "<%s schema=%s>" % (type(self).__name__, self.schema)
+  def check(self, value: Any) -> Optional[str]:
+    raise NotImplementedError
+class Pattern(Rule):
+  __slots__ = ("regex", "min_length", "max_length")
+  def __init__(self, schema: str, regex: str, *, min_length: Optional[int] = None, max_length: Optional[int] = None) -> None:
+    super().__init__(schema)
+    # ASCII keeps \s to the six characters Java's \s matches.
+    self.regex = re.compile(regex, re.ASCII)
+    self.min_length = min_length
+    self.max_length = max_length
+  def check(self, value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+      return "expected a string"
+    if self.min_length is not None and self.max_length is not None:
+      length = java_length(value)
+      if length < self.min_length or length > self.max_length:
+        return "length must be between %s and %s" % (self.min_length, self.max_length)
+    # @Pattern uses Matcher.matches(): the whole value has to match.
+    if self.regex.fullmatch(value) is None:
+      return "must match %s" % self.regex.pattern
+    return None
+class Digits(Rule):
+  __slots__ = ("integer", "fraction")
+  def __init__(self, schema: str, integer: int, fraction: int = 0) -> None:
+    super().__init__(schema)
+    self.integer = integer
+    self.fraction = fraction
+  def check(self, value: Any) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, Decimal)):
+      return "expected a number"
+    try:
+      # repr is what goes on the wire, so 1.0 keeps the fraction digit the API counts.
+      number = Decimal(repr(value) if isinstance(value, float) else value)
+    except InvalidOperation:
+      return "expected a number"
+    if not number.is_finite():
+      return "expected a number"
+    (_, digits, exponent) = number.as_tuple()
+    integer = len(digits) + exponent # type: ignore
+    fraction = max(-exponent, 0) # type: ignore
+    if integer > self.integer or fraction > self.fraction:
+      return "must have at most %s integer and %s fraction digits" % (self.integer, self.fraction)
+    return None
+class PayloadSchema:
+  __slots__ = ("fields", "required")
+  def __init__(self, fields: Mapping[str, Rule], *, required: Tuple[str, ...] = ()) -> None:
+    self.fields: Tuple[Tuple[str, Rule], ...] = tuple(fields.items())
+    self.required = required
+  def validate(self, payload: Mapping[str, Any]) -> None:
+    for key in self.required:
+      if payload.get(key) is None:
+        raise SchemaValidationError(key, None, "NotNull", "must not be null")
+    # Like Bean Validation, absent values are only checked by NotNull.
+    for (key, rule) in self.fields:
+      value = payload.get(key)
+      if value is None:
+        continue
+      reason = rule.check(value)
+      if reason is not None:
+        raise SchemaValidationError(key, value, rule.schema, reason)
+# Mirrors api/src/main/java/morkato/api/dto/validation; keep both sides in step.
+NAME = Pattern("NameSchema", r"^[^:0-9\s\/][^:\/]{1,31}$", min_length=2, max_length=32)
+NAME_PREFIX_ART = Pattern("NamePrefixArtSchema", r"^[^\s]" + ANY + "{1,31}$", min_length=2, max_length=32)
+DESCRIPTION = Pattern("DescriptionSchema", r"^[^\s]" + ANY + "{0,2047}$", min_length=1, max_length=2048)
+# In the Java source "\s" inside the cdn:// class is a string escape for a plain space, not the regex class.
+BANNER = Pattern(
+  "BannerSchema",
+  r"^(https?://)(?:www\.)?[a-zA-Z0-9\-\.]{1,255}(?:/[a-zA-Z0-9\-\._~:\/?#\[\]@!$&'()*+,;=]{0,255})?|cdn://[0-9]{15,30}/[^:0-9 \/]{2,32}$"
+)
+ATTR = Digits("AttrSchema", 12)
+ENERGY = Digits("Digits", 3)
+ART_UPDATE = PayloadSchema({
+  "name": NAME,
+  "description": DESCRIPTION,
+  "banner": BANNER,
+  "energy": ENERGY,
+  "life": ATTR,
+  "breath": ATTR,
+  "blood": ATTR
+})
+# ArtCreateData has no NameSchema: its name, like its type, is only @NotNull.
+ART_CREATE = PayloadSchema({key: rule for (key, rule) in ART_UPDATE.fields if key != "name"}, required=("name", "type"))
+ATTACK_UPDATE = PayloadSchema({
+  "name": NAME,
+  "name_prefix_art": NAME_PREFIX_ART,
+  "description": DESCRIPTION,
+  "banner": BANNER,
+  "wisteria_turn": ATTR,
+  "poison_turn": ATTR,
+  "burn_turn": ATTR,
+  "bleed_turn": ATTR,
+  "wisteria": ATTR,
+  "poison": ATTR,
+  "burn": ATTR,
+  "bleed": ATTR,
+  "stun": ATTR,
+  "damage": ATTR,
+  "breath": ATTR,
+  "blood": ATTR
+})
+ATTACK_CREATE = PayloadSchema(dict(ATTACK_UPDATE.fields), required=("name",))
+ABILITY_UPDATE = PayloadSchema({
+  "name": NAME,
+  "description": DESCRIPTION,
+  "banner": BANNER
+})
+ABILITY_CREATE = PayloadSchema(dict(ABILITY_UPDATE.fields), required=("name",))
+FAMILY_UPDATE = ABILITY_UPDATE
+FAMILY_CREATE = ABILITY_CREATE
+ROUTES: Dict[str, PayloadSchema] = {
+  "POST /arts/{gid}": ART_CREATE,
+  "PUT /arts/{guild_id}/{id}": ART_UPDATE,
+  "POST /attacks/{guild_id}/{art_id}": ATTACK_CREATE,
+  "PUT /attacks/{guild_id}/{id}": ATTACK_UPDATE,
+  "POST /abilities/{guild_id}": ABILITY_CREATE,
+  "PUT /abilities/{guild_id}/{id}": ABILITY_UPDATE,
+  "POST /families/{guild_id}": FAMILY_CREATE,
+  "PUT /families/{guild_id}/{id}": FAMILY_UPDATE
+}
+class RouteValidation:
+  __slots__ = ("checked", "rejected", "fields")
+  def __init__(self) -> None:
+    self.checked = 0
+    self.rejected = 0
+    self.fields: Dict[str, int] = {}
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "checked": self.checked,
+      "rejected": self.rejected,
+      "rejection_rate": self.rejected / self.checked if self.checked else 0.0,
+      "fields": dict(self.fields)
+    }
+class ValidationPolicy:
+  def __init__(self, *, routes: Optional[Mapping[str, PayloadSchema]] = ROUTES) -> None:
+    self.routes: Mapping[str, PayloadSchema] = routes if routes is not None else {}
+    self.route_stats: Dict[str, RouteValidation] = {}
+    self.checked = 0
+    self.rejected = 0
+  def get_route(self, key: str) -> RouteValidation:
+    route = self.route_stats.get(key)
+    if route is None:
+      route = self.route_stats[key] = RouteValidation()
+    return route
+  def validate(self, key: str, payload: Mapping[str, Any]) -> None:
+    schema = self.routes.get(key)
+    if schema is None:
+      return
+    route = self.get_route(key)
+    route.checked += 1
+    self.checked += 1
+    try:
+      schema.validate(payload)
+    except SchemaValidationError as exc:
+      # Each rejection here is a round trip the API would have answered with a 400.
+      route.rejected += 1
+      route.fields[exc.field] = route.fields.get(exc.field, 0) + 1
+      self.rejected += 1
+      logger.debug("%s rejeitado localmente: %s", key, exc)
+      raise
+  def stats(self) -> Dict[str, Any]:
+    return {
+      "checked": self.checked,
+      "rejected": self.rejected,
+      "rejection_rate": self.rejected / self.checked if self.checked else 0.0,
+      "routes": {key: route.stats() for (key, route) in self.route_stats.items()}
+    }
@@ -9,10 +9,14 @@ from .errors import (ExtensionInvokeError, ConverterInvokeError, ValueNotInjecte
 from .extension import (ErrorCallback, Extension, Converter)
 from .core import (MorkatoCommandTree, MessageBuilder)
 from .context import MorkatoContext
+from morkato.deadline import deadline
+from contextlib import nullcontext
 from typing import (
   get_origin,
   get_args,
+  ContextManager,
   Optional,
+  Callable,
   TypeVar,
   Union,
   Type,
@@ -22,6 +26,7 @@ from typing import (
 import discord.utils
 import discord
 import logging
+import os
 
 _log = logging.getLogger(__name__)
 T = TypeVar('T')
@@ -46,6 +51,13 @@ class MorkatoBot(Bot):
     self.morkconverters: Dict[Type[Any], Converter[Any]] = {}
     self.morkcatching = catching
     self.injected = injected
+    # Kept under Discord's 3s window to acknowledge an interaction, so a slow API surfaces
+    # as an error the user can see instead of "The application did not respond".
+    self.command_deadline = float(os.getenv("MORKATO_COMMAND_DEADLINE", "2.5"))
+  def command_scope(self, acknowledged: Callable[[], bool]) -> ContextManager[Any]:
+    if self.command_deadline <= 0:
+      return nullcontext()
+    return deadline(self.command_deadline, until=acknowledged)
   async def get_context(self, origin: Union[discord.Message, discord.Interaction], /) -> MorkatoContext:
     return await super().get_context(origin, cls=MorkatoContext)
   async def _async_setup_hook(self) -> None:
@@ -238,6 +238,11 @@ class BotBuilder:
       bot.morkextensions[extension.__extension_name__] = extension
       _log.info("Success to load extension: %s.%s %s values injected.", extension.__module__, type(extension).__name__, injected)
 class MorkatoCommandTree(apc.CommandTree[MorkatoBotT]):
+  async def _call(self, interaction: Interaction[MorkatoBotT]) -> None:
+    # Only until the interaction is acknowledged: after a defer the user already sees a
+    # response coming, and the API calls fall back to their route timeouts.
+    with self.client.command_scope(interaction.response.is_done):
+      await super()._call(interaction)
   async def on_error(self, interaction: Interaction[MorkatoBotT], exception: apc.AppCommandError):
     ctx = await interaction.client.get_context(interaction)
     base_exception: Optional[Exception] = None
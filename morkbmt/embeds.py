@@ -1,6 +1,10 @@
 from __future__ import annotations
 from typing import (
-  Dict
+  AsyncIterator,
+  Generic,
+  TypeVar,
+  Dict,
+  List
 )
 from discord import (
   Interaction,
@@ -9,11 +13,41 @@ from discord import (
   ui
 )
 
+T = TypeVar('T')
+
 class EmbedBuilder:
   async def build(self, page: int) -> Embed:
     raise NotImplementedError
   def length(self) -> int:
     return 1
+class StreamEmbedBuilder(EmbedBuilder, Generic[T]):
+  def __init__(self, stream: AsyncIterator[T], *, chunk_size: int) -> None:
+    self.stream = stream
+    self.chunk_size = chunk_size
+    self.pages: List[List[T]] = []
+    self.exhausted = False
+  async def build_page(self, page: int, items: List[T]) -> Embed:
+    raise NotImplementedError
+  async def fetch_page(self, page: int) -> List[T]:
+    # Only pulls as many items from the stream as the requested page needs.
+    while len(self.pages) <= page and not self.exhausted:
+      chunk: List[T] = []
+      try:
+        while len(chunk) < self.chunk_size:
+          chunk.append(await self.stream.__anext__())
+      except StopAsyncIteration:
+        self.exhausted = True
+      if chunk:
+        self.pages.append(chunk)
+    if page < len(self.pages):
+      return self.pages[page]
+    if page == 0:
+      return []
+    raise StopAsyncIteration
+  async def build(self, page: int) -> Embed:
+    return await self.build_page(page, await self.fetch_page(page))
+  def length(self) -> int:
+    return -1
 class EmbedBuilderView(ui.View):
   ARROWLEFT = '⬅️'
   ARROWRIGHT = '➡️'
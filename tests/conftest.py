@@ -0,0 +1,39 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Latency)
+from morkato.state import MorkatoConnectionState
+from morkato.retry import RetryPolicy
+from morkato.http import HTTPClient
+from typing import (
+  Awaitable,
+  Callable,
+  Optional,
+  Dict,
+  Any
+)
+import asyncio
+import pytest
+
+StandInTest = Callable[[FakeMorkatoAPI, str, MorkatoConnectionState], Awaitable[Any]]
+
+@pytest.fixture
+def stand_in() -> Callable[..., None]:
+  # Runs a test against a populated stand-in API: one guild, 40 abilities, 10 arts and families.
+  def run(test: StandInTest, *, client: Optional[Dict[str, Any]] = None, **options: Any) -> None:
+    async def main() -> None:
+      options.setdefault("latency", Latency("constant", 0.005))
+      api = FakeMorkatoAPI(seed=0, **options)
+      (guild_id,) = api.populate(guilds=1, arts=10, attacks=2, abilities=40, families=10, users=1)
+      # Retries and the breaker would hide how many requests the client itself sends.
+      client_options: Dict[str, Any] = {"coalesce_gets": False, "retry_policy": RetryPolicy(max_retries=0, breaker_threshold=10 ** 9)}
+      if client is not None:
+        client_options.update(client)
+      http = HTTPClient(base_url=await api.start(), **client_options)
+      await http.static_login()
+      state = MorkatoConnectionState(lambda *args: None, http=http, hydrate_guilds=False, sync_interval=0)
+      try:
+        await test(api, guild_id, state)
+      finally:
+        await state.close()
+        await http.close()
+        await api.close()
+    asyncio.run(main())
+  return run
@@ -0,0 +1,48 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Faults, Latency)
+from morkato.state import MorkatoConnectionState
+from morkato.errors import MorkatoException
+from morkato.adaptive import AIMDLimiter
+from morkato.pool import ConnectionPoolConfig
+from typing import Callable
+import asyncio
+import pytest
+
+CLIENTS = 64
+FAILING = 30
+ROUNDS = 20
+
+def run(stand_in: Callable[..., None], test: Callable[[FakeMorkatoAPI, str, MorkatoConnectionState, AIMDLimiter], object]) -> None:
+  limiter = AIMDLimiter(initial_limit=8, max_limit=CLIENTS)
+  client = {
+    "max_concurrency": CLIENTS,
+    "max_ratelimit_retries": 0,
+    "pool": ConnectionPoolConfig(limit=CLIENTS, limit_per_host=CLIENTS),
+    "adaptive_concurrency": limiter
+  }
+  async def wrapped(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    await test(api, guild_id, state, limiter)
+  # Slow enough that loopback jitter stays well under the limiter's latency tolerance.
+  stand_in(wrapped, client=client, latency=Latency("constant", 0.02))
+async def rounds(state: MorkatoConnectionState, guild_id: str, limiter: AIMDLimiter) -> None:
+  # Each round keeps exactly the current limit in flight, which is what lets it grow.
+  for _ in range(ROUNDS):
+    await asyncio.gather(*(state.http.fetch_guild(int(guild_id)) for _ in range(int(limiter.limit))))
+@pytest.mark.parametrize("faults", [Faults(ratelimit_rate=1.0), Faults(error_rate=1.0)], ids=["429", "503"])
+def test_backs_off_on_failures_and_recovers(stand_in: Callable[..., None], faults: Faults) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState, limiter: AIMDLimiter) -> None:
+    await rounds(state, guild_id, limiter)
+    decreases = limiter.decreases
+    api.faults = faults
+    for _ in range(FAILING):
+      with pytest.raises(MorkatoException):
+        await state.http.fetch_guild(int(guild_id))
+    assert limiter.decreases > decreases
+    assert limiter.limit == limiter.min_limit
+    assert state.http.scheduler.limit == limiter.min_limit
+    api.faults = Faults()
+    increases = limiter.increases
+    await rounds(state, guild_id, limiter)
+    assert limiter.increases > increases
+    assert limiter.limit >= limiter.min_limit + 2
+    assert state.http.scheduler.limit == int(limiter.limit)
+  run(stand_in, test)
@@ -0,0 +1,70 @@
+from morkato.bulk import (BulkPolicy, fan_out)
+from morkato.state import MorkatoConnectionState
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.errors import BulkWriteError
+from typing import (
+  Callable,
+  List,
+  Dict,
+  Any
+)
+import asyncio
+import pytest
+
+BULK_ROUTE = "POST /abilities/{guild_id}/bulk"
+SINGLE_ROUTE = "POST /abilities/{guild_id}"
+
+def bulk_requests(api: FakeMorkatoAPI) -> int:
+  # Without the route the stand-in counts the request under its raw path.
+  return sum(count for (key, count) in api.requests.items() if key.startswith("POST /abilities/") and key.endswith("/bulk"))
+def abilities(count: int) -> List[Dict[str, Any]]:
+  return [{"name": "Habilidade %s" % idx, "percent": 1, "user_type": 1} for idx in range(count)]
+def test_bulk_routes_take_batches(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id), hydrate=True)
+    created = await guild.create_abilities(abilities(250))
+    assert [ability.name for ability in created] == [payload["name"] for payload in abilities(250)]
+    assert (bulk_requests(api), api.requests[SINGLE_ROUTE]) == (3, 0)
+    assert all(guild.abilities.get(ability.id) is ability for ability in created)
+    assert len(guild.abilities) == 40 + 250
+  stand_in(test, client={"bulk_policy": BulkPolicy(batch_size=100)})
+def test_missing_bulk_route_fans_out_in_order(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    created = [payload async for payload in http.bulk_create_abilities(int(guild_id), abilities(20), concurrency=4)]
+    assert [payload["name"] for payload in created] == [payload["name"] for payload in abilities(20)]
+    assert (bulk_requests(api), api.requests[SINGLE_ROUTE]) == (1, 20)
+    assert http.bulk_policy.stats()["unsupported"] == [BULK_ROUTE]
+    # Only asked once: the next seed goes straight to single requests.
+    [payload async for payload in http.bulk_create_abilities(int(guild_id), abilities(5))]
+    assert (bulk_requests(api), api.requests[SINGLE_ROUTE]) == (1, 25)
+  stand_in(test, bulk=False, client={"bulk_policy": BulkPolicy()})
+def test_fan_out_bounds_concurrency_and_reports_what_landed() -> None:
+  async def main() -> None:
+    inflight = 0
+    peak = 0
+    landed: List[int] = []
+    async def call(item: int) -> int:
+      nonlocal inflight, peak
+      inflight += 1
+      peak = max(peak, inflight)
+      try:
+        await asyncio.sleep(0)
+        if item == 3:
+          raise ValueError(item)
+        landed.append(item)
+        return item * 10
+      finally:
+        inflight -= 1
+    results: List[int] = []
+    with pytest.raises(BulkWriteError) as exc:
+      async for result in fan_out(list(range(10)), call, 4, offset=100):
+        results.append(result)
+    assert results == [0, 10, 20]
+    assert peak == 4
+    assert exc.value.index == 103
+    assert isinstance(exc.value.error, ValueError)
+    # Calls already sent when item 3 failed still land and are reported in order; the rest never run.
+    assert exc.value.created == [item * 10 for item in sorted(landed) if item > 3]
+    assert len(landed) < 9
+  asyncio.run(main())
@@ -0,0 +1,61 @@
+from morkato.cache import LRUCache
+from typing import List
+import morkato.cache
+import pytest
+
+class Clock:
+  def __init__(self) -> None:
+    self.now = 1000.0
+  def monotonic(self) -> float:
+    return self.now
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+  clock = Clock()
+  monkeypatch.setattr(morkato.cache, "time", clock)
+  return clock
+def test_least_recently_used_is_evicted_first() -> None:
+  cache: LRUCache[str, int] = LRUCache(3)
+  for (key, value) in (("a", 1), ("b", 2), ("c", 3)):
+    cache[key] = value
+  assert cache.get("a") == 1
+  cache["d"] = 4
+  assert list(cache) == ["c", "a", "d"]
+  assert "b" not in cache
+  assert cache.counters.as_dict()["evictions"] == 1
+  # Overwriting refreshes without evicting.
+  cache["c"] = 30
+  assert list(cache) == ["a", "d", "c"]
+  assert cache.counters.as_dict()["evictions"] == 1
+def test_entries_expire_after_their_ttl(clock: Clock) -> None:
+  cache: LRUCache[str, int] = LRUCache(ttl=10.0)
+  cache["a"] = 1
+  clock.now += 5
+  cache["b"] = 2
+  assert cache.get("a") == 1
+  clock.now += 6
+  # Reading does not extend the lifetime, only writing does.
+  assert cache.get("a") is None
+  assert cache.values() == [2]
+  clock.now += 5
+  assert cache.expire() == 1
+  assert len(cache) == 0
+  stats = cache.counters.as_dict()
+  assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 2)
+def test_weight_limit_evicts_oldest_and_tracks_growth() -> None:
+  cache: LRUCache[str, List[int]] = LRUCache(max_weight=10, weigh=len)
+  cache["a"] = [0] * 4
+  cache["b"] = [0] * 4
+  assert cache.weight == 8
+  grown = cache["b"]
+  grown.extend([0] * 3)
+  # The growth is only noticed when the entry is read again.
+  assert cache.weight == 8
+  assert cache.get("b") is grown
+  assert list(cache) == ["b"]
+  assert cache.weight == 7
+  # The newest entry stays even when it alone is over the limit.
+  cache["c"] = [0] * 20
+  assert list(cache) == ["c"]
+  assert cache.weight == 20
+  assert cache.counters.as_dict()["evictions"] == 2
@@ -0,0 +1,38 @@
+from morkato.codec import (ART, FAMILY, SNAPSHOT, CHANGES, dumps)
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.state import MorkatoConnectionState
+from typing import Callable
+
+def test_snowflakes_are_decoded_once_as_ints() -> None:
+  art = ART.loads(dumps({
+    "id": "288230376151711744", "guild_id": "1", "name": "Água", "type": "RESPIRATION",
+    "attacks": [{"id": "288230376151711745", "guild_id": "1", "art_id": "288230376151711744", "name": "Corte"}]
+  }))
+  assert art["id"] == 288230376151711744
+  assert art["attacks"][0]["id"] == 288230376151711745
+  # References to the parent stay as sent: the models take the parent from context.
+  assert art["guild_id"] == "1"
+  assert art["attacks"][0]["art_id"] == "288230376151711744"
+  (family,) = FAMILY.loads(b'[{"id": "7", "guild_id": "1", "abilities": ["8", "9"], "banner": null}]')
+  assert family == {"id": 7, "guild_id": "1", "abilities": [8, 9], "banner": None}
+def test_nested_payloads_are_decoded() -> None:
+  snapshot = SNAPSHOT({
+    "cursor": "3",
+    "guild": {"roll_category_id": "10", "off_category_id": None},
+    "arts": [{"id": "1", "guild_id": "1", "attacks": []}],
+    "abilities": [{"id": "2", "guild_id": "1"}],
+    "families": [{"id": "3", "guild_id": "1", "abilities": ["2"]}]
+  })
+  assert snapshot["guild"] == {"roll_category_id": 10, "off_category_id": None}
+  assert [snapshot["arts"][0]["id"], snapshot["abilities"][0]["id"], snapshot["families"][0]["abilities"]] == [1, 2, [2]]
+  # The cursor is not a snowflake and is left alone.
+  assert snapshot["cursor"] == "3"
+  changes = CHANGES({"cursor": "4", "reset": False, "arts": [], "attacks": [], "abilities": [], "families": [], "deleted": {"arts": ["5"], "attacks": [], "abilities": ["6", "7"], "families": []}})
+  assert changes["deleted"]["arts"] == [5]
+  assert changes["deleted"]["abilities"] == [6, 7]
+def test_client_responses_carry_int_ids(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    arts = await state.http.fetch_arts(int(guild_id))
+    assert sorted(art["id"] for art in arts) == sorted(int(id) for id in api.guilds[guild_id].arts)
+    assert all(isinstance(attack["id"], int) for art in arts for attack in art["attacks"])
+  stand_in(test)
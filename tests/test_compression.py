@@ -0,0 +1,42 @@
+from morkato.compression import (CompressionPolicy, decompress)
+from morkato.errors import ContentEncodingError
+from morkato.conditional import ConditionalCache
+from morkato.state import MorkatoConnectionState
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.transport import Response
+from morkato.http import json_or_text
+from typing import Callable
+import morkato.compression
+import asyncio
+import orjson
+import pytest
+import gzip
+
+def test_compressed_responses_revalidate(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    state.http.conditional_cache = ConditionalCache()
+    first = await state.http.fetch_abilities(int(guild_id))
+    # The second GET is answered with a bodiless 304, which must not be compressed.
+    second = await state.http.fetch_abilities(int(guild_id))
+    assert second == first
+    assert state.http.conditional_cache.revalidated == 1
+  stand_in(test, compress=True, etags=True)
+def test_stacked_encodings_come_off_in_reverse() -> None:
+  brotli = pytest.importorskip("brotli")
+  body = orjson.dumps({"id": "1"})
+  data = brotli.compress(gzip.compress(body))
+  assert decompress("gzip, br", data) == body
+  assert decompress("identity,gzip", gzip.compress(body)) == body
+def test_unsupported_encodings_raise_a_library_error() -> None:
+  async def main() -> None:
+    policy = CompressionPolicy()
+    for (encoding, data) in (("zstd", b"{}"), ("gzip, zstd", b"{}"), ("gzip", b"not gzip")):
+      response = Response(200, {"Content-Encoding": encoding, "Content-Type": "application/json"}, data, "HTTP/1.1")
+      with pytest.raises(ContentEncodingError) as exc:
+        await json_or_text(response, policy, "GET /arts/{gid}")
+      assert exc.value.encoding == encoding
+      assert exc.value.status == 200
+  asyncio.run(main())
+def test_brotli_is_only_advertised_when_it_can_be_decoded(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.setattr(morkato.compression, "HAS_BROTLI", False)
+  assert CompressionPolicy().accept_encoding("GET /arts/{gid}") == "gzip, deflate"
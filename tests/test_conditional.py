@@ -0,0 +1,29 @@
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.conditional import ConditionalCache
+from morkato.state import MorkatoConnectionState
+from typing import Callable
+import copy
+
+def test_not_modified_hands_out_an_independent_payload(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    http.conditional_cache = ConditionalCache()
+    arts = await http.fetch_arts(int(guild_id))
+    families = await http.fetch_families(int(guild_id))
+    sent = copy.deepcopy((arts, families))
+    # Callers are free to mutate what they got, down to the nested attacks and id lists.
+    arts[0]["name"] = "Mudada"
+    arts[0]["attacks"].clear()
+    families[0]["abilities"].append(0)
+    families.clear()
+    for _ in range(2):
+      revalidated = (await http.fetch_arts(int(guild_id)), await http.fetch_families(int(guild_id)))
+      assert revalidated == sent
+      (arts, families) = revalidated
+      assert all(isinstance(art["id"], int) for art in arts)
+      assert all(isinstance(attack["id"], int) for art in arts for attack in art["attacks"])
+      assert all(isinstance(id, int) for family in families for id in family["abilities"])
+      arts[0]["attacks"].clear()
+      families[0]["abilities"].clear()
+    assert http.conditional_cache.revalidated == 4
+  stand_in(test, etags=True)
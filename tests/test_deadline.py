@@ -0,0 +1,30 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Latency)
+from morkato.deadline import (current_deadline, deadline)
+from morkato.state import MorkatoConnectionState
+from morkato.errors import MorkatoTimeoutError
+from morkato.http import Route
+from typing import Callable
+import pytest
+
+def test_deadline_is_released_once_acknowledged() -> None:
+  acknowledged = False
+  with deadline(2.5, until=lambda: acknowledged) as value:
+    assert current_deadline() == value
+    with deadline(10.0) as nested:
+      assert nested == value
+      acknowledged = True
+      # Inherited from the command, so it goes away with it.
+      assert current_deadline() is None
+    with deadline(1.0) as own:
+      # Set after the acknowledgement, so it applies on its own.
+      assert current_deadline() == own
+    assert current_deadline() is None
+  assert current_deadline() is None
+def test_timeouts_report_the_url_that_was_requested(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    with pytest.raises(MorkatoTimeoutError) as exc:
+      with deadline(0.05):
+        await state.http.fetch_abilities(int(guild_id))
+    assert exc.value.url == state.http.balancer.primary.http_base + "/abilities/" + guild_id
+    assert not exc.value.url.startswith(Route.BASE)
+  stand_in(test, route_latency={"GET /abilities/{guild_id}": Latency("constant", 0.5)})
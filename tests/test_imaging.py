@@ -0,0 +1,56 @@
+from morkato.imaging import (ImagePreprocessor, ImageSettings)
+from typing import (
+  Awaitable,
+  Callable,
+  Any
+)
+import asyncio
+import pytest
+import io
+
+Image = pytest.importorskip("PIL.Image")
+
+def encode(image: Any, format: str, **options: Any) -> bytes:
+  output = io.BytesIO()
+  image.save(output, format=format, **options)
+  return output.getvalue()
+def run(test: Callable[[ImagePreprocessor], Awaitable[Any]]) -> None:
+  async def main() -> None:
+    preprocessor = ImagePreprocessor(workers=1)
+    try:
+      await test(preprocessor)
+    finally:
+      preprocessor.close()
+  asyncio.run(main())
+def test_large_photos_are_downscaled_in_the_pool() -> None:
+  async def test(preprocessor: ImagePreprocessor) -> None:
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    photo = Image.effect_noise((2048, 1024), 64).convert("RGB")
+    original = encode(photo, "JPEG", quality=95, exif=exif.tobytes())
+    result = await preprocessor.process(original, ImageSettings(max_dimension=512, quality=80))
+    assert len(result) < len(original)
+    with Image.open(io.BytesIO(result)) as image:
+      assert image.format == "JPEG"
+      assert image.size == (512, 256)
+      assert not image.getexif()
+    assert preprocessor.executor is not None
+    assert preprocessor.stats()["processed"] == 1
+    assert preprocessor.stats()["saved_bytes"] == len(original) - len(result)
+  run(test)
+def test_transparency_is_kept_as_png() -> None:
+  async def test(preprocessor: ImagePreprocessor) -> None:
+    original = encode(Image.new("RGBA", (1024, 1024), (255, 0, 0, 128)), "PNG")
+    result = await preprocessor.process(original, ImageSettings(max_dimension=256))
+    with Image.open(io.BytesIO(result)) as image:
+      assert (image.format, image.mode, image.size) == ("PNG", "RGBA", (256, 256))
+  run(test)
+def test_unreadable_and_disabled_uploads_go_up_untouched() -> None:
+  async def test(preprocessor: ImagePreprocessor) -> None:
+    original = b"\x89PNG\r\n\x1a\n not really"
+    assert await preprocessor.process(original, ImageSettings()) is original
+    # Disabled settings never start the pool.
+    assert preprocessor.executor is None
+    assert await preprocessor.process(original, ImageSettings(max_dimension=256)) is original
+    assert preprocessor.stats()["failed"] == 1
+  run(test)
@@ -0,0 +1,67 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Faults)
+from morkato.journal import (WriteJournal, JournalEntry)
+from morkato.state import MorkatoConnectionState
+from typing import (
+  Callable,
+  List
+)
+import asyncio
+import pathlib
+
+USER_ROUTE = "PUT /users/{guild_id}/{id}"
+
+def test_pending_writes_survive_a_restart_and_replay_in_order(tmp_path: pathlib.Path) -> None:
+  async def main() -> None:
+    path = str(tmp_path / "writes.log")
+    journal = WriteJournal(path, fsync=False)
+    entries = [JournalEntry.create("PUT", "/users/{guild_id}/{id}", {"guild_id": 1, "id": idx}, {"flags": idx}) for idx in range(3)]
+    for entry in entries:
+      await journal.append(entry)
+    # A crash in the middle of an append leaves a torn record behind.
+    with open(path, "ab") as fp:
+      fp.write(b'{"key": "torn"')
+    journal = WriteJournal(path, fsync=False)
+    journal.open()
+    assert [entry.key for entry in journal.pending] == [entry.key for entry in entries]
+    sent: List[str] = []
+    async def send(entry: JournalEntry) -> None:
+      if entry.key == entries[1].key and len(sent) == 1:
+        sent.append("outage")
+        raise asyncio.TimeoutError
+      sent.append(entry.key)
+    assert await journal.replay(send) == 1
+    # Replay stops at the outage; the cursor keeps what was applied across another restart.
+    journal = WriteJournal(path, fsync=False)
+    journal.open()
+    assert [entry.key for entry in journal.pending] == [entry.key for entry in entries[1:]]
+    assert await journal.replay(send) == 2
+    assert sent == [entries[0].key, "outage", entries[1].key, entries[2].key]
+    assert journal.size == 0
+    assert pathlib.Path(path).read_bytes() == b""
+  asyncio.run(main())
+def test_journaled_writes_replay_with_their_idempotency_key(stand_in: Callable[..., None], tmp_path: pathlib.Path) -> None:
+  journal = WriteJournal(str(tmp_path / "writes.log"), fsync=False)
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    (user_id,) = api.guilds[guild_id].users
+    api.faults = Faults(error_rate=1.0)
+    assert await http.update_user(int(guild_id), int(user_id), flags=1, write_behind=True) is None
+    api.faults = Faults()
+    # Queued behind the pending write even though the API is back, so the API sees them in order.
+    assert await http.update_user(int(guild_id), int(user_id), flags=2, write_behind=True) is None
+    entries = list(journal.pending)
+    assert [entry.json for entry in entries] == [{"flags": 1}, {"flags": 2}]
+    for _ in range(100):
+      if not journal.pending:
+        break
+      await journal.replay(http._replay)
+      await asyncio.sleep(0.01)
+    assert not journal.pending
+    assert api.guilds[guild_id].users[user_id]["flags"] == 2
+    assert all(entry.key in api.idempotent for entry in entries)
+    # A replay the cursor lost is answered from the stored response, not applied again.
+    await http._replay(entries[0])
+    assert api.replayed[USER_ROUTE] == 1
+    assert api.guilds[guild_id].users[user_id]["flags"] == 2
+    assert api.requests[USER_ROUTE] == 4
+  stand_in(test, client={"journal": journal})
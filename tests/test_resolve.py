@@ -0,0 +1,80 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Latency, Faults)
+from morkato.state import MorkatoConnectionState
+from morkato.errors import MorkatoServerError
+from morkato.ability import Ability
+from typing import (
+  Callable,
+  Any
+)
+import asyncio
+
+RESOLVERS = 300
+ABILITIES_ROUTE = "GET /abilities/{guild_id}"
+
+def run(stand_in: Callable[..., None], test: Any) -> None:
+  # The abilities fetch is slow enough for the test to act while it is in flight.
+  stand_in(test, route_latency={ABILITIES_ROUTE: Latency("constant", 0.2)})
+def percent(api: FakeMorkatoAPI, guild_id: str) -> int:
+  return sum(ability["percent"] for ability in api.guilds[guild_id].abilities.values())
+def test_concurrent_resolves_share_one_request(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id))
+    sizes = []
+    async def resolve() -> None:
+      await guild.abilities.resolve()
+      # Whoever gets past resolve() sees the whole list, never part of it.
+      sizes.append(len(guild.abilities))
+    await asyncio.gather(*(resolve() for _ in range(RESOLVERS)))
+    assert api.requests[ABILITIES_ROUTE] == 1
+    assert sizes == [40] * RESOLVERS
+    assert guild.abilities_percent == percent(api, guild_id)
+  run(stand_in, test)
+def test_failure_reaches_every_waiter(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id))
+    api.faults = Faults(error_rate=1.0)
+    results = await asyncio.gather(*(guild.abilities.resolve() for _ in range(RESOLVERS)), return_exceptions=True)
+    assert api.requests[ABILITIES_ROUTE] == 1
+    assert isinstance(results[0], MorkatoServerError)
+    assert all(result is results[0] for result in results)
+    assert not guild.abilities.already_loaded()
+    assert len(guild.abilities) == 0 and guild.abilities_percent == 0
+    # Nothing was poisoned: the next resolve fetches again.
+    api.faults = Faults()
+    await guild.abilities.resolve()
+    assert api.requests[ABILITIES_ROUTE] == 2
+    assert len(guild.abilities) == 40
+  run(stand_in, test)
+def test_clear_discards_the_flight_in_progress(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id))
+    waiters = [asyncio.ensure_future(guild.abilities.resolve()) for _ in range(RESOLVERS)]
+    await asyncio.sleep(0.05)
+    guild.abilities.clear()
+    # Only a fetch started after clear() can see this one.
+    fresh = api.add_spec(api.guilds[guild_id], "ABILITY", {"name": "Depois do clear", "percent": 5})
+    await asyncio.gather(*waiters)
+    assert api.requests[ABILITIES_ROUTE] == 2
+    assert guild.abilities.get(int(fresh["id"])) is not None
+    assert len(guild.abilities) == 41
+  run(stand_in, test)
+def test_writes_during_the_flight_survive_the_load(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id))
+    abilities = api.guilds[guild_id].abilities
+    task = asyncio.ensure_future(guild.abilities.resolve())
+    await asyncio.sleep(0.05)
+    # Neither write reaches the fake API, so the response in flight can only be corrected by the replay.
+    # The client decodes snowflakes to int; the fake API keeps them as the JSON strings.
+    (first, *_) = abilities.values()
+    added = Ability(state, guild, dict(first, id=api.snowflakes.next(), name="Durante o resolve", percent=7))
+    removed = Ability(state, guild, dict(first, id=int(first["id"])))
+    guild.abilities.add(added)
+    guild.abilities.remove(removed)
+    assert not guild.abilities.already_loaded()
+    await task
+    assert guild.abilities.get(added.id) is added
+    assert guild.abilities.get(removed.id) is None
+    assert len(guild.abilities) == 40
+    assert guild.abilities_percent == sum(ability.percent for ability in guild.abilities)
+  run(stand_in, test)
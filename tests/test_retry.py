@@ -0,0 +1,45 @@
+from benchmarks.fake_api import (FakeMorkatoAPI, Faults)
+from morkato.errors import (MorkatoServerError, CircuitOpenError)
+from morkato.retry import (RetryPolicy, RetryBudget)
+from morkato.state import MorkatoConnectionState
+from typing import Callable
+import pytest
+
+GUILD_ROUTE = "GET /guilds/{guild_id}"
+
+def test_retry_budget_caps_retries_across_requests(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    for _ in range(3):
+      with pytest.raises(MorkatoServerError):
+        await http.fetch_guild(int(guild_id))
+    # Three retries in the budget: the first request spends them all, the others go out once.
+    assert api.requests[GUILD_ROUTE] == 4 + 1 + 1
+    assert http.retry_budget.withdrawn == 3
+    assert http.retry_budget.exhausted == 3
+  stand_in(test, faults=Faults(error_rate=1.0), client={
+    "retry_policy": RetryPolicy(max_retries=5, base_delay=0.001, breaker_threshold=10 ** 9),
+    "retry_budget": RetryBudget(ratio=0.0, min_per_second=0.0, max_balance=3.0)
+  })
+def test_circuit_breaker_trips_and_closes_after_a_probe(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    breaker = http.balancer.primary.breaker
+    for _ in range(3):
+      with pytest.raises(MorkatoServerError):
+        await http.fetch_guild(int(guild_id))
+    assert breaker.state == breaker.OPEN
+    assert breaker.trips == 1
+    # Open: rejected without reaching the API.
+    with pytest.raises(CircuitOpenError):
+      await http.fetch_guild(int(guild_id))
+    assert api.requests[GUILD_ROUTE] == 3
+    assert breaker.rejected == 1
+    api.faults = Faults()
+    breaker.opened_at -= breaker.timeout
+    await http.fetch_guild(int(guild_id))
+    assert breaker.state == breaker.CLOSED
+    assert api.requests[GUILD_ROUTE] == 4
+  stand_in(test, faults=Faults(error_rate=1.0), client={
+    "retry_policy": RetryPolicy(max_retries=0, breaker_threshold=3, breaker_timeout=60.0)
+  })
@@ -0,0 +1,31 @@
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.state import MorkatoConnectionState
+from typing import Callable
+import asyncio
+
+CALLERS = 10
+ABILITIES_ROUTE = "GET /abilities/{guild_id}"
+
+def test_concurrent_gets_share_one_request(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    results = await asyncio.gather(*(http.fetch_abilities(int(guild_id)) for _ in range(CALLERS)))
+    assert api.requests[ABILITIES_ROUTE] == 1
+    assert all(result == results[0] for result in results)
+    assert len(results[0]) == 40
+    assert http.inflight.stats() == {"inflight": 0, "executed": 1, "saved": CALLERS - 1}
+    # Once the flight lands, the next GET goes out on its own.
+    await http.fetch_abilities(int(guild_id))
+    assert api.requests[ABILITIES_ROUTE] == 2
+  stand_in(test, client={"coalesce_gets": True})
+def test_cancelled_waiter_leaves_the_flight_running(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    leaving = asyncio.ensure_future(http.fetch_abilities(int(guild_id)))
+    staying = asyncio.ensure_future(http.fetch_abilities(int(guild_id)))
+    await asyncio.sleep(0)
+    leaving.cancel()
+    assert len(await staying) == 40
+    assert leaving.cancelled()
+    assert api.requests[ABILITIES_ROUTE] == 1
+  stand_in(test, client={"coalesce_gets": True})
@@ -0,0 +1,41 @@
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.state import MorkatoConnectionState
+from typing import (
+  Callable,
+  List
+)
+import asyncio
+
+STREAMS = 8
+ABILITIES_ROUTE = "GET /abilities/{guild_id}"
+
+def ids(api: FakeMorkatoAPI, guild_id: str) -> List[int]:
+  return sorted(int(id) for id in api.guilds[guild_id].abilities)
+def test_concurrent_streams_see_every_item(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id))
+    async def stream() -> List[int]:
+      return [ability.id async for ability in guild.abilities.stream(page_size=7)]
+    results = await asyncio.gather(*(stream() for _ in range(STREAMS)))
+    # A page fetched by one stream never moves another one past items it has not yielded.
+    assert all(result == ids(api, guild_id) for result in results)
+    assert guild.abilities.already_loaded()
+    assert len(guild.abilities) == 40
+    assert guild.abilities_percent == sum(ability.percent for ability in guild.abilities)
+  stand_in(test)
+def test_pages_are_kept_as_they_arrive(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id))
+    stream = guild.abilities.stream(page_size=10)
+    first = [await stream.__anext__() for _ in range(10)]
+    await stream.aclose()
+    assert api.requests[ABILITIES_ROUTE] == 1
+    assert not guild.abilities.already_loaded()
+    assert all(guild.abilities.get(ability.id) is ability for ability in first)
+    # The next stream replays the first page and only fetches what follows it.
+    rest = [ability async for ability in guild.abilities.stream(page_size=10)]
+    assert rest[:10] == first
+    assert [ability.id for ability in rest] == ids(api, guild_id)
+    assert api.requests[ABILITIES_ROUTE] == 5
+    assert guild.abilities.already_loaded()
+  stand_in(test)
@@ -0,0 +1,45 @@
+from benchmarks.fake_api import FakeMorkatoAPI
+from morkato.state import MorkatoConnectionState
+from typing import Callable
+import asyncio
+
+LIST_ROUTES = ("GET /arts/{gid}", "GET /abilities/{guild_id}", "GET /families/{guild_id}")
+
+def lists_fetched(api: FakeMorkatoAPI) -> int:
+  return sum(api.requests[route] for route in LIST_ROUTES)
+def test_snapshot_cursor_skips_the_first_reload(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id), hydrate=True)
+    assert guild.sync_cursor is not None
+    assert await guild.sync() == {"patched": 0, "refetched": 0}
+    added = api.add_spec(api.guilds[guild_id], "ABILITY", {"name": "Nova", "percent": 3})
+    assert await guild.sync() == {"patched": 1, "refetched": 0}
+    assert guild.abilities.get(int(added["id"])) is not None
+    assert lists_fetched(api) == 0
+  stand_in(test)
+def test_missing_change_log_is_no_delta(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    guild = await state.fetch_guild(int(guild_id), hydrate=True)
+    assert guild.sync_cursor is None
+    for _ in range(3):
+      assert await guild.sync() == {"patched": 0, "refetched": 0}
+    assert lists_fetched(api) == 0
+    assert len(guild.abilities) == 40
+  stand_in(test, change_log=False)
+def test_cached_guilds_sync_in_the_background(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    state = MorkatoConnectionState(lambda *args: None, http=state.http, sync_interval=0.05)
+    guild = await state.fetch_guild(int(guild_id), hydrate=True)
+    state.start_sync()
+    try:
+      added = api.add_spec(api.guilds[guild_id], "FAMILY", {"name": "Nova", "percent": 3})
+      for _ in range(100):
+        if guild.families.get(int(added["id"])) is not None:
+          break
+        await asyncio.sleep(0.01)
+      assert guild.families.get(int(added["id"])) is not None
+      assert state.get_cached_guild(guild.id) is guild
+    finally:
+      await state.close()
+    assert state.sync_task is None
+  stand_in(test)
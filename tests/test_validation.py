@@ -0,0 +1,50 @@
+from morkato.errors import (SchemaValidationError, BulkWriteError)
+from morkato.validation import (ABILITY_CREATE, ART_UPDATE)
+from morkato.state import MorkatoConnectionState
+from benchmarks.fake_api import FakeMorkatoAPI
+from typing import (
+  Callable,
+  Dict,
+  Any
+)
+import pytest
+
+@pytest.mark.parametrize(("payload", "field"), [
+  ({"name": "1 Começa com dígito"}, "name"),
+  ({"name": "x" * 33}, "name"),
+  # Two UTF-16 code units each, like the API counts them.
+  ({"name": "\U0001F525" * 17}, "name"),
+  ({"name": "Válida", "banner": "ftp://example.com/a.png"}, "banner"),
+  ({"name": "Válida", "description": " começa com espaço"}, "description"),
+  ({"description": "Sem nome"}, "name")
+])
+def test_ability_create_rejects(payload: Dict[str, Any], field: str) -> None:
+  with pytest.raises(SchemaValidationError) as exc:
+    ABILITY_CREATE.validate(payload)
+  assert exc.value.field == field
+def test_art_update_checks_digits() -> None:
+  ART_UPDATE.validate({"energy": 100, "life": 10 ** 11, "breath": None})
+  for payload in ({"energy": 1000}, {"life": 10 ** 12}, {"blood": 1.5}, {"energy": True}):
+    with pytest.raises(SchemaValidationError):
+      ART_UPDATE.validate(payload)
+def test_bad_payloads_never_reach_the_api(stand_in: Callable[..., None]) -> None:
+  async def test(api: FakeMorkatoAPI, guild_id: str, state: MorkatoConnectionState) -> None:
+    http = state.http
+    sent = sum(api.requests.values())
+    with pytest.raises(SchemaValidationError):
+      await http.create_ability(int(guild_id), name="x", percent=1, user_type=1)
+    with pytest.raises(SchemaValidationError):
+      await http.update_art(int(guild_id), 1, energy=1000)
+    # A bulk create checks every item first, so a bad last row sends nothing.
+    abilities = [{"name": "Habilidade %s" % chr(65 + idx)} for idx in range(5)] + [{"name": ":"}]
+    with pytest.raises(BulkWriteError) as exc:
+      [ability async for ability in http.bulk_create_abilities(int(guild_id), abilities)]
+    assert exc.value.index == 5
+    assert isinstance(exc.value.error, SchemaValidationError)
+    assert exc.value.created == []
+    assert sum(api.requests.values()) == sent
+    assert http.validation.stats()["rejected"] == 3
+    created = await http.create_ability(int(guild_id), name="Válida", percent=1, user_type=1)
+    assert created["name"] == "Válida"
+    assert sum(api.requests.values()) == sent + 1
+  stand_in(test)